@@ -0,0 +1,363 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime
+
+try:
+    from .task_store import TaskStore, sort_key
+    from .datetime_parse import parse_time, parse_date
+    from .task_record import Task
+    from .finance_categorizer import Categorizer, DEFAULT_KEYWORDS, UNCATEGORIZED
+    from .finance_import import StatementProfile, import_statement, read_header
+    from .finance_report import write_finance_report
+    from .finance_ledger import Ledger
+    from .finance_charts import ChartCache, CHART_KINDS, chart_data, render_chart
+    from .finance_currency import RateTable, day_numbers
+except ImportError:
+    from task_store import TaskStore, sort_key
+    from datetime_parse import parse_time, parse_date
+    from task_record import Task
+    from finance_categorizer import Categorizer, DEFAULT_KEYWORDS, UNCATEGORIZED
+    from finance_import import StatementProfile, import_statement, read_header
+    from finance_report import write_finance_report
+    from finance_ledger import Ledger
+    from finance_charts import ChartCache, CHART_KINDS, chart_data, render_chart
+    from finance_currency import RateTable, day_numbers
+
+WORDS = [
+    "review", "report", "call", "client", "email", "invoice", "prepare", "slides", "meeting", "budget",
+    "groceries", "gym", "doctor", "appointment", "renew", "passport", "fix", "bug", "deploy", "release",
+    "write", "notes", "plan", "trip", "book", "tickets", "clean", "garage", "pay", "rent",
+]
+SYLLABLES = ["ka", "lo", "mi", "ten", "ras", "vu", "pel", "dor", "shi", "an", "qu", "bex", "ro", "tal", "ny"]
+
+
+def make_tasks(n, seed=42):
+    rng = random.Random(seed)
+    # Common verbs plus a long tail of names/projects, like a real task list
+    vocabulary = WORDS + ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(3000)]
+    tasks = []
+    for task_id in range(1, n + 1):
+        tasks.append({
+            "id": task_id,
+            "task": " ".join(rng.choice(vocabulary) for _ in range(4)) + f" #{task_id}",
+            "done": rng.random() < 0.3,
+            "due": f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025",
+            "time": "09:00",
+            "time_display": "09:00 AM",
+            "priority": rng.choice(["High", "Medium", "Low"]),
+            "category": rng.choice(["Work", "Personal", "Urgent", "Other"]),
+            "notes": "No notes",
+        })
+    return tasks
+
+
+def timeit(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def bench_task_search(n=100_000, repeat=50, window=40):
+    """Compare TaskStore.search, plus the first screen of rows it is shown with, with the linear scan update_task_list used to do."""
+    tasks = make_tasks(n)
+    start = time.perf_counter()
+    store = TaskStore(tasks)
+    print(f"TaskStore: indexed {n} tasks in {time.perf_counter() - start:.2f}s")
+    ordered = list(store.ordered())
+    # Typing "invoice" one key at a time, plus a selective id lookup and the empty query
+    queries = ["i", "in", "inv", "invo", "invoi", "invoic", "invoice", "kalo", "#4242", "#99999", "zzz", ""]
+    print(f"{'query':>10} {'matches':>8} {'linear ms':>10} {'cold ms':>9} {'search ms':>10} {'+screen ms':>11}")
+    for query in queries:
+        linear_ms, expected = timeit(lambda: [t for t in ordered if query in t["task"].lower()], max(1, repeat // 10))
+        # 1-2 character queries pay a vocabulary scan once, then stay cached across mutations
+        store._short_cache.clear()
+        cold_ms, _ = timeit(lambda: store.search(query), 1)
+        search_ms, found = timeit(lambda: store.search(query), repeat)
+        # What the task list does next: read the rows of one screen
+        screen_ms, _ = timeit(lambda: store.search(query)[:window], repeat)
+        assert list(found) == expected, query
+        print(f"{query or '(all)':>10} {len(found):>8} {linear_ms:>10.3f} {cold_ms:>9.3f} {search_ms:>10.4f} {screen_ms:>11.4f}")
+
+
+def bench_task_order(n=100_000, repeat=20):
+    """Compare the maintained display order with re-sorting every task on each refresh."""
+    tasks = make_tasks(n)
+    store = TaskStore(tasks)
+    sort_ms, expected = timeit(lambda: sorted(store, key=sort_key), repeat)
+    ordered_ms, found = timeit(store.ordered, repeat)
+    assert list(found) == expected
+    extra = make_tasks(1000, seed=7)
+    for task in extra:
+        task["id"] += n
+    start = time.perf_counter()
+    for task in extra:
+        store.add(task)
+    for task in extra:
+        store.remove(task["id"])
+    churn_us = (time.perf_counter() - start) / (2 * len(extra)) * 1_000_000
+    print(f"sorted(): {sort_ms:.2f} ms  ordered(): {ordered_ms:.2f} ms  add/remove: {churn_us:.1f} us each")
+
+
+def bench_task_analytics(n=1_000_000, repeat=20):
+    """Time the initial column parse, a refresh after one change, the first computation and a cached repeat."""
+    # pandas is only needed for this benchmark
+    try:
+        from .task_analytics import TaskAnalytics
+    except ImportError:
+        from task_analytics import TaskAnalytics
+    store = TaskStore(make_tasks(n))
+    analytics = TaskAnalytics(store)
+    parse_ms, _ = timeit(analytics.frame, 1)
+    task = store.get(1)
+
+    def change():
+        # One mutation, as the UI makes them, then the frame the next view reads
+        store.set_done(1, not task["done"])
+        return analytics.frame()
+    change_ms, _ = timeit(change, repeat)
+    views = lambda: (analytics.completion_by_category(), analytics.overdue(), analytics.throughput_by_priority(), analytics.burndown())
+    first_ms, _ = timeit(views, 1)
+    cached_ms, _ = timeit(views, repeat)
+    print(f"{n} tasks: parse {parse_ms:.0f} ms  change + frame {change_ms:.1f} ms  "
+          f"first views {first_ms:.0f} ms  cached views {cached_ms:.3f} ms")
+
+
+def bench_datetime_parse(n=200_000):
+    """Compare datetime_parse with the strptime calls add_task and the reminder code used to make."""
+    rng = random.Random(1)
+    times = [f"{rng.randint(1, 12)}:{rng.choice(range(0, 60, 15)):02d} {rng.choice(['AM', 'PM'])}" for _ in range(n)]
+    dates = [f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2024, 2027)}" for _ in range(n)]
+    # Unique strings defeat the cache, showing the regex fast path on its own
+    unique_times = [f"{h % 12 + 1}:{m:02d} {p}" for h in range(12) for m in range(60) for p in ("AM", "PM")]
+    cases = [
+        ("12h time", times, lambda s: datetime.strptime(s, "%I:%M %p").time(), parse_time),
+        ("dd/mm/yyyy", dates, lambda s: datetime.strptime(s, "%d/%m/%Y").date(), parse_date),
+        ("12h uncached", unique_times, lambda s: datetime.strptime(s, "%I:%M %p").time(), parse_time.__wrapped__),
+    ]
+    print(f"{'input':>14} {'strptime us':>12} {'fast us':>8}")
+    for name, values, slow, fast in cases:
+        parse_time.cache_clear()
+        parse_date.cache_clear()
+        slow_ms, _ = timeit(lambda: [slow(s) for s in values], 1)
+        fast_ms, _ = timeit(lambda: [fast(s) for s in values], 1)
+        assert [slow(s) for s in values[:1000]] == [fast(s) for s in values[:1000]]
+        print(f"{name:>14} {slow_ms * 1000 / len(values):>12.3f} {fast_ms * 1000 / len(values):>8.3f}")
+
+
+def bench_task_memory(n=200_000):
+    """Memory per loaded task, strings included, as dicts (the old load_tasks) versus Task records."""
+    rows = [tuple(task.values()) for task in make_tasks(n)]
+    keys = ("id", "task", "done", "due", "time", "time_display", "priority", "category", "notes")
+    # Every row gets its own string objects, as it does when read from SQLite
+    fresh = lambda: [tuple(value.encode().decode() if isinstance(value, str) else value for value in row) for row in rows]
+    results = {}
+    for name, build in (("dict", lambda data: [dict(zip(keys, row)) for row in data]),
+                        ("Task", lambda data: [Task(*row) for row in data])):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        data = fresh()
+        tasks = build(data)
+        del data
+        results[name] = (tracemalloc.get_traced_memory()[0] - before) / n
+        tracemalloc.stop()
+        del tasks
+    print(f"dict: {results['dict']:.0f} B/task  Task: {results['Task']:.0f} B/task  "
+          f"saved {1 - results['Task'] / results['dict']:.0%}")
+
+
+MERCHANTS = {
+    "PVR cinema": "Movies", "Netflix": "Movies", "Big Bazaar store": "Shopping", "Amazon purchase": "Shopping",
+    "Fresh fruit market": "Groceries", "Swiggy food order": "Dining", "Uber trip": "Transport", "Petrol pump": "Transport",
+    "Electricity bill": "Bills", "Rent transfer": "Bills", "ATM withdrawal": "Cash", "Salary credit": "Income",
+}
+
+
+def make_descriptions(n, seed=42, with_merchants=False):
+    rng = random.Random(seed)
+    merchants = list(MERCHANTS)
+    # Statement-style lines: recurring merchants, most with a unique reference
+    chosen = [rng.choice(merchants) for _ in range(n)]
+    descriptions = [f"{merchant} ref {rng.randint(0, 10**7)}" if rng.random() < 0.8 else merchant for merchant in chosen]
+    return (descriptions, chosen) if with_merchants else descriptions
+
+
+def bench_finance_categorize(n=1_000_000):
+    """Compare the compiled Categorizer on a bulk import with the keyword loops categorize_finance used to run."""
+    descriptions = make_descriptions(n)
+
+    def keyword_loop(desc):
+        desc_lower = desc.lower()
+        for category, keywords in DEFAULT_KEYWORDS:
+            for keyword in keywords:
+                if keyword in desc_lower:
+                    return category
+        return UNCATEGORIZED
+
+    start = time.perf_counter()
+    expected = [keyword_loop(desc) for desc in descriptions]
+    loop_s = time.perf_counter() - start
+    categorizer = Categorizer()
+    start = time.perf_counter()
+    result = categorizer.categorize_many(descriptions)
+    compiled_s = time.perf_counter() - start
+    assert result == expected
+    single_ms, _ = timeit(lambda: categorizer.categorize("Swiggy food order ref 123456"), 10_000)
+    print(f"{n} descriptions: keyword loops {loop_s:.2f}s  Categorizer {compiled_s:.2f}s  "
+          f"({loop_s / compiled_s:.1f}x)  single {single_ms * 1000:.1f}µs")
+
+
+def bench_finance_classifier(n=1_000_000, repeat=2000):
+    """Retrain the category model on a labeled history, then time single predictions and updates."""
+    # NumPy is only needed for this benchmark
+    try:
+        from .finance_classifier import CategoryClassifier
+    except ImportError:
+        from finance_classifier import CategoryClassifier
+    descriptions, merchants = make_descriptions(n, with_merchants=True)
+    categories = [MERCHANTS[merchant] for merchant in merchants]
+    model = CategoryClassifier()
+    start = time.perf_counter()
+    model.retrain_in_background(descriptions, categories, (n, n)).join()
+    train_s = time.perf_counter() - start
+    test, test_merchants = make_descriptions(2000, seed=7, with_merchants=True)
+    accuracy = sum(model.suggest(desc) == MERCHANTS[merchant] for desc, merchant in zip(test, test_merchants)) / len(test)
+    predict_ms, _ = timeit(lambda: model.predict("Swiggy food order ref 123456"), repeat)
+    learn_ms, _ = timeit(lambda: model.learn("Ola cab", "Transport"), repeat)
+    print(f"{n} transactions: retrain {train_s:.2f}s  accuracy {accuracy:.1%}  "
+          f"predict {predict_ms * 1000:.0f}µs  learn {learn_ms * 1000:.0f}µs")
+
+
+def bench_finance_import(n=100_000):
+    """Import a bank-style CSV statement, then import it again when half of it is already recorded."""
+    rng = random.Random(42)
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write("Txn Date,Narration,Withdrawal Amt.,Deposit Amt.\n")
+            for desc in make_descriptions(n):
+                f.write(f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2025,{desc},\"{rng.randint(100, 5_000_000) / 100:,.2f}\",\n")
+        profile = StatementProfile.guess(read_header(path))
+        categorize_many = Categorizer().categorize_many
+        start = time.perf_counter()
+        result = import_statement(path, profile, [], categorize_many)
+        fresh_s = time.perf_counter() - start
+        existing = [(desc, paise, date) for desc, paise, _, date in result.rows[:n // 2]]
+        start = time.perf_counter()
+        again = import_statement(path, profile, existing, categorize_many)
+        dedup_s = time.perf_counter() - start
+    finally:
+        os.remove(path)
+    print(f"{n} rows: import {fresh_s:.2f}s ({len(result.rows)} new)  "
+          f"re-import {dedup_s:.2f}s ({again.duplicates} duplicates, {len(again.rows)} new)")
+
+
+def bench_finance_report(n=200_000):
+    """Write a paginated PDF report of n finances; peak memory should not depend on n."""
+    descriptions = make_descriptions(n)
+
+    def write(path, count):
+        rng = random.Random(42)
+        rows = ((descriptions[i], rng.randint(100, 5_000_000), "Groceries", "2025-06-01") for i in range(count))
+        return write_finance_report(path, "Finance Tracker Report", ["Exported for benchmarking"], rows, count)
+
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        pages = write(path, n)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(path)
+        # tracemalloc slows the run several times over, so memory is measured on separate, smaller runs
+        peaks = []
+        for count in (n // 100, n // 10):
+            tracemalloc.start()
+            write(path, count)
+            peaks.append(f"{count} rows {tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB")
+            tracemalloc.stop()
+    finally:
+        os.remove(path)
+    print(f"{n} rows: {pages} pages, {size / 1e6:.1f} MB in {elapsed:.2f}s  peak traced memory: {', '.join(peaks)}")
+
+
+def bench_finance_dashboard(n=1_000_000):
+    """Open the dashboard for a month of a large history: bucket reads, first drawing, then cache hits."""
+    Entry = namedtuple("Entry", "base_paise category date")
+    rng = random.Random(42)
+    categories = [category for category, _ in DEFAULT_KEYWORDS] + [UNCATEGORIZED, "Travel", "Rent"]
+    ledger = Ledger()
+    for _ in range(n):
+        ledger.add(Entry(rng.randint(100, 500_000), rng.choice(categories), f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"))
+    month = "2025-06"
+    start = time.perf_counter()
+    data = {kind: chart_data(kind, ledger, month, 50_000_000) for kind in CHART_KINDS}
+    data_ms = (time.perf_counter() - start) * 1000
+    cache = ChartCache()
+    try:
+        start = time.perf_counter()
+        for kind in CHART_KINDS:
+            cache.put((kind, month, ledger.month_version(month)), render_chart(kind, data[kind], kind))
+        render_s = time.perf_counter() - start
+    except ImportError:
+        print(f"{n} finances: chart data {data_ms:.2f}ms (matplotlib not installed, drawing skipped)")
+        return
+    start = time.perf_counter()
+    hits = sum(cache.get((kind, month, ledger.month_version(month))) is not None for kind in CHART_KINDS)
+    hit_ms = (time.perf_counter() - start) * 1000
+    print(f"{n} finances: chart data {data_ms:.2f}ms  first drawing {render_s:.2f}s  reopen {hit_ms:.3f}ms ({hits} cached)")
+
+
+def bench_finance_currency(n=1_000_000):
+    """Total n finances in mixed currencies at the rates of their dates, against a per-row loop."""
+    import numpy as np
+
+    rng = random.Random(42)
+    currencies = ["INR", "USD", "EUR", "GBP", "JPY", "AED"]
+    start_day = day_numbers(["2020-01-01"])[0]
+    days = [str(np.datetime64(int(start_day) + offset, "D")) for offset in range(6 * 365)]
+    start = time.perf_counter()
+    table = RateTable((day, currency, rng.uniform(0.5, 110)) for currency in currencies[1:] for day in days)
+    build_s = time.perf_counter() - start
+    paise = [rng.randint(100, 1_000_000) for _ in range(n)]
+    codes = [rng.choice(currencies) for _ in range(n)]
+    dates = [rng.choice(days) for _ in range(n)]
+    start = time.perf_counter()
+    ids, day_array, paise_array = table.currency_ids(codes), day_numbers(dates), np.array(paise)
+    columns_s = time.perf_counter() - start
+    start = time.perf_counter()
+    total = int(table.convert_many(paise_array, ids, day_array).sum())
+    vector_ms = (time.perf_counter() - start) * 1000
+    sample = n // 100
+    start = time.perf_counter()
+    for i in range(sample):
+        table.convert(paise[i], codes[i], dates[i])
+    loop_s = (time.perf_counter() - start) * n / sample
+    print(f"{n} finances in {len(currencies)} currencies: total {total}  rate table {build_s:.2f}s  "
+          f"columns {columns_s:.2f}s  vectorized total {vector_ms:.1f}ms  per-row loop ~{loop_s:.1f}s (extrapolated)")
+
+
+BENCHMARKS = {
+    "task_search": bench_task_search,
+    "task_order": bench_task_order,
+    "task_analytics": bench_task_analytics,
+    "datetime_parse": bench_datetime_parse,
+    "task_memory": bench_task_memory,
+    "finance_categorize": bench_finance_categorize,
+    "finance_classifier": bench_finance_classifier,
+    "finance_import": bench_finance_import,
+    "finance_report": bench_finance_report,
+    "finance_dashboard": bench_finance_dashboard,
+    "finance_currency": bench_finance_currency,
+}
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
@@ -0,0 +1,76 @@
+import re
+from datetime import date, datetime, time
+from functools import lru_cache
+
+# Fixed formats the app produces and accepts, matched without strptime
+_TIME_RE = re.compile(r"\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\s*(?:([AaPp])\.?[Mm]\.?)?\s*$")
+_DMY_RE = re.compile(r"\s*(\d{1,2})/(\d{1,2})/(\d{4})\s*$")
+_ISO_RE = re.compile(r"\s*(\d{4})-(\d{2})-(\d{2})\s*$")
+
+# Tried in order when the fast path does not match
+_TIME_FALLBACKS = ("%I%p", "%I %p", "%H%M", "%H.%M")
+_DATE_FALLBACKS = ("%d-%m-%Y", "%d.%m.%Y", "%Y/%m/%d", "%d %b %Y", "%d %B %Y")
+
+# Distinct strings remembered; task entry and imports repeat the same few values constantly
+_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parse_time(text):
+    """A time from "02:30 PM", "2:30pm", "14:30" or "14:30:00", or None if it is not a valid time."""
+    match = _TIME_RE.match(text)
+    if match:
+        hour, minute, second, period = match.groups()
+        hour = int(hour)
+        if period:
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if period in "Pp" else 0)
+        minute = int(minute)
+        second = int(second) if second else 0
+        if hour > 23 or minute > 59 or second > 59:
+            return None
+        return time(hour, minute, second)
+    for fmt in _TIME_FALLBACKS:
+        try:
+            return datetime.strptime(text.strip().upper(), fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parse_date(text):
+    """A date from "dd/mm/yyyy" or ISO "yyyy-mm-dd" (a few other layouts via strptime), or None."""
+    match = _DMY_RE.match(text)
+    if match:
+        day, month, year = match.groups()
+    else:
+        match = _ISO_RE.match(text)
+        if match:
+            year, month, day = match.groups()
+    if match:
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            return None
+    for fmt in _DATE_FALLBACKS:
+        try:
+            return datetime.strptime(text.strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def format_time_24h(value):
+    return f"{value.hour:02d}:{value.minute:02d}"
+
+
+def format_time_12h(value):
+    """Same text as strftime("%I:%M %p") in an English locale."""
+    return f"{value.hour % 12 or 12:02d}:{value.minute:02d} {'PM' if value.hour >= 12 else 'AM'}"
+
+
+def format_date(value):
+    """The app's dd/mm/yyyy due date text."""
+    return f"{value.day:02d}/{value.month:02d}/{value.year:04d}"
@@ -7,10 +7,15 @@ from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
 import time
+try:
+    from .event_bus import MODULE_HIDDEN
+except ImportError:
+    from event_bus import MODULE_HIDDEN
 
 class Entertainment:
-    def __init__(self, parent, music_base_dir="music"):
+    def __init__(self, parent, music_base_dir="music", event_bus=None):
         self.parent = parent
+        self.event_bus = event_bus
         self.frame = tk.Frame(parent, bg="#1E1E2F")
         self.frame.pack(fill="both", expand=True)
         
@@ -77,23 +82,33 @@ class Entertainment:
         self.parent.bind('<Up>', self.increase_volume)
         self.parent.bind('<Down>', self.decrease_volume)
 
-        self.parent.winfo_toplevel().protocol("WM_DELETE_WINDOW", self.on_closing)
+        # Closing the app goes through SPLMApp.close_app, which hides this module first
+        if self.event_bus:
+            self.event_bus.subscribe(MODULE_HIDDEN, self.on_module_hidden)
 
-    def on_closing(self):
+    def on_module_hidden(self, event):
+        if event.payload.get("module") != "entertainment":
+            return
+        # The hub is being torn down, so this instance will not be shown again
+        self.event_bus.unsubscribe(MODULE_HIDDEN, self.on_module_hidden)
         self.stop_music()
-        if self.audio_initialized:
-            pygame.mixer.quit()
-        self.parent.winfo_toplevel().destroy()
+        print("Music stopped before switching modules.")
+        # Also reached from SPLMApp.close_app; the next visit initializes the mixer again
+        self.quit_audio()
 
-    def destroy(self):
-        print("Destroying Entertainment module, stopping music")
-        self.stop_music()
+    def quit_audio(self):
         if self.audio_initialized:
+            self.audio_initialized = False
             try:
                 pygame.mixer.quit()
                 print("Pygame mixer quit successfully")
             except Exception as e:
                 print(f"Error quitting pygame mixer: {e}")
+
+    def destroy(self):
+        print("Destroying Entertainment module, stopping music")
+        self.stop_music()
+        self.quit_audio()
         self.frame.destroy()
 
     def initialize_game_state(self):
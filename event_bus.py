@@ -0,0 +1,159 @@
+import logging
+import queue
+import threading
+import time
+
+# Event types shared by SPLMApp and the modules
+TASK_ADDED = "task_added"
+TASK_COMPLETED = "task_completed"
+TASK_DELETED = "task_deleted"
+TASKS_IMPORTED = "tasks_imported"
+EXPENSE_ADDED = "expense_added"
+EXPENSE_DELETED = "expense_deleted"
+EXPENSES_IMPORTED = "expenses_imported"
+WORKOUT_LOGGED = "workout_logged"
+WORKOUT_DELETED = "workout_deleted"
+MODULE_SHOWN = "module_shown"
+MODULE_HIDDEN = "module_hidden"
+
+# Subscribe with this type to receive every event
+ALL_EVENTS = "*"
+
+
+class Event:
+    """A single message published on the bus."""
+    __slots__ = ("type", "payload", "published_at")
+
+    def __init__(self, event_type, payload=None):
+        self.type = event_type
+        self.payload = payload if payload is not None else {}
+        self.published_at = time.perf_counter()
+
+    def __repr__(self):
+        return f"Event({self.type!r}, {self.payload!r})"
+
+
+class EventBus:
+    """In-process publish/subscribe bus connecting SPLMApp and its modules.
+
+    Events are dispatched synchronously on the publishing thread by default.
+    Passing queued=True to publish() hands the event to a worker thread instead;
+    handlers that touch Tk widgets should then re-schedule themselves with after().
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = None
+        self._stats = {}
+        self._published = 0
+        self._errors = 0
+        self._max_queue_depth = 0
+
+    def subscribe(self, event_type, handler):
+        """Register handler(event) for event_type (or ALL_EVENTS)."""
+        with self._lock:
+            handlers = list(self._subscribers.get(event_type, ()))
+            if handler not in handlers:
+                handlers.append(handler)
+            # Copy-on-write so dispatch can iterate without holding the lock
+            self._subscribers[event_type] = tuple(handlers)
+        return handler
+
+    def unsubscribe(self, event_type, handler):
+        """Remove a handler; unknown handlers are ignored."""
+        with self._lock:
+            handlers = [h for h in self._subscribers.get(event_type, ()) if h != handler]
+            if handlers:
+                self._subscribers[event_type] = tuple(handlers)
+            else:
+                self._subscribers.pop(event_type, None)
+
+    def publish(self, event_type, payload=None, queued=False):
+        """Publish an event, either inline or through the worker queue."""
+        event = Event(event_type, payload)
+        with self._lock:
+            self._published += 1
+        if not queued:
+            self._dispatch(event)
+            return event
+        self._ensure_worker()
+        # The queue is unbounded, so put() never blocks while the lock is held
+        with self._lock:
+            self._queue.put(event)
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return event
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run_worker, name="EventBusWorker", daemon=True)
+            self._worker.start()
+
+    def _run_worker(self):
+        while True:
+            event = self._queue.get()
+            try:
+                if event is None:
+                    return
+                self._dispatch(event)
+            finally:
+                self._queue.task_done()
+
+    def _dispatch(self, event):
+        handlers = self._subscribers.get(event.type, ()) + self._subscribers.get(ALL_EVENTS, ())
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                with self._lock:
+                    self._errors += 1
+                logging.error(f"Event handler {handler!r} failed for {event.type}: {e}")
+        self._record_latency(event, time.perf_counter() - event.published_at)
+
+    def _record_latency(self, event, latency):
+        with self._lock:
+            stats = self._stats.get(event.type)
+            if stats is None:
+                stats = self._stats[event.type] = {"count": 0, "total": 0.0, "max": 0.0}
+            stats["count"] += 1
+            stats["total"] += latency
+            if latency > stats["max"]:
+                stats["max"] = latency
+
+    def drain(self, timeout=None):
+        """Block until every queued event has been dispatched."""
+        if self._worker is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+        return True
+
+    def shutdown(self):
+        """Dispatch anything still queued and stop the worker thread."""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        self._worker = None
+
+    def metrics(self):
+        """Return dispatch latency (ms) per event type and queue depth figures."""
+        with self._lock:
+            latency = {
+                event_type: {
+                    "count": s["count"],
+                    "avg_ms": (s["total"] / s["count"]) * 1000 if s["count"] else 0.0,
+                    "max_ms": s["max"] * 1000,
+                }
+                for event_type, s in self._stats.items()
+            }
+            return {
+                "published": self._published,
+                "handler_errors": self._errors,
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "latency": latency,
+            }
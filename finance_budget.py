@@ -0,0 +1,88 @@
+from bisect import bisect_right
+from datetime import date
+
+
+def current_month():
+    return date.today().strftime("%Y-%m")
+
+
+def month_of(day):
+    """YYYY-MM of a YYYY-MM-DD date."""
+    return day[:7]
+
+
+def shift_month(month, months):
+    year, number = divmod(int(month[:4]) * 12 + int(month[5:7]) - 1 + months, 12)
+    return f"{year:04d}-{number + 1:02d}"
+
+
+def month_label(month):
+    return date(int(month[:4]), int(month[5:7]), 1).strftime("%b %Y")
+
+
+def _effective(values, month):
+    """The value set for month or the latest month before it, else 0."""
+    months = sorted(values)
+    index = bisect_right(months, month)
+    return values[months[index - 1]] if index else 0
+
+
+class BudgetPlan:
+    """Monthly income and per-category budgets, in paise, each effective from its month until changed.
+
+    A category with rollover carries what it did not spend (or overspent)
+    into the next month. Spending comes from the ledger's month x category
+    buckets, so every figure here costs a walk over months, never over
+    transactions.
+    """
+
+    def __init__(self, incomes=None, budgets=None, rollover=()):
+        self.incomes = dict(incomes or {})
+        self.budgets = {category: dict(months) for category, months in (budgets or {}).items()}
+        self.rollover = set(rollover)
+
+    def set_income(self, month, paise):
+        self.incomes[month] = paise
+
+    def income(self, month):
+        return _effective(self.incomes, month)
+
+    def set_budget(self, category, month, paise):
+        self.budgets.setdefault(category, {})[month] = paise
+
+    def budget(self, category, month):
+        return _effective(self.budgets.get(category, {}), month)
+
+    def set_rollover(self, category, enabled):
+        if enabled:
+            self.rollover.add(category)
+        else:
+            self.rollover.discard(category)
+
+    def categories(self):
+        return list(self.budgets)
+
+    def available(self, ledger, category, month):
+        """This month's budget for category plus whatever rolled over from the months before."""
+        months = self.budgets.get(category)
+        if not months:
+            return 0
+        if category not in self.rollover:
+            return self.budget(category, month)
+        carry = 0
+        current = min(months)
+        while current < month:
+            carry += self.budget(category, current) - ledger.month_category_total(current, category)
+            current = shift_month(current, 1)
+        return carry + self.budget(category, month)
+
+    def remaining(self, ledger, month):
+        return self.income(month) - ledger.month_total(month)
+
+    def to_setting(self):
+        return {"incomes": self.incomes, "budgets": self.budgets, "rollover": sorted(self.rollover)}
+
+    @classmethod
+    def from_setting(cls, value):
+        value = value or {}
+        return cls(value.get("incomes"), value.get("budgets"), value.get("rollover", ()))
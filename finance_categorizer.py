@@ -0,0 +1,208 @@
+import re
+
+UNCATEGORIZED = "Uncategorized"
+KEYWORD = "keyword"
+REGEX = "regex"
+RULE_KINDS = (KEYWORD, REGEX)
+
+# The keyword lists categorize_finance used to check, in the same order
+DEFAULT_KEYWORDS = (
+    ("Movies", ("movie", "cinema", "film", "ticket", "theater")),
+    ("Shopping", ("shop", "buy", "purchase", "store", "mall")),
+    ("Groceries", ("grocery", "food", "vegetable", "fruit", "market")),
+)
+# User rules start above the built-in ones so they win a tie with them
+USER_PRIORITY = 1
+
+# Regex features that cannot be nested in one combined pattern: numbered
+# backreferences, named groups and conditionals (their names and numbers
+# would change or clash) and flags that must start a whole pattern
+_DIGITS = re.compile(r"\d")
+# Every ASCII digit to "0": the same text between digits, far fewer distinct descriptions
+_ZERO_DIGITS = str.maketrans("123456789", "0" * 9)
+_NOT_COMBINABLE = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?<(?![=!])|\(\?\(|\(\?[aiLmsux]+\)")
+
+
+class CategoryRule:
+    """Sends descriptions containing a keyword (or matching a regex) to a category.
+
+    Matching is case-insensitive. When several rules match, the highest
+    priority wins and equal priorities go to the rule listed first.
+    """
+    __slots__ = ("category", "kind", "pattern", "priority")
+
+    def __init__(self, category, pattern, kind=KEYWORD, priority=USER_PRIORITY):
+        category = category.strip()
+        if not category:
+            raise ValueError("A rule needs a category name.")
+        if kind not in RULE_KINDS:
+            raise ValueError(f"Unknown rule type: {kind}")
+        if not pattern.strip():
+            raise ValueError("A rule needs a keyword or pattern.")
+        try:
+            priority = int(priority)
+        except (TypeError, ValueError):
+            raise ValueError("Priority must be a whole number.") from None
+        if kind == REGEX:
+            try:
+                compiled = re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid pattern {pattern!r}: {e}") from None
+            if compiled.match(""):
+                raise ValueError(f"Pattern {pattern!r} matches empty text.")
+        self.category = category
+        self.kind = kind
+        self.pattern = pattern.strip().lower() if kind == KEYWORD else pattern
+        self.priority = priority
+
+    def compile(self):
+        """Regex for lowercased descriptions."""
+        return re.compile(re.escape(self.pattern) if self.kind == KEYWORD else self.pattern, re.IGNORECASE)
+
+    def branch(self):
+        """The rule as one branch of a combined regex over lowercased text.
+
+        Keywords are already lowercase, so only regexes carry the
+        case-insensitive flag; a literal branch keeps the engine's fast skip.
+        """
+        return re.escape(self.pattern) if self.kind == KEYWORD else f"(?i:{self.pattern})"
+
+    def combinable(self):
+        """Whether the pattern can be one branch of a combined regex."""
+        return self.kind == KEYWORD or not _NOT_COMBINABLE.search(self.pattern)
+
+    def to_list(self):
+        return [self.category, self.pattern, self.kind, self.priority]
+
+    def __repr__(self):
+        return f"CategoryRule({self.category!r}, {self.pattern!r}, {self.kind!r}, {self.priority!r})"
+
+
+def default_rules():
+    return [CategoryRule(category, keyword, KEYWORD, 0) for category, keywords in DEFAULT_KEYWORDS for keyword in keywords]
+
+
+class Categorizer:
+    """Category rules compiled once into a single regex over every rule.
+
+    compile() ranks the rules best first and joins them into one
+    alternation. Where a search stops, the first branch that matches is the
+    best rule starting at that position; the scan then resumes one
+    character on, so overlapping matches are seen too, and the best
+    matching rule is the lowest rank found in that one pass over the text
+    (stopping early at rank 0). The scan uses the alternation without
+    capture groups, which the regex engine searches several times faster;
+    only at a hit is a copy with one group per rule matched there to tell
+    which branch it was. The few regexes that cannot be nested (see _NOT_COMBINABLE) are
+    searched on their own and resolved by the same rank.
+    """
+
+    def __init__(self, rules=None, default=UNCATEGORIZED):
+        self.rules = default_rules() if rules is None else list(rules)
+        self.default = default
+        self.compile()
+
+    def compile(self):
+        # sorted() is stable, so equal priorities keep the rules' own order
+        ranked = sorted(self.rules, key=lambda rule: -rule.priority)
+        self._categories = [rule.category for rule in ranked]
+        # Keywords without digits match within the text between digits, so the digits themselves can be blanked
+        self._digits_matter = any(rule.kind == REGEX or _DIGITS.search(rule.pattern) for rule in ranked)
+        branches = []
+        # Rank of each capture group; a rule's own groups close before its branch group, so lastindex is the branch
+        self._group_rank = [None]
+        self._separate = []
+        for rank, rule in enumerate(ranked):
+            if rule.combinable():
+                self._group_rank.extend([rank] + [None] * rule.compile().groups)
+                branches.append(rule.branch())
+            else:
+                self._separate.append((rank, rule.compile().search))
+        self._search = self._match = None
+        # With keywords alone the matched text names the branch: the first
+        # (best) rule with that keyword, as the alternation tries them in rank order
+        self._keyword_rank = None
+        if all(rule.kind == KEYWORD for rule in ranked):
+            self._keyword_rank = {}
+            for rank, rule in enumerate(ranked):
+                self._keyword_rank.setdefault(rule.pattern, rank)
+        if branches:
+            self._search = re.compile("|".join(f"(?:{branch})" for branch in branches)).search
+            self._match = re.compile("|".join(f"({branch})" for branch in branches)).match
+
+    def categorize(self, desc):
+        return self._categorize(desc.lower())
+
+    def _categorize(self, lowered):
+        best = len(self._categories)
+        search = self._search
+        if search is not None:
+            group_rank, keyword_rank = self._group_rank, self._keyword_rank
+            match = search(lowered)
+            while match is not None:
+                if keyword_rank is not None:
+                    rank = keyword_rank[match.group()]
+                else:
+                    rank = group_rank[self._match(lowered, match.start()).lastindex]
+                if rank < best:
+                    best = rank
+                    if not rank:
+                        break
+                match = search(lowered, match.start() + 1)
+        for rank, search in self._separate:
+            if rank >= best:
+                break
+            if search(lowered):
+                best = rank
+                break
+        return self._categories[best] if best < len(self._categories) else self.default
+
+    def categorize_many(self, descriptions):
+        """Categories for a batch of descriptions, in the same order.
+
+        Statements repeat their merchants, so each distinct description is
+        matched once. Unless a rule can see digits, digits are all made "0"
+        first, so "Swiggy ref 123" and "Swiggy ref 456" share a result.
+        """
+        descriptions = list(descriptions)
+        if not descriptions:
+            return []
+        # Normalize the whole batch in a few C-level passes instead of per description
+        joined = "\0".join(descriptions)
+        if joined.count("\0") == len(descriptions) - 1:
+            joined = joined.lower()
+            if not self._digits_matter:
+                joined = joined.translate(_ZERO_DIGITS)
+            keys = joined.split("\0")
+        else:
+            keys = [desc.lower() for desc in descriptions]
+        seen = dict.fromkeys(keys)
+        for key in seen:
+            seen[key] = self._categorize(key)
+        return list(map(seen.__getitem__, keys))
+
+    def categories(self):
+        """Every category a rule can produce, in rule order, then the default."""
+        names = list(dict.fromkeys(rule.category for rule in self.rules))
+        if self.default not in names:
+            names.append(self.default)
+        return names
+
+    def add_rule(self, rule):
+        self.rules.append(rule)
+        self.compile()
+
+    def remove_rule(self, index):
+        rule = self.rules.pop(index)
+        self.compile()
+        return rule
+
+    def to_setting(self):
+        return [rule.to_list() for rule in self.rules]
+
+    @classmethod
+    def from_setting(cls, value):
+        """Rebuild from to_setting() output; None means the built-in rules."""
+        if value is None:
+            return cls()
+        return cls([CategoryRule(category, pattern, kind, priority) for category, pattern, kind, priority in value])
@@ -0,0 +1,123 @@
+from calendar import monthrange
+from collections import OrderedDict
+from datetime import date
+from io import BytesIO
+
+PIE = "pie"
+DAILY = "daily"
+BURNDOWN = "burndown"
+CHART_KINDS = (PIE, DAILY, BURNDOWN)
+
+CHART_SIZE = (4.2, 3.4)
+CHART_DPI = 100
+# Categories beyond the largest few share one "Other" slice
+PIE_SLICES = 7
+# Rendered charts kept for reopening the dashboard
+CACHE_CHARTS = 30
+
+
+def last_day(month):
+    """The last day of month a chart shows: the month's end, or today for the current month."""
+    year, number = int(month[:4]), int(month[5:7])
+    today = date.today()
+    if (today.year, today.month) == (year, number):
+        return today.day
+    return monthrange(year, number)[1]
+
+
+def month_days(month):
+    """YYYY-MM-DD for each day of month, stopping at today for the current month."""
+    return [f"{month}-{day:02d}" for day in range(1, last_day(month) + 1)]
+
+
+def chart_data(kind, ledger, month, income):
+    """What a chart of month shows, read from the ledger's buckets: O(days or categories), never O(finances)."""
+    if kind == PIE:
+        spent = sorted(ledger.month_categories(month).items(), key=lambda item: -item[1])
+        if len(spent) > PIE_SLICES:
+            spent[PIE_SLICES - 1:] = [("Other", sum(paise for _, paise in spent[PIE_SLICES - 1:]))]
+        return spent
+    days = month_days(month)
+    totals = [ledger.day_total(day) for day in days]
+    if kind == DAILY:
+        return days, totals
+    remaining = []
+    left = income
+    for paise in totals:
+        left -= paise
+        remaining.append(left)
+    return days, remaining, income, monthrange(int(month[:4]), int(month[5:7]))[1]
+
+
+def _figure():
+    # The Figure API with an Agg canvas, not pyplot: no global state, so it is safe off the UI thread
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=CHART_SIZE, dpi=CHART_DPI)
+    FigureCanvasAgg(figure)
+    return figure, figure.add_subplot()
+
+
+def _png(figure):
+    figure.tight_layout()
+    buffer = BytesIO()
+    figure.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def render_chart(kind, data, title):
+    """PNG bytes of a chart for chart_data() output. Needs matplotlib; raises ImportError without it."""
+    figure, axes = _figure()
+    axes.set_title(title, fontsize=11, fontweight="bold")
+    if kind == PIE:
+        if data:
+            axes.pie([paise for _, paise in data], labels=[category for category, _ in data],
+                     autopct="%1.0f%%", startangle=90, counterclock=False, textprops={"fontsize": 8})
+            axes.axis("equal")
+        else:
+            axes.text(0.5, 0.5, "No finances this month", ha="center", va="center")
+            axes.axis("off")
+    elif kind == DAILY:
+        days, totals = data
+        axes.plot(range(1, len(days) + 1), [paise / 100 for paise in totals], marker="o", markersize=3, color="#3B5998")
+        axes.set_xlabel("Day", fontsize=9)
+        axes.set_ylabel("Spent", fontsize=9)
+        axes.grid(True, alpha=0.4)
+    else:
+        days, remaining, income, month_length = data
+        axes.plot([0, month_length], [income / 100, 0], linestyle="--", color="grey", label="Even pace")
+        axes.plot(range(0, len(days) + 1), [income / 100] + [paise / 100 for paise in remaining],
+                  color="#f44336" if remaining and remaining[-1] < 0 else "#4CAF50", label="Left")
+        axes.axhline(0, color="black", linewidth=0.8)
+        axes.set_xlim(0, month_length)
+        axes.set_xlabel("Day", fontsize=9)
+        axes.legend(fontsize=8)
+        axes.grid(True, alpha=0.4)
+    axes.tick_params(labelsize=8)
+    return _png(figure)
+
+
+class ChartCache:
+    """Rendered charts as PNG bytes, keyed by what they show and the data version they were drawn from.
+
+    Keys include the ledger's month version (and, for charts by day, the
+    last day shown), so a changed month or a new day simply misses; the
+    least recently used charts are dropped beyond the limit.
+    """
+
+    def __init__(self, limit=CACHE_CHARTS):
+        self.limit = limit
+        self._charts = OrderedDict()
+
+    def get(self, key):
+        png = self._charts.get(key)
+        if png is not None:
+            self._charts.move_to_end(key)
+        return png
+
+    def put(self, key, png):
+        self._charts[key] = png
+        self._charts.move_to_end(key)
+        while len(self._charts) > self.limit:
+            self._charts.popitem(last=False)
@@ -0,0 +1,269 @@
+import atexit
+import logging
+import os
+import threading
+
+import numpy as np
+
+DEFAULT_MODEL_PATH = "finance_model.npz"
+
+# Character n-grams of MIN_NGRAM..MAX_NGRAM characters, hashed into 2**FEATURE_BITS buckets per category
+MIN_NGRAM = 2
+MAX_NGRAM = 4
+FEATURE_BITS = 16
+_HASH_PRIME = np.uint64(1_000_003)
+_HASH_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+# Laplace smoothing, and the evidence needed before a suggestion is offered
+ALPHA = 0.5
+MIN_EXAMPLES = 5
+MIN_CONFIDENCE = 0.6
+
+
+def _ngram_hashes(codes):
+    """(size, hashes) for each n-gram size; each size extends the previous one's hashes by a character."""
+    hashed = codes
+    for size in range(2, MAX_NGRAM + 1):
+        hashed = hashed[:-1] * _HASH_PRIME + codes[size - 1:]
+        if size >= MIN_NGRAM:
+            yield size, hashed
+
+
+def _bucket(hashed, bits):
+    return ((hashed * _HASH_MIX) >> np.uint64(64 - bits)).astype(np.intp)
+
+
+def _codes(text):
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+
+def hashed_ngrams(texts, bits=FEATURE_BITS):
+    """(feature ids, text index of each) for the character n-grams of every text.
+
+    Texts are lowercased and padded with a space so word starts and ends form
+    their own n-grams. Hashing runs on all texts at once: their characters
+    are one uint64 array and each n-gram size is one whole-array multiply and
+    add. The hash is fixed arithmetic, unlike hash(), so a saved model means
+    the same thing in the next process.
+    """
+    padded = [f" {text.lower()} " for text in texts]
+    codes = _codes("".join(padded))
+    owners = np.repeat(np.arange(len(padded)), [len(text) for text in padded])
+    features = [np.zeros(0, dtype=np.intp)]
+    rows = [np.zeros(0, dtype=owners.dtype)]
+    for size, hashed in _ngram_hashes(codes):
+        # Keep only n-grams that lie inside one text
+        inside = owners[:len(hashed)] == owners[size - 1:]
+        features.append(_bucket(hashed[inside], bits))
+        rows.append(owners[:len(hashed)][inside])
+    return np.concatenate(features), np.concatenate(rows)
+
+
+def count_ngrams(texts, categories, bits=FEATURE_BITS):
+    """(category names, per-category n-gram counts, examples per category) for a labeled batch."""
+    names = list(dict.fromkeys(categories))
+    index = {name: i for i, name in enumerate(names)}
+    labels = np.fromiter(map(index.__getitem__, categories), dtype=np.int64, count=len(categories))
+    features, rows = hashed_ngrams(texts, bits)
+    width = 1 << bits
+    counts = np.bincount(labels[rows] * width + features, minlength=len(names) * width)
+    return names, counts.reshape(len(names), width).astype(np.int32), np.bincount(labels, minlength=len(names))
+
+
+def text_features(text, bits=FEATURE_BITS):
+    """hashed_ngrams() for one text, without the bookkeeping that keeps texts apart."""
+    hashes = [hashed for _, hashed in _ngram_hashes(_codes(f" {text.lower()} "))]
+    return _bucket(np.concatenate(hashes), bits)
+
+
+class CategoryClassifier:
+    """Multinomial naive Bayes over hashed character n-grams, trained as transactions arrive.
+
+    The model is just per-category n-gram counts, so learn() and unlearn()
+    are a handful of increments and retrain() is one bincount over the whole
+    history. The log probabilities are rebuilt lazily after a change; a
+    prediction then sums one column slice per n-gram of the description.
+    fingerprint records which history the counts describe, so the owner can
+    tell whether a saved model is current.
+    """
+
+    def __init__(self, bits=FEATURE_BITS):
+        self.bits = bits
+        self.categories = []
+        self.counts = np.zeros((0, 1 << bits), dtype=np.int32)
+        self.examples = np.zeros(0, dtype=np.int64)
+        self.fingerprint = None
+        self._log_probs = None
+        self._log_prior = None
+        self._seen = None
+        self._replay = None
+        self._lock = threading.Lock()
+
+    def _category_index(self, category):
+        try:
+            return self.categories.index(category)
+        except ValueError:
+            self.categories.append(category)
+            self.counts = np.vstack([self.counts, np.zeros((1, self.counts.shape[1]), dtype=np.int32)])
+            self.examples = np.append(self.examples, 0)
+            return len(self.categories) - 1
+
+    def learn(self, text, category):
+        self._update(text, category, 1)
+
+    def unlearn(self, text, category):
+        """Take back a learn(), e.g. when the transaction is deleted."""
+        self._update(text, category, -1)
+
+    def _update(self, text, category, sign):
+        features = text_features(text, self.bits)
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append((text, category, sign))
+            self._apply(features, category, sign)
+
+    def learn_many(self, texts, categories):
+        """learn() for a batch, counted in one vectorized pass."""
+        names, counts, examples = count_ngrams(texts, categories, self.bits)
+        with self._lock:
+            if self._replay is not None:
+                self._replay.extend(zip(texts, categories, [1] * len(texts)))
+            for name, name_counts, name_examples in zip(names, counts, examples):
+                index = self._category_index(name)
+                self.counts[index] += name_counts
+                self.examples[index] += name_examples
+            self._log_probs = None
+
+    def _apply(self, features, category, sign):
+        index = self._category_index(category)
+        np.add.at(self.counts[index], features, sign)
+        self.examples[index] += sign
+        self._log_probs = None
+
+    def retrain_in_background(self, texts, categories, fingerprint):
+        """Rebuild the counts from a full history on a worker thread, which is returned.
+
+        learn()/unlearn() calls made from now until the new counts are swapped
+        in are replayed onto them, so nothing added meanwhile is lost.
+        """
+        with self._lock:
+            if self._replay is not None:
+                # A retrain is already running and will replay these changes too
+                return None
+            self._replay = []
+        thread = threading.Thread(target=self._retrain, args=(texts, categories, fingerprint),
+                                  name="CategoryClassifier", daemon=True)
+        thread.start()
+        return thread
+
+    def _retrain(self, texts, categories, fingerprint):
+        names, counts, examples = count_ngrams(texts, categories, self.bits)
+        with self._lock:
+            replay, self._replay = self._replay, None
+            self.categories = names
+            self.counts = counts
+            self.examples = examples
+            self._log_probs = None
+            for text, category, sign in replay:
+                self._apply(text_features(text, self.bits), category, sign)
+            if not replay:
+                # Otherwise the owner has already stamped a newer fingerprint
+                self.fingerprint = fingerprint
+
+    def predict(self, text):
+        """(category, probability) of the likeliest category, or None without enough history."""
+        features = text_features(text, self.bits)
+        with self._lock:
+            if not self._ready():
+                return None
+            # An n-gram no category has seen is no evidence either way
+            features = features[self._seen[features]]
+            if not len(features):
+                return None
+            scores = self._log_probs[:, features].sum(axis=1) + self._log_prior
+            categories = list(self.categories)
+        best = int(np.argmax(scores))
+        probabilities = np.exp(scores - scores[best])
+        return categories[best], float(1 / probabilities.sum())
+
+    def suggest(self, text):
+        """The predicted category when the model is confident enough, else None."""
+        prediction = self.predict(text)
+        if prediction and prediction[1] >= MIN_CONFIDENCE:
+            return prediction[0]
+        return None
+
+    def suggest_many(self, texts):
+        """suggest() for a batch: per-text scores are bincounts over all their n-grams at once."""
+        features, rows = hashed_ngrams(texts, self.bits)
+        with self._lock:
+            if not self._ready():
+                return [None] * len(texts)
+            seen = self._seen[features]
+            features, rows = features[seen], rows[seen]
+            scores = np.stack([np.bincount(rows, weights=log_probs[features], minlength=len(texts))
+                               for log_probs in self._log_probs]) + self._log_prior[:, None]
+            categories = list(self.categories)
+        best = np.argmax(scores, axis=0)
+        confidence = 1 / np.exp(scores - scores[best, np.arange(len(texts))]).sum(axis=0)
+        confident = (confidence >= MIN_CONFIDENCE) & (np.bincount(rows, minlength=len(texts)) > 0)
+        return [categories[b] if ok else None for b, ok in zip(best.tolist(), confident.tolist())]
+
+    def _ready(self):
+        """Whether there is enough history to predict; rebuilds the log probabilities after a change."""
+        if len(self.categories) < 2 or self.examples.sum() < MIN_EXAMPLES:
+            return False
+        if self._log_probs is None:
+            smoothed = self.counts + ALPHA
+            self._log_probs = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+            self._log_prior = np.log((self.examples + 1) / (self.examples.sum() + len(self.categories)))
+            self._seen = self.counts.any(axis=0)
+        return True
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        with self._lock:
+            arrays = {
+                "categories": np.array(self.categories, dtype=str),
+                "counts": self.counts,
+                "examples": self.examples,
+                "fingerprint": np.array(self.fingerprint if self.fingerprint is not None else (), dtype=np.int64),
+            }
+        temp_path = path + ".tmp.npz"
+        try:
+            np.savez(temp_path, **arrays)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logging.error(f"Failed to save finance model to {path}: {e}")
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        """The model saved at path, or an empty one if there is none (or it is unreadable)."""
+        model = cls()
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                counts = data["counts"]
+                model.bits = counts.shape[1].bit_length() - 1
+                model.categories = [str(name) for name in data["categories"]]
+                model.counts = counts.astype(np.int32)
+                model.examples = data["examples"].astype(np.int64)
+                model.fingerprint = tuple(int(value) for value in data["fingerprint"]) or None
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Ignoring unreadable finance model {path}: {e}")
+            model = cls()
+        return model
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_category_classifier():
+    """Return the process-wide category model, loaded from disk and saved again at exit."""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = CategoryClassifier.load()
+            atexit.register(_classifier.save)
+        return _classifier
@@ -0,0 +1,151 @@
+import csv
+import logging
+import os
+import re
+import shutil
+import threading
+
+import numpy as np
+
+try:
+    from .finance_ledger import format_paise
+except ImportError:
+    from finance_ledger import format_paise
+
+DEFAULT_RATES_PATH = "exchange_rates.csv"
+
+# Amounts are kept in hundredths of their own currency; totals are in hundredths of this one
+BASE_CURRENCY = "INR"
+CURRENCY_SYMBOLS = {"INR": "₹", "USD": "$", "EUR": "€", "GBP": "£", "JPY": "¥"}
+
+_CODE = re.compile(r"[A-Z]{3}")
+
+
+def currency_symbol(currency):
+    return CURRENCY_SYMBOLS.get(currency, f"{currency} ")
+
+
+def format_money(paise, currency=BASE_CURRENCY):
+    """e.g. 123456, "USD" -> "$1234.56"."""
+    return f"{currency_symbol(currency)}{format_paise(paise)}"
+
+
+def day_numbers(dates):
+    """Days since 1970-01-01 for YYYY-MM-DD dates, as an int64 array; raises ValueError for a bad date."""
+    return np.array(dates, dtype="datetime64[D]").astype(np.int64)
+
+
+class RateTable:
+    """Exchange rates into BASE_CURRENCY by date, expanded into a currency x day NumPy grid.
+
+    A rate applies from its date until the currency's next one; dates before
+    a currency's first rate use that first rate, and dates after the table's
+    last day use the last. With a rate for every day of the table's span
+    looked up by position, converting any number of amounts in any mix of
+    currencies is one fancy index and a multiply, no search at all. The grid
+    costs 8 bytes per currency per day of the span.
+    """
+
+    def __init__(self, rates=()):
+        """rates is an iterable of (YYYY-MM-DD, currency code, base units per unit of the currency)."""
+        rates = [(date, code.strip().upper(), float(rate)) for date, code, rate in rates]
+        for date, code, rate in rates:
+            if not _CODE.fullmatch(code):
+                raise ValueError(f"Invalid currency code {code!r} on {date}.")
+            if not rate > 0 or rate == float("inf"):
+                raise ValueError(f"Invalid {code} rate {rate!r} on {date}.")
+        rates = [row for row in rates if row[1] != BASE_CURRENCY]
+        self.codes = [BASE_CURRENCY] + sorted({code for _, code, _ in rates})
+        self._index = {code: i for i, code in enumerate(self.codes)}
+        try:
+            days = day_numbers([date for date, _, _ in rates])
+        except ValueError as e:
+            raise ValueError(f"Invalid date in exchange rates: {e}") from None
+        self.start = int(days.min()) if len(days) else 0
+        span = int(days.max()) - self.start + 1 if len(days) else 1
+        # The base currency's row stays at 1
+        self._grid = np.ones((len(self.codes), span))
+        codes = np.array([self._index[code] for _, code, _ in rates], dtype=np.int64)
+        values = np.array([rate for _, _, rate in rates])
+        for index in range(1, len(self.codes)):
+            mine = codes == index
+            # Stable sort, so of two rates for one day the later line wins
+            order = np.argsort(days[mine], kind="stable")
+            known, known_rates = days[mine][order] - self.start, values[mine][order]
+            # Each day takes the last rate set on or before it, or the first one
+            found = np.searchsorted(known, np.arange(span), side="right") - 1
+            self._grid[index] = known_rates[np.maximum(found, 0)]
+
+    def currencies(self):
+        return list(self.codes)
+
+    def currency_ids(self, currencies):
+        """Indexes of currency codes into the table, as an array; raises ValueError for a currency without rates."""
+        try:
+            return np.fromiter(map(self._index.__getitem__, currencies), dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"No exchange rates for {e.args[0]}.") from None
+
+    def rates_for(self, currency_ids, days):
+        """The rate in effect for each (currency index, day number) pair."""
+        return self._grid[currency_ids, np.clip(days - self.start, 0, self._grid.shape[1] - 1)]
+
+    def convert_many(self, paise, currency_ids, days):
+        """Amounts in hundredths of their currencies to base paise, rounded to the nearest paisa."""
+        return np.rint(np.asarray(paise) * self.rates_for(currency_ids, days)).astype(np.int64)
+
+    def convert(self, paise, currency, date):
+        if currency == BASE_CURRENCY:
+            return paise
+        return int(self.convert_many([paise], self.currency_ids([currency]), day_numbers([date]))[0])
+
+    def rate(self, currency, date):
+        return float(self.rates_for(self.currency_ids([currency]), day_numbers([date]))[0])
+
+    @classmethod
+    def load(cls, path=DEFAULT_RATES_PATH):
+        """Read a CSV with date, currency and rate columns; raises ValueError (with the line) for a bad row."""
+        rates = []
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            missing = {"date", "currency", "rate"} - {name.strip().lower() for name in reader.fieldnames or ()}
+            if missing:
+                raise ValueError(f"Exchange rate file needs columns: {', '.join(sorted(missing))}")
+            for row in reader:
+                row = {name.strip().lower(): value for name, value in row.items() if name}
+                try:
+                    # A short row leaves its missing fields None
+                    rates.append((row["date"].strip(), row["currency"].strip(), float(row["rate"])))
+                except (AttributeError, TypeError, ValueError):
+                    raise ValueError(f"Invalid exchange rate on line {reader.line_num}.") from None
+        return cls(rates)
+
+
+_rates = None
+_rates_lock = threading.Lock()
+
+
+def get_rate_table():
+    """Return the process-wide exchange rates, read from the local rate file (base currency only without one)."""
+    global _rates
+    with _rates_lock:
+        if _rates is None:
+            try:
+                _rates = RateTable.load()
+            except FileNotFoundError:
+                _rates = RateTable()
+            except (OSError, ValueError, csv.Error) as e:
+                logging.warning(f"Ignoring unreadable exchange rates {DEFAULT_RATES_PATH}: {e}")
+                _rates = RateTable()
+        return _rates
+
+
+def install_rate_file(path):
+    """Check a rate file, keep a local copy of it and make it the process-wide table."""
+    global _rates
+    table = RateTable.load(path)
+    if os.path.abspath(path) != os.path.abspath(DEFAULT_RATES_PATH):
+        shutil.copyfile(path, DEFAULT_RATES_PATH)
+    with _rates_lock:
+        _rates = table
+    return table
@@ -0,0 +1,256 @@
+import csv
+import os
+import re
+from collections import Counter
+from datetime import datetime
+
+try:
+    from .finance_ledger import to_paise
+    from .datetime_parse import parse_date
+except ImportError:
+    from finance_ledger import to_paise
+    from datetime_parse import parse_date
+
+# Statement rows parsed and categorized per step
+CHUNK_ROWS = 10_000
+OFX_BLOCK_BYTES = 1 << 20
+
+# Header names banks commonly use, tried in order when guessing a profile
+_HEADER_GUESSES = {
+    "date": ("date", "txn date", "transaction date", "value date", "posting date", "value dt"),
+    "description": ("description", "narration", "details", "particulars", "remarks", "payee", "memo"),
+    "amount": ("amount", "transaction amount", "amt"),
+    "debit": ("debit", "withdrawal", "withdrawal amt.", "withdrawal amount", "debit amount", "dr"),
+}
+_AMOUNT_NOISE = re.compile(r"[,\s₹$€£]|inr|rs\.?", re.IGNORECASE)
+_OFX_TRANSACTION = re.compile(rb"<STMTTRN>(.*?)</STMTTRN>", re.IGNORECASE | re.DOTALL)
+_OFX_START = re.compile(rb"<STMTTRN>", re.IGNORECASE)
+_OFX_FIELD = re.compile(rb"<(TRNAMT|DTPOSTED|NAME|MEMO)>([^<\r\n]*)", re.IGNORECASE)
+
+
+def statement_formats():
+    return [("Bank statements", "*.csv *.ofx *.qfx"), ("CSV files", "*.csv"), ("OFX/QFX files", "*.ofx *.qfx")]
+
+
+def is_ofx(path):
+    return os.path.splitext(path)[1].lower() in (".ofx", ".qfx")
+
+
+class StatementProfile:
+    """Where a bank's CSV export keeps each field.
+
+    Amounts come from one signed column (expenses_negative says which sign is
+    spending) or from a debit column, where only filled rows are spending.
+    date_format is a strptime format; left empty, the usual dd/mm/yyyy and
+    ISO layouts are recognised.
+    """
+
+    def __init__(self, date="", description="", amount="", debit="", date_format="",
+                 expenses_negative=True, delimiter=","):
+        self.date = date
+        self.description = description
+        self.amount = amount
+        self.debit = debit
+        self.date_format = date_format
+        self.expenses_negative = expenses_negative
+        self.delimiter = delimiter
+
+    @classmethod
+    def guess(cls, header, delimiter=","):
+        """A profile matching a header row by common column names."""
+        names = {name.strip().lower(): name for name in header}
+        found = {}
+        for field, candidates in _HEADER_GUESSES.items():
+            found[field] = next((names[candidate] for candidate in candidates if candidate in names), "")
+        if found["debit"]:
+            found["amount"] = ""
+        return cls(delimiter=delimiter, **found)
+
+    def validate(self, header):
+        if not self.date or not self.description:
+            raise ValueError("Choose the date and description columns.")
+        if not self.amount and not self.debit:
+            raise ValueError("Choose an amount column or a debit column.")
+        missing = [name for name in (self.date, self.description, self.amount, self.debit)
+                   if name and name not in header]
+        if missing:
+            raise ValueError(f"Columns not in this file: {', '.join(missing)}")
+
+    def to_setting(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_setting(cls, value):
+        return cls(**value) if value else None
+
+
+def read_header(path, delimiter=","):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f, delimiter=delimiter), [])
+
+
+def parse_amount(text):
+    """Paise for a statement amount such as "1,234.50", "-99", "₹ 45" or "(12.00)"; None if blank."""
+    text = _AMOUNT_NOISE.sub("", text or "")
+    if not text:
+        return None
+    if text.startswith("(") and text.endswith(")"):
+        text = "-" + text[1:-1]
+    return to_paise(text)
+
+
+def _iso_date(text, date_format):
+    text = text.strip()
+    if date_format:
+        return datetime.strptime(text, date_format).strftime("%Y-%m-%d")
+    value = parse_date(text)
+    if value is None:
+        raise ValueError(f"Unrecognised date: {text!r}")
+    return value.isoformat()
+
+
+def clean_description(text):
+    # The same characters add_transaction refuses, so imported rows look like typed ones
+    return " ".join(re.sub(r"[,;\n]", " ", text).split())
+
+
+def read_csv_statement(path, profile, chunk_rows=CHUNK_ROWS):
+    """Yield ([(desc, paise, date)], skipped, fraction read) per chunk of expense rows.
+
+    Credits, zero amounts and rows that do not parse are counted as skipped.
+    """
+    size = max(os.path.getsize(path), 1)
+    read = 0
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        def lines():
+            nonlocal read
+            for line in f:
+                read += len(line)
+                yield line
+
+        reader = csv.reader(lines(), delimiter=profile.delimiter)
+        header = next(reader, [])
+        profile.validate(header)
+        column = {name: index for index, name in enumerate(header)}
+        date_at = column[profile.date]
+        desc_at = column[profile.description]
+        amount_at = column.get(profile.amount)
+        debit_at = column.get(profile.debit)
+        sign = -1 if profile.expenses_negative else 1
+        rows = []
+        skipped = 0
+        for record in reader:
+            try:
+                if debit_at is not None:
+                    paise = parse_amount(record[debit_at])
+                else:
+                    paise = parse_amount(record[amount_at])
+                    paise = paise * sign if paise is not None else None
+                desc = clean_description(record[desc_at])
+                if not paise or paise < 0 or not desc:
+                    skipped += 1
+                    continue
+                rows.append((desc, paise, _iso_date(record[date_at], profile.date_format)))
+            except (IndexError, ValueError):
+                skipped += 1
+                continue
+            if len(rows) >= chunk_rows:
+                yield rows, skipped, min(read / size, 1.0)
+                rows, skipped = [], 0
+        yield rows, skipped, 1.0
+
+
+def _ofx_text(value):
+    return value.decode("utf-8", "replace").strip()
+
+
+def read_ofx_statement(path, chunk_rows=CHUNK_ROWS):
+    """Yield ([(desc, paise, date)], skipped, fraction read) from an OFX/QFX file, read in fixed-size blocks.
+
+    Works for SGML (OFX 1.x) and XML (OFX 2.x) files; only debits (negative TRNAMT) are expenses.
+    """
+    size = max(os.path.getsize(path), 1)
+    read = 0
+    rows = []
+    skipped = 0
+    buffer = b""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(OFX_BLOCK_BYTES)
+            read += len(block)
+            buffer += block
+            end = 0
+            for match in _OFX_TRANSACTION.finditer(buffer):
+                end = match.end()
+                fields = {name.upper(): _ofx_text(value) for name, value in _OFX_FIELD.findall(match.group(1))}
+                try:
+                    paise = -parse_amount(fields.get(b"TRNAMT", ""))
+                    posted = fields.get(b"DTPOSTED", "")[:8]
+                    date = datetime.strptime(posted, "%Y%m%d").strftime("%Y-%m-%d")
+                except (TypeError, ValueError):
+                    skipped += 1
+                    continue
+                desc = clean_description(fields.get(b"NAME") or fields.get(b"MEMO") or "")
+                if paise <= 0 or not desc:
+                    skipped += 1
+                    continue
+                rows.append((desc, paise, date))
+            # Keep an unfinished transaction (or a tag split across blocks) for the next block
+            start = _OFX_START.search(buffer, end)
+            buffer = buffer[start.start():] if start else buffer[max(end, len(buffer) - 16):]
+            if len(rows) >= chunk_rows or not block:
+                yield rows, skipped, min(read / size, 1.0)
+                rows, skipped = [], 0
+            if not block:
+                return
+
+
+def dedup_key(desc, paise, date):
+    return (date, paise, desc.lower())
+
+
+class ImportResult:
+    """What an import found; rows are (desc, paise, category, date) ready to store."""
+
+    def __init__(self):
+        self.rows = []
+        self.duplicates = 0
+        self.skipped = 0
+        self.cancelled = False
+
+    def summary(self):
+        text = f"Imported {len(self.rows)} finances, skipped {self.duplicates} already recorded and {self.skipped} other rows."
+        return "Import cancelled; nothing was added." if self.cancelled else text
+
+
+def import_statement(path, profile, existing, categorize_many, progress=None, cancelled=lambda: False):
+    """Read a statement, categorize it in batches and drop rows already recorded.
+
+    existing is an iterable of (desc, paise, date) for the stored finances.
+    Duplicates are found through a multiset of dedup keys, so a statement
+    with two identical coffees on one day still matches two stored ones and
+    only the rows beyond those are new. Nothing is stored here; the caller
+    commits result.rows in one go, so a cancelled import leaves no trace.
+    """
+    index = Counter(dedup_key(*row) for row in existing)
+    chunks = read_ofx_statement(path) if is_ofx(path) else read_csv_statement(path, profile)
+    result = ImportResult()
+    for rows, skipped, fraction in chunks:
+        if cancelled():
+            result.cancelled = True
+            result.rows = []
+            break
+        result.skipped += skipped
+        fresh = []
+        for row in rows:
+            key = dedup_key(*row)
+            if index[key]:
+                index[key] -= 1
+                result.duplicates += 1
+            else:
+                fresh.append(row)
+        categories = categorize_many([desc for desc, _, _ in fresh])
+        result.rows.extend((desc, paise, category, date) for (desc, paise, date), category in zip(fresh, categories))
+        if progress:
+            progress(len(result.rows), result.duplicates + result.skipped, fraction)
+    return result
@@ -0,0 +1,221 @@
+import atexit
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+
+DEFAULT_JOURNAL_PATH = "finance_journal.jsonl"
+DEFAULT_SNAPSHOT_PATH = "finance_snapshot.jsonl"
+
+# Journal records, one JSON array per line:
+#   ["add", id, desc, paise, category, date]  (plus the currency when it is not the base one)
+#   ["del", id]
+#   ["salary", paise]
+#   ["batch", [record, ...]]  one line, so a crash mid-write loses all of it or none
+ADD = "add"
+DELETE = "del"
+SALARY = "salary"
+BATCH = "batch"
+
+# Fold the journal into a new snapshot once it holds this many records and more than the live rows
+COMPACT_MIN_RECORDS = 1000
+
+_COMPACT = object()
+
+
+def _read_lines(path):
+    """Yield the lines of a file through mmap, so the OS pages it in instead of Python buffering it."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b""):
+                yield line
+
+
+def _dumps(record):
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+class FinanceJournal:
+    """Durable finance storage: a compacted snapshot plus an append-only journal.
+
+    append() only queues the record; a background thread writes queued records
+    in one go and fsyncs once per batch, so adding a transaction never waits on
+    the disk. Replaying is keyed by transaction id, so a record that is in both
+    the snapshot and the journal (a crash mid-compaction) is applied once.
+    """
+
+    def __init__(self, journal_path=DEFAULT_JOURNAL_PATH, snapshot_path=DEFAULT_SNAPSHOT_PATH, sync_interval=0.2):
+        self.journal_path = journal_path
+        self.snapshot_path = snapshot_path
+        self.sync_interval = sync_interval
+        self.journal_records = 0
+        self._pending = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self._file = None
+        self._syncs = 0
+
+    def load(self):
+        """Return (salary paise, {id: (desc, paise, category, date[, currency])} in insertion order, next id)."""
+        self.flush()
+        salary = 0
+        rows = {}
+        next_id = 1
+        for number, line in enumerate(_read_lines(self.snapshot_path)):
+            record = json.loads(line)
+            if number == 0:
+                salary, next_id = record["salary"], record["next_id"]
+            else:
+                rows[record[0]] = tuple(record[1:])
+        self.journal_records = 0
+        for line in _read_lines(self.journal_path):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A torn final line from a crash mid-write; everything before it is intact
+                logging.warning(f"Ignoring unreadable record in {self.journal_path}")
+                continue
+            records = record[1] if record[0] == BATCH else (record,)
+            self.journal_records += len(records)
+            for record in records:
+                op = record[0]
+                if op == ADD:
+                    rows[record[1]] = tuple(record[2:])
+                    next_id = max(next_id, record[1] + 1)
+                elif op == DELETE:
+                    rows.pop(record[1], None)
+                elif op == SALARY:
+                    salary = record[1]
+        return salary, rows, next_id
+
+    def add(self, transaction_id, desc, paise, category, date, *currency):
+        self._append([ADD, transaction_id, desc, paise, category, date, *currency])
+
+    def add_many(self, rows):
+        """Queue adds for rows of (id, desc, paise, category, date[, currency]) as one batch record that replays all or nothing."""
+        self._append([BATCH, [[ADD, *row] for row in rows]], len(rows))
+
+    def delete(self, transaction_id):
+        self._append([DELETE, transaction_id])
+
+    def set_salary(self, paise):
+        self._append([SALARY, paise])
+
+    def should_compact(self, live_rows):
+        return self.journal_records >= COMPACT_MIN_RECORDS and self.journal_records > live_rows
+
+    def compact(self, salary, rows, next_id):
+        """Queue a snapshot of the state as of now; rows is a list of (id, desc, paise, category, date[, currency])."""
+        with self._lock:
+            self._pending.append((_COMPACT, salary, rows, next_id))
+            self.journal_records = 0
+            self._ensure_thread()
+            self._wakeup.notify()
+
+    def _append(self, record, records=1):
+        line = _dumps(record)
+        with self._lock:
+            self._pending.append(line)
+            self.journal_records += records
+            self._ensure_thread()
+            self._wakeup.notify()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="FinanceJournal", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wakeup.wait()
+            # Let a burst of appends gather so they share one fsync
+            time.sleep(self.sync_interval)
+            self.flush()
+
+    def flush(self):
+        """Write and fsync everything queued; safe to call from any thread."""
+        with self._io_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = []
+            if not pending:
+                return
+            start = 0
+            try:
+                for i, item in enumerate(pending):
+                    if isinstance(item, str):
+                        continue
+                    self._write_journal(pending[start:i])
+                    self._write_snapshot(*item[1:])
+                    start = i + 1
+                self._write_journal(pending[start:])
+            except OSError as e:
+                logging.error(f"Finance journal write failed, keeping {len(pending) - start} records queued: {e}")
+                with self._lock:
+                    # Replay is idempotent, so re-writing a partly written batch is harmless
+                    self._pending[:0] = pending[start:]
+
+    def _write_journal(self, lines):
+        if not lines:
+            return
+        if self._file is None:
+            self._file = open(self.journal_path, "a", encoding="utf-8", newline="\n")
+            if not _ends_with_newline(self.journal_path):
+                # Seal off a torn last record so the next one starts on its own line
+                self._file.write("\n")
+        self._file.write("".join(lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._syncs += 1
+
+    def _write_snapshot(self, salary, rows, next_id):
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(json.dumps({"salary": salary, "next_id": next_id}) + "\n")
+            f.writelines(_dumps(row) for row in rows)
+            f.flush()
+            os.fsync(f.fileno())
+        # The new snapshot is durable before the journal it replaces is emptied
+        os.replace(temp_path, self.snapshot_path)
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.journal_path, "w", encoding="utf-8", newline="\n")
+        os.fsync(self._file.fileno())
+        logging.info(f"Compacted finance journal into a snapshot of {len(rows)} transactions")
+
+    def stats(self):
+        return {"journal_records": self.journal_records, "fsyncs": self._syncs, "pending": len(self._pending)}
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_finance_journal():
+    """Return the process-wide finance journal."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = FinanceJournal()
+            atexit.register(_journal.flush)
+        return _journal
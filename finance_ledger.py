@@ -0,0 +1,113 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from itertools import count
+
+_PAISA = Decimal("0.01")
+# Shared by every ledger, so a version number never describes two different states
+_versions = count(1)
+
+
+def to_paise(value):
+    """Exact integer paise for a rupee amount given as text, int, float or Decimal.
+
+    Raises ValueError for anything that is not a finite number.
+    """
+    try:
+        amount = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {value!r}") from None
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    return int(amount.quantize(_PAISA, rounding=ROUND_HALF_UP) * 100)
+
+
+def format_paise(paise):
+    """Rupees with two decimals, e.g. 123456 -> "1234.56"."""
+    sign = "-" if paise < 0 else ""
+    rupees, paisa = divmod(abs(paise), 100)
+    return f"{sign}{rupees}.{paisa:02d}"
+
+
+class Ledger:
+    """Running spending totals in integer paise of the base currency, updated on every add and remove.
+
+    Totals overall, per category, per day (YYYY-MM-DD), per month (YYYY-MM)
+    and per month and category are plain dict lookups, so the summary never
+    rescans the transactions and integer arithmetic keeps them exact however
+    many adds and deletes happen. Each month also has a version that changes
+    whenever its spending does, for caching anything derived from it.
+    """
+
+    def __init__(self, salary=0):
+        self.salary = salary
+        self.total = 0
+        self.count = 0
+        self.by_category = {}
+        self.by_day = {}
+        self.by_month = {}
+        self.by_month_category = {}
+        self.month_versions = {}
+
+    def add(self, transaction):
+        self._apply(transaction, 1)
+
+    def remove(self, transaction):
+        self._apply(transaction, -1)
+
+    def clear(self):
+        self.total = 0
+        self.count = 0
+        self.by_category = {}
+        self.by_day = {}
+        self.by_month = {}
+        self.by_month_category = {}
+        self.month_versions = {}
+
+    def _apply(self, transaction, sign):
+        paise = transaction.base_paise * sign
+        self.total += paise
+        self.count += sign
+        day = transaction.date
+        month = day[:7]
+        month_categories = self.by_month_category.setdefault(month, {})
+        for totals, key in ((self.by_category, transaction.category), (self.by_day, day), (self.by_month, month),
+                            (month_categories, transaction.category)):
+            value = totals.get(key, 0) + paise
+            if value or sign > 0:
+                totals[key] = value
+            else:
+                # Drop empty buckets so the dicts only hold days/categories with spending
+                totals.pop(key, None)
+        if not month_categories:
+            del self.by_month_category[month]
+        self.month_versions[month] = next(_versions)
+
+    def remaining(self):
+        return self.salary - self.total
+
+    def category_total(self, category):
+        return self.by_category.get(category, 0)
+
+    def day_total(self, day):
+        return self.by_day.get(day, 0)
+
+    def month_total(self, month):
+        return self.by_month.get(month, 0)
+
+    def month_category_total(self, month, category):
+        return self.by_month_category.get(month, {}).get(category, 0)
+
+    def month_categories(self, month):
+        """{category: paise} spent in month."""
+        return dict(self.by_month_category.get(month, {}))
+
+    def month_version(self, month):
+        """Changes whenever month's totals do; 0 for a month that never had spending."""
+        return self.month_versions.get(month, 0)
+
+    def months(self):
+        return sorted(self.by_month)
+
+    def year_to_date(self, month):
+        """Spent from January of month's year through month."""
+        year = month[:4]
+        return sum(total for key, total in self.by_month.items() if key[:4] == year and key <= month)
@@ -0,0 +1,220 @@
+import os
+import zlib
+from bisect import bisect_right
+from itertools import accumulate, islice
+
+try:
+    from .finance_ledger import format_paise
+except ImportError:
+    from finance_ledger import format_paise
+
+# A4 in points, with the margins the old SimpleDocTemplate report used
+PAGE_WIDTH = 595.28
+PAGE_HEIGHT = 841.89
+MARGIN = 30
+
+COLUMNS = (("Description", 150), ("Amount", 100), ("Category", 100), ("Date", 100))
+HEADER_HEIGHT = 24
+ROW_HEIGHT = 18
+CELL_PADDING = 6
+TITLE_SIZE = 18
+TEXT_SIZE = 10
+LINE_SPACE = 24
+FOOTER_SPACE = 30
+
+# Pages written between progress reports
+PROGRESS_PAGES = 25
+
+# Helvetica advance widths (1/1000 em) for printable ASCII; any other byte is taken as 556
+_HELVETICA_WIDTHS = [556] * 32 + list((278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+     556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+     1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+     667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+     333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+     556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584)) + [556] * 129
+
+# Greys of the old table style: header, header text and every other row
+_HEADER_FILL = "0.5 g"
+_HEADER_TEXT = "0.96 g"
+_STRIPE_FILL = "0.827 g"
+
+_REGULAR = "F1"
+_BOLD = "F2"
+
+
+def _encode(text):
+    # One byte per character, as the page will hold it
+    return text.encode("cp1252", "replace")
+
+
+def text_width(text, size):
+    return sum(map(_HELVETICA_WIDTHS.__getitem__, _encode(text))) * size / 1000
+
+
+def fit_text(text, width, size):
+    """text, cut short with "..." if it is wider than width."""
+    limit = width * 1000 / size
+    widths = list(accumulate(map(_HELVETICA_WIDTHS.__getitem__, _encode(text))))
+    if not widths or widths[-1] <= limit:
+        return text
+    return text[:bisect_right(widths, limit - 3 * _HELVETICA_WIDTHS[ord(".")])].rstrip() + "..."
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _text(x, y, text, font=_REGULAR, size=TEXT_SIZE):
+    return f"BT /{font} {size} Tf {x:.2f} {y:.2f} Td ({_escape(text)}) Tj ET"
+
+
+def _centered(x, width, y, text, font=_REGULAR, size=TEXT_SIZE):
+    text = fit_text(text, width - 2 * CELL_PADDING, size)
+    return _text(x + (width - text_width(text, size)) / 2, y, text, font, size)
+
+
+class PdfWriter:
+    """A PDF written object by object straight to a file.
+
+    Only the byte offset of each object is kept (for the cross-reference
+    table at the end), so a page costs a few integers of memory once it
+    has been written. Text uses the built-in Helvetica fonts with
+    WinAnsi encoding; characters outside it print as "?".
+    """
+
+    CATALOG = 1
+    PAGES = 2
+    FONTS = {_REGULAR: 3, _BOLD: 4}
+
+    def __init__(self, f):
+        self.f = f
+        self.offsets = [0] * 5
+        self.pages = []
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(self.CATALOG, f"<< /Type /Catalog /Pages {self.PAGES} 0 R >>".encode())
+        for name, number in self.FONTS.items():
+            base = "Helvetica-Bold" if name == _BOLD else "Helvetica"
+            self._object(number, f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} /Encoding /WinAnsiEncoding >>".encode())
+
+    def _reserve(self):
+        self.offsets.append(0)
+        return len(self.offsets) - 1
+
+    def _object(self, number, body):
+        self.offsets[number] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    def add_page(self, operations):
+        """Write one page whose content is a list of PDF drawing operations."""
+        data = zlib.compress(_encode("\n".join(operations)))
+        contents = self._reserve()
+        self._object(contents, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+        page = self._reserve()
+        fonts = " ".join(f"/{name} {number} 0 R" for name, number in self.FONTS.items())
+        self._object(page, (f"<< /Type /Page /Parent {self.PAGES} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                            f"/Resources << /Font << {fonts} >> >> /Contents {contents} 0 R >>").encode())
+        self.pages.append(page)
+
+    def close(self):
+        """Write the page tree, cross-reference table and trailer."""
+        kids = " ".join(f"{page} 0 R" for page in self.pages)
+        self._object(self.PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>".encode())
+        start = self.f.tell()
+        self.f.write(b"xref\n0 %d\n0000000000 65535 f \n" % len(self.offsets))
+        self.f.write(b"".join(b"%010d 00000 n \n" % offset for offset in self.offsets[1:]))
+        self.f.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(self.offsets), self.CATALOG, start))
+
+
+def _table(top, rows):
+    """Operations drawing a header row and rows of cell texts below y=top, in the old report's style."""
+    widths = [width for _, width in COLUMNS]
+    left = (PAGE_WIDTH - sum(widths)) / 2
+    edges = [left]
+    for width in widths:
+        edges.append(edges[-1] + width)
+    bottom = top - HEADER_HEIGHT - ROW_HEIGHT * len(rows)
+    ops = [_HEADER_FILL, f"{left:.2f} {top - HEADER_HEIGHT:.2f} {sum(widths)} {HEADER_HEIGHT} re f", _STRIPE_FILL]
+    ops.extend(f"{left:.2f} {top - HEADER_HEIGHT - ROW_HEIGHT * (i + 1):.2f} {sum(widths)} {ROW_HEIGHT} re f"
+               for i in range(1, len(rows), 2))
+    # Grid, then a heavier outer box
+    ops.append("0 G 1 w")
+    ops.extend(f"{x:.2f} {top:.2f} m {x:.2f} {bottom:.2f} l S" for x in edges[1:-1])
+    ops.extend(f"{left:.2f} {top - HEADER_HEIGHT - ROW_HEIGHT * i:.2f} m {edges[-1]:.2f} {top - HEADER_HEIGHT - ROW_HEIGHT * i:.2f} l S"
+               for i in range(len(rows)))
+    ops.append(f"2 w {left:.2f} {bottom:.2f} {sum(widths)} {top - bottom:.2f} re S")
+    ops.append(_HEADER_TEXT)
+    baseline = top - HEADER_HEIGHT + 8
+    ops.extend(_centered(x, width, baseline, name, _BOLD, 11) for x, (name, width) in zip(edges, COLUMNS))
+    ops.append("0 g")
+    for i, cells in enumerate(rows):
+        baseline = top - HEADER_HEIGHT - ROW_HEIGHT * (i + 1) + 5
+        ops.extend(_centered(x, width, baseline, cell) for x, width, cell in zip(edges, widths, cells))
+    return ops, bottom
+
+
+def page_capacity(lines):
+    """(rows on the first page, rows on each later page) when the first page starts with lines of text."""
+    table_space = PAGE_HEIGHT - 2 * MARGIN - FOOTER_SPACE - HEADER_HEIGHT
+    first = table_space - TITLE_SIZE - 12 - LINE_SPACE * len(lines)
+    return int(first // ROW_HEIGHT), int(table_space // ROW_HEIGHT)
+
+
+def page_count(total_rows, lines):
+    first, later = page_capacity(lines)
+    return 1 + max(0, -(-(total_rows - first) // later))
+
+
+def write_finance_report(path, title, lines, rows, total_rows, progress=None, cancelled=lambda: False):
+    """Write rows of (desc, paise, category, date) to a paginated PDF report at path.
+
+    rows may be any iterable; it is consumed one page of rows at a time and
+    every page goes to the file as soon as it is laid out, so memory does not
+    grow with the history. The report is written next to path and moved into
+    place when complete. Returns the number of pages, or None if cancelled()
+    turned true first (nothing is left behind then). progress(rows written,
+    total_rows) is called every PROGRESS_PAGES pages.
+    """
+    first, later = page_capacity(lines)
+    pages = page_count(total_rows, lines)
+    rows = iter(rows)
+    done = 0
+    completed = False
+    temp_path = path + ".part"
+    try:
+        with open(temp_path, "wb") as f:
+            pdf = PdfWriter(f)
+            for number in range(1, pages + 1):
+                if cancelled():
+                    break
+                top = PAGE_HEIGHT - MARGIN
+                ops = []
+                if number == 1:
+                    ops.append(_text((PAGE_WIDTH - text_width(title, TITLE_SIZE)) / 2, top - TITLE_SIZE, title, _BOLD, TITLE_SIZE))
+                    top -= TITLE_SIZE + 12
+                    for line in lines:
+                        ops.append(_text(MARGIN, top - TEXT_SIZE, line))
+                        top -= LINE_SPACE
+                cells = [(desc, format_paise(paise), category, date)
+                         for desc, paise, category, date in islice(rows, first if number == 1 else later)]
+                done += len(cells)
+                table, bottom = _table(top, cells)
+                ops.extend(table)
+                if number == pages:
+                    ops.append(_text(MARGIN, bottom - 12 - TEXT_SIZE, "Generated by Finance Tracker"))
+                page_label = f"Page {number} of {pages}"
+                ops.append(_text(PAGE_WIDTH - MARGIN - text_width(page_label, 9), MARGIN / 2, page_label, size=9))
+                pdf.add_page(ops)
+                if progress and (number % PROGRESS_PAGES == 0 or number == pages):
+                    progress(done, total_rows)
+            else:
+                pdf.close()
+                completed = True
+        if not completed:
+            os.remove(temp_path)
+            return None
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return pages
@@ -1,54 +1,169 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import messagebox, ttk, filedialog
 import json
+import base64
+import logging
 from datetime import datetime
 import csv
 from pathlib import Path
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 import os
 import platform
 import subprocess
-import tempfile
+import threading
 import webbrowser
-from io import BytesIO
+from decimal import Decimal
+try:
+    from .event_bus import EXPENSE_ADDED, EXPENSE_DELETED, EXPENSES_IMPORTED
+    from .finance_ledger import Ledger, to_paise, format_paise
+    from .finance_journal import get_finance_journal
+    from .treeview_binder import VirtualListbox
+    from .finance_categorizer import Categorizer, CategoryRule, RULE_KINDS, USER_PRIORITY
+    from .storage import get_storage
+    from .finance_classifier import get_category_classifier
+    from .finance_import import StatementProfile, import_statement, is_ofx, read_header, statement_formats
+    from .finance_budget import BudgetPlan, current_month, month_of, month_label, shift_month
+    from .finance_report import write_finance_report
+    from .finance_charts import ChartCache, CHART_KINDS, PIE, DAILY, BURNDOWN, chart_data, last_day, render_chart
+    from .finance_currency import BASE_CURRENCY, day_numbers, format_money, get_rate_table, install_rate_file
+except ImportError:
+    from event_bus import EXPENSE_ADDED, EXPENSE_DELETED, EXPENSES_IMPORTED
+    from finance_ledger import Ledger, to_paise, format_paise
+    from finance_journal import get_finance_journal
+    from treeview_binder import VirtualListbox
+    from finance_categorizer import Categorizer, CategoryRule, RULE_KINDS, USER_PRIORITY
+    from storage import get_storage
+    from finance_classifier import get_category_classifier
+    from finance_import import StatementProfile, import_statement, is_ofx, read_header, statement_formats
+    from finance_budget import BudgetPlan, current_month, month_of, month_label, shift_month
+    from finance_report import write_finance_report
+    from finance_charts import ChartCache, CHART_KINDS, PIE, DAILY, BURNDOWN, chart_data, last_day, render_chart
+    from finance_currency import BASE_CURRENCY, day_numbers, format_money, get_rate_table, install_rate_file
+
+ALL_MONTHS = "All months"
+
+
+def position_of(transactions, transaction_id):
+    """Index of transaction_id in a list of transactions ordered by id, found by bisection."""
+    low, high = 0, len(transactions)
+    while low < high:
+        middle = (low + high) // 2
+        if transactions[middle].id < transaction_id:
+            low = middle + 1
+        else:
+            high = middle
+    return low
 
 class Transaction:
-    """Represents a single finance transaction."""
-    def __init__(self, desc, amount, category, date):
+    """Represents a single finance transaction.
+    
+    paise is the amount in hundredths of its own currency; base_paise is the
+    same amount in the base currency, which is what totals and budgets add up.
+    """
+    def __init__(self, desc, amount, category, date, id=None, currency=BASE_CURRENCY, base_paise=None):
+        self.id = id
         self.desc = desc
-        self.amount = amount
+        self.paise = to_paise(amount)
         self.category = category
         self.date = date
+        self.currency = currency
+        self.base_paise = self.paise if base_paise is None else base_paise
+    
+    @classmethod
+    def from_paise(cls, id, desc, paise, category, date, currency=BASE_CURRENCY, base_paise=None):
+        """Rebuild a stored transaction without re-parsing its amount."""
+        transaction = cls.__new__(cls)
+        transaction.id = id
+        transaction.desc = desc
+        transaction.paise = paise
+        transaction.category = category
+        transaction.date = date
+        transaction.currency = currency
+        transaction.base_paise = paise if base_paise is None else base_paise
+        return transaction
+    
+    @property
+    def amount(self):
+        """Amount in its own currency as an exact Decimal."""
+        return Decimal(self.paise) / 100
     
     def to_string(self):
         """Format transaction for display."""
-        return f"{self.desc} ({self.category}): ₹{self.amount:.2f} on {self.date}"
+        money = format_money(self.paise, self.currency)
+        if self.currency != BASE_CURRENCY:
+            money += f" ({format_money(self.base_paise)})"
+        return f"{self.desc} ({self.category}): {money} on {self.date}"
+    
+    def to_row(self):
+        """(id, desc, paise, category, date) as stored, plus the currency when it is not the base one."""
+        row = (self.id, self.desc, self.paise, self.category, self.date)
+        return row if self.currency == BASE_CURRENCY else row + (self.currency,)
     
     def to_dict(self):
         """Convert transaction to dictionary for JSON storage."""
         return {
             "desc": self.desc,
-            "amount": self.amount,
+            "amount": format_paise(self.paise),
+            "currency": self.currency,
             "category": self.category,
             "date": self.date
         }
 
+class FinanceView:
+    """Keeps direct references to the widgets showing finance state and patches them per change.
+
+    The summary label is updated in place and the history listbox is virtual,
+    so adding or deleting a transaction touches one line however long the
+    history is.
+    """
+    def __init__(self, summary_label, history_listbox, scrollbar, transactions):
+        self.summary_label = summary_label
+        self.history = VirtualListbox(history_listbox, scrollbar, Transaction.to_string)
+        self.history.set_rows(transactions)
+    
+    def show_summary(self, text):
+        self.summary_label.config(text=text)
+    
+    def transaction_added(self, index):
+        self.history.row_inserted(index)
+        self.history.scroll_to(index)
+    
+    def transaction_removed(self, index):
+        self.history.row_deleted(index)
+    
+    def selected_index(self):
+        return self.history.selected_index()
+    
+    def reload(self, transactions):
+        self.history.set_rows(transactions)
+
 class FinanceTracker:
     """Main application class for tracking finances against a monthly salary."""
-    def __init__(self, parent):
+    def __init__(self, parent, event_bus=None):
         self.parent = parent
-        self.salary = 0.0
+        self.event_bus = event_bus
         self.transactions = []
-        self.movie_keywords = ['movie', 'cinema', 'film', 'ticket', 'theater']
-        self.shopping_keywords = ['shop', 'buy', 'purchase', 'store', 'mall']
-        self.grocery_keywords = ['grocery', 'food', 'vegetable', 'fruit', 'market']
-        self.setup_salary_screen()
+        # The same transactions grouped by YYYY-MM, in insertion order, so a month's list is one lookup
+        self.month_rows = {}
+        # Salary and every total are integer paise, kept current by the ledger
+        self.ledger = Ledger()
+        self.next_id = 1
+        self.selected_month = current_month()
+        self.charts = ChartCache()
+        self.rates = get_rate_table()
+        self.journal = get_finance_journal()
+        self.storage = get_storage()
+        self.categorizer = Categorizer.from_setting(self.storage.get_setting("finance", "category_rules"))
+        self.load_data()
+        self.plan = BudgetPlan.from_setting(self.storage.get_setting("finance", "budget"))
+        if not self.plan.incomes and self.ledger.salary:
+            # Salary set before budgets existed; it applies from the first month with finances
+            self.plan.set_income(min(self.ledger.months() or [current_month()]), self.ledger.salary)
+        self.classifier = get_category_classifier()
+        self.train_classifier()
+        if self.ledger.salary > 0:
+            self.setup_main_ui()
+        else:
+            self.setup_salary_screen()
     
     def setup_salary_screen(self):
         """Set up the screen to input monthly salary."""
@@ -56,7 +171,8 @@ class FinanceTracker:
         self.salary_frame.pack(fill="both", expand=True, padx=20, pady=20)
         
         tk.Label(self.salary_frame, text="Finance Tracker", font=("Helvetica", 20, "bold"), bg="#f0f0f0").pack(pady=20)
-        tk.Label(self.salary_frame, text="Enter your monthly salary (₹):", font=("Helvetica", 14), bg="#f0f0f0").pack()
+        tk.Label(self.salary_frame, text=f"Enter your monthly salary (₹) from {month_label(self.salary_month())}:", 
+                 font=("Helvetica", 14), bg="#f0f0f0").pack()
         self.salary_entry = tk.Entry(self.salary_frame, font=("Helvetica", 12), width=20, bd=2, relief="groove")
         self.salary_entry.pack(pady=10, ipady=5)
         self.salary_entry.bind("<Return>", lambda event: self.set_salary())
@@ -66,13 +182,11 @@ class FinanceTracker:
                  bg="#4CAF50", fg="white", width=15, height=2, 
                  bd=0, relief="flat", activebackground="#45a049",
                  command=self.set_salary).pack(pady=15)
-        
-        self.load_data()  # Initialize with empty data
     
     def set_salary(self):
         """Validate and set the monthly salary, then load main UI."""
         try:
-            salary = float(self.salary_entry.get().strip())
+            salary = to_paise(self.salary_entry.get())
             if salary <= 0:
                 messagebox.showwarning("Input Error", "Salary must be a positive number!")
                 return
@@ -80,27 +194,119 @@ class FinanceTracker:
             messagebox.showwarning("Input Error", "Please enter a valid salary amount!")
             return
         
-        self.salary = salary
+        self.ledger.salary = salary
+        self.journal.set_salary(salary)
+        # Earlier months keep the salary they had
+        self.plan.set_income(self.salary_month(), salary)
+        self.save_plan()
         self.salary_frame.destroy()
         self.setup_main_ui()
     
+    def salary_month(self):
+        return self.selected_month or current_month()
+    
+    def save_plan(self):
+        self.storage.set_setting("finance", "budget", self.plan.to_setting())
+    
     def validate_input(self, text):
         """Ensure input doesn't contain invalid characters for CSV/JSON."""
         return all(c not in ",;\n" for c in text)
     
     def categorize_finance(self, desc):
-        """Determine finance category based on description keywords."""
-        desc_lower = desc.lower()
-        for keyword in self.movie_keywords:
-            if keyword in desc_lower:
-                return "Movies"
-        for keyword in self.shopping_keywords:
-            if keyword in desc_lower:
-                return "Shopping"
-        for keyword in self.grocery_keywords:
-            if keyword in desc_lower:
-                return "Groceries"
-        return "Uncategorized"
+        """Category from the rules, or the model learned from past finances when no rule matches."""
+        category = self.categorizer.categorize(desc)
+        if category == self.categorizer.default:
+            category = self.classifier.suggest(desc) or category
+        return category
+    
+    def categorize_many(self, descs):
+        """categorize_finance() for a batch, with the model consulted once for every unmatched row."""
+        categories = self.categorizer.categorize_many(descs)
+        unmatched = [i for i, category in enumerate(categories) if category == self.categorizer.default]
+        if unmatched:
+            for i, suggestion in zip(unmatched, self.classifier.suggest_many([descs[i] for i in unmatched])):
+                if suggestion:
+                    categories[i] = suggestion
+        return categories
+    
+    def show_suggestion(self):
+        """Show the category a description would get while it is being typed."""
+        desc = self.desc_entry.get().strip()
+        self.suggestion_label.config(text=f"Suggested: {self.categorize_finance(desc)}" if desc else "")
+    
+    def history_fingerprint(self):
+        return (self.next_id, len(self.transactions))
+    
+    def train_classifier(self):
+        """Retrain the category model from the stored finances if it does not match them."""
+        if self.classifier.fingerprint != self.history_fingerprint():
+            self.classifier.retrain_in_background([t.desc for t in self.transactions], 
+                                                  [t.category for t in self.transactions], 
+                                                  self.history_fingerprint())
+    
+    def manage_categories(self):
+        """List the category rules and let the user add or remove them."""
+        window = tk.Toplevel(self.frame)
+        window.title("Category Rules")
+        window.geometry("520x420")
+        window.configure(bg="#f0f0f0")
+        
+        tk.Label(window, text="Highest priority wins; ties go to the rule listed first.", 
+                 font=("Helvetica", 10), bg="#f0f0f0").pack(pady=5)
+        rules_listbox = tk.Listbox(window, height=10, font=("Helvetica", 11), bd=2, relief="groove")
+        rules_listbox.pack(fill="both", expand=True, padx=10, pady=5)
+        
+        def show_rules():
+            rules_listbox.delete(0, tk.END)
+            for rule in self.categorizer.rules:
+                rules_listbox.insert(tk.END, f"{rule.category}  ←  {rule.kind}: {rule.pattern}  (priority {rule.priority})")
+        
+        form = tk.Frame(window, bg="#f0f0f0")
+        form.pack(fill="x", padx=10, pady=5)
+        tk.Label(form, text="Category:", font=("Helvetica", 11), bg="#f0f0f0").grid(row=0, column=0, sticky="w")
+        category_entry = tk.Entry(form, font=("Helvetica", 11), width=14, bd=2, relief="groove")
+        category_entry.grid(row=0, column=1, padx=5, pady=3)
+        kind_var = tk.StringVar(value=RULE_KINDS[0])
+        ttk.Combobox(form, textvariable=kind_var, values=RULE_KINDS, width=8, state="readonly").grid(row=0, column=2, padx=5)
+        tk.Label(form, text="Priority:", font=("Helvetica", 11), bg="#f0f0f0").grid(row=0, column=3, sticky="w")
+        priority_entry = tk.Entry(form, font=("Helvetica", 11), width=4, bd=2, relief="groove")
+        priority_entry.insert(0, USER_PRIORITY)
+        priority_entry.grid(row=0, column=4, padx=5)
+        tk.Label(form, text="Keyword / pattern:", font=("Helvetica", 11), bg="#f0f0f0").grid(row=1, column=0, sticky="w")
+        pattern_entry = tk.Entry(form, font=("Helvetica", 11), bd=2, relief="groove")
+        pattern_entry.grid(row=1, column=1, columnspan=4, sticky="ew", padx=5, pady=3)
+        
+        def add_rule():
+            try:
+                rule = CategoryRule(category_entry.get(), pattern_entry.get(), kind_var.get(), priority_entry.get())
+            except ValueError as e:
+                messagebox.showwarning("Input Error", str(e), parent=window)
+                return
+            self.categorizer.add_rule(rule)
+            self.save_category_rules()
+            pattern_entry.delete(0, tk.END)
+            show_rules()
+        
+        def delete_rule():
+            selection = rules_listbox.curselection()
+            if not selection:
+                messagebox.showwarning("Selection Error", "Please select a rule to delete!", parent=window)
+                return
+            self.categorizer.remove_rule(selection[0])
+            self.save_category_rules()
+            show_rules()
+        
+        btn_frame = tk.Frame(window, bg="#f0f0f0")
+        btn_frame.pack(pady=5)
+        tk.Button(btn_frame, text="Add Rule", font=("Helvetica", 11, "bold"), bg="#2196F3", fg="white", 
+                 bd=0, relief="flat", width=12, activebackground="#1e88e5", command=add_rule).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Delete Rule", font=("Helvetica", 11, "bold"), bg="#f44336", fg="white", 
+                 bd=0, relief="flat", width=12, activebackground="#e53935", command=delete_rule).pack(side="left", padx=5)
+        show_rules()
+    
+    def save_category_rules(self):
+        self.storage.set_setting("finance", "category_rules", self.categorizer.to_setting())
+        self.category_menu.config(values=self.categorizer.categories())
     
     def setup_main_ui(self):
         """Initialize the main user interface."""
@@ -108,11 +314,24 @@ class FinanceTracker:
         self.frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Financial Summary
-        total_spent = sum(t.amount for t in self.transactions)
-        remaining = self.salary - total_spent
         tk.Label(self.frame, text="Finance Tracker", font=("Helvetica", 18, "bold"), bg="#f0f0f0").pack(pady=10)
-        tk.Label(self.frame, text=f"Salary:{self.salary:.2f} | Spent:{total_spent:.2f} | Remaining:{remaining:.2f}", 
-                 font=("Helvetica", 12), bg="#f0f0f0").pack(pady=5)
+        
+        # Month picker: the summary and list show one month (or all of them)
+        month_frame = tk.Frame(self.frame, bg="#f0f0f0")
+        month_frame.pack()
+        tk.Button(month_frame, text="◀", font=("Helvetica", 11, "bold"), bd=0, relief="flat", 
+                 command=lambda: self.step_month(-1)).pack(side="left", padx=5)
+        self.month_var = tk.StringVar()
+        self.month_menu = ttk.Combobox(month_frame, textvariable=self.month_var, font=("Helvetica", 12), 
+                                       width=12, state="readonly")
+        self.month_menu.pack(side="left")
+        self.month_menu.bind("<<ComboboxSelected>>", lambda event: self.show_month(self.month_choices[self.month_menu.current()]))
+        tk.Button(month_frame, text="▶", font=("Helvetica", 11, "bold"), bd=0, relief="flat", 
+                 command=lambda: self.step_month(1)).pack(side="left", padx=5)
+        
+        summary_label = tk.Label(self.frame, text=self.summary_text(), 
+                                 font=("Helvetica", 12), bg="#f0f0f0")
+        summary_label.pack(pady=5)
         
         # Entry Frame
         entry_frame = tk.Frame(self.frame, bg="#f0f0f0")
@@ -123,19 +342,29 @@ class FinanceTracker:
         self.desc_entry = tk.Entry(entry_frame, font=("Helvetica", 12), bd=2, relief="groove")
         self.desc_entry.grid(row=0, column=1, sticky="ew", padx=5, pady=5, ipady=5)
         self.desc_entry.bind("<Return>", lambda event: self.add_transaction())
+        self.desc_entry.bind("<KeyRelease>", lambda event: self.show_suggestion())
         
         tk.Label(entry_frame, text="Amount:", font=("Helvetica", 12), bg="#f0f0f0").grid(row=0, column=2, sticky="w")
-        self.amount_entry = tk.Entry(entry_frame, font=("Helvetica", 12), width=12, bd=2, relief="groove")
-        self.amount_entry.grid(row=0, column=3, padx=5, pady=5, ipady=5)
+        amount_frame = tk.Frame(entry_frame, bg="#f0f0f0")
+        amount_frame.grid(row=0, column=3, padx=5, pady=5)
+        self.amount_entry = tk.Entry(amount_frame, font=("Helvetica", 12), width=12, bd=2, relief="groove")
+        self.amount_entry.pack(side="left", ipady=5)
         self.amount_entry.bind("<Return>", lambda event: self.add_transaction())
+        self.currency_var = tk.StringVar(value=BASE_CURRENCY)
+        self.currency_menu = ttk.Combobox(amount_frame, textvariable=self.currency_var, values=self.rates.currencies(), 
+                                          font=("Helvetica", 12), width=5, state="readonly")
+        self.currency_menu.pack(side="left", padx=5)
+        tk.Button(amount_frame, text="Rates...", font=("Helvetica", 10), bd=0, relief="flat", 
+                 command=self.load_rates).pack(side="left")
         
         tk.Label(entry_frame, text="Category:", font=("Helvetica", 12), bg="#f0f0f0").grid(row=1, column=0, sticky="w")
         self.category_var = tk.StringVar()
-        categories = ["Movies", "Shopping", "Groceries", "Uncategorized"]
-        self.category_menu = ttk.Combobox(entry_frame, textvariable=self.category_var, values=categories, 
+        self.category_menu = ttk.Combobox(entry_frame, textvariable=self.category_var, values=self.categorizer.categories(), 
                                         font=("Helvetica", 12), width=15, state="readonly")
         self.category_menu.grid(row=1, column=1, padx=5, pady=5, ipady=2)
         self.category_menu.set("Uncategorized")
+        self.suggestion_label = tk.Label(entry_frame, text="", font=("Helvetica", 11, "italic"), fg="#555555", bg="#f0f0f0")
+        self.suggestion_label.grid(row=1, column=2, columnspan=3, sticky="w", padx=5)
         
         # Enhanced buttons
         tk.Button(entry_frame, text="Add Finance", font=("Helvetica", 12, "bold"), 
@@ -155,9 +384,10 @@ class FinanceTracker:
         self.trans_listbox.pack(side="left", fill="both", expand=True)
         self.trans_listbox.bind("<Delete>", lambda event: self.delete_transaction())
         
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.trans_listbox.yview)
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical")
         scrollbar.pack(side="right", fill="y")
-        self.trans_listbox.config(yscrollcommand=scrollbar.set)
+        self.view = FinanceView(summary_label, self.trans_listbox, scrollbar, self.visible_rows())
+        self.update_month_menu()
         
         # Buttons Frame
         btn_frame = tk.Frame(self.frame, bg="#f0f0f0")
@@ -172,6 +402,18 @@ class FinanceTracker:
                  bg="#2196F3", fg="white", width=15, height=2, 
                  bd=0, relief="flat", activebackground="#1e88e5",
                  command=self.view_summary).pack(side="left", padx=5, pady=5)
+        tk.Button(btn_frame, text="Budgets", font=("Helvetica", 12, "bold"), 
+                 bg="#009688", fg="white", width=15, height=2, 
+                 bd=0, relief="flat", activebackground="#00897B",
+                 command=self.manage_budgets).pack(side="left", padx=5, pady=5)
+        tk.Button(btn_frame, text="Import Statement", font=("Helvetica", 12, "bold"), 
+                 bg="#607D8B", fg="white", width=15, height=2, 
+                 bd=0, relief="flat", activebackground="#546E7A",
+                 command=self.import_statement).pack(side="left", padx=5, pady=5)
+        tk.Button(btn_frame, text="Categories", font=("Helvetica", 12, "bold"), 
+                 bg="#9C27B0", fg="white", width=15, height=2, 
+                 bd=0, relief="flat", activebackground="#8E24AA",
+                 command=self.manage_categories).pack(side="left", padx=5, pady=5)
         tk.Button(btn_frame, text="Export to PDF", font=("Helvetica", 12, "bold"), 
                  bg="#4CAF50", fg="white", width=15, height=2, 
                  bd=0, relief="flat", activebackground="#45a049",
@@ -180,20 +422,19 @@ class FinanceTracker:
                  bg="#FFC107", fg="black", width=15, height=2, 
                  bd=0, relief="flat", activebackground="#FFB300",
                  command=self.reset_salary).pack(side="left", padx=5, pady=5)
-        
-        self.update_transaction_list()
     
     def clear_form(self):
         """Clear all input fields."""
         self.desc_entry.delete(0, tk.END)
         self.amount_entry.delete(0, tk.END)
         self.category_var.set("Uncategorized")
+        self.suggestion_label.config(text="")
     
     def add_transaction(self):
         """Add a new finance to the list."""
         desc = self.desc_entry.get().strip()
         try:
-            amount = float(self.amount_entry.get().strip())
+            amount = to_paise(self.amount_entry.get())
             if not desc or amount <= 0:
                 messagebox.showwarning("Input Error", "Please enter a valid description and positive amount!")
                 return
@@ -204,9 +445,13 @@ class FinanceTracker:
             messagebox.showwarning("Input Error", "Please enter a valid amount!")
             return
         
-        total_spent = sum(t.amount for t in self.transactions)
-        if amount > (self.salary - total_spent):
-            messagebox.showwarning("Insufficient Funds", f"Finance (₹{amount:.2f}) exceeds remaining salary (₹{self.salary - total_spent:.2f})!")
+        date = datetime.now().strftime("%Y-%m-%d")
+        month = month_of(date)
+        currency = self.currency_var.get()
+        base_paise = self.rates.convert(amount, currency, date)
+        remaining = self.plan.remaining(self.ledger, month)
+        if base_paise > remaining:
+            messagebox.showwarning("Insufficient Funds", f"Finance ({format_money(amount, currency)}) exceeds remaining salary (₹{format_paise(remaining)}) for {month_label(month)}!")
             return
         
         # Determine category
@@ -215,158 +460,506 @@ class FinanceTracker:
             category = self.category_var.get()  # Override with user-selected category if specified
         
         # Create and store transaction
-        date = datetime.now().strftime("%Y-%m-%d")
-        transaction = Transaction(desc, amount, category, date)
+        transaction = Transaction.from_paise(self.next_id, desc, amount, category, date, currency, base_paise)
+        self.next_id += 1
         self.transactions.append(transaction)
-        self.trans_listbox.insert(tk.END, transaction.to_string())
+        # A month's first finance makes its bucket; a view of that month still shows the empty stand-in
+        new_month = month not in self.month_rows
+        self.month_rows.setdefault(month, []).append(transaction)
+        self.ledger.add(transaction)
+        self.classifier.learn(desc, category)
+        self.classifier.fingerprint = self.history_fingerprint()
+        self.journal.add(*transaction.to_row())
+        self.compact_if_needed()
+        if self.selected_month is None or (self.selected_month == month and not new_month):
+            self.view.transaction_added(len(self.visible_rows()) - 1)
+        else:
+            self.show_month(month)
+        if self.event_bus:
+            self.event_bus.publish(EXPENSE_ADDED, {"transaction": transaction})
         
         # Clear entries
         self.clear_form()
         
         # Update UI and check salary
-        self.check_salary()
+        self.check_salary(month)
         self.update_ui()
-        messagebox.showinfo("Success", f"Finance of ₹{amount:.2f} for {desc} ({category}) added!")
+        messagebox.showinfo("Success", f"Finance of {format_money(amount, currency)} for {desc} ({category}) added!")
     
     def delete_transaction(self):
         """Delete the selected transaction."""
-        try:
-            selected_idx = self.trans_listbox.curselection()[0]
-            self.trans_listbox.delete(selected_idx)
-            self.transactions.pop(selected_idx)
-            self.update_ui()
-            messagebox.showinfo("Success", "Finance deleted successfully!")
-        except IndexError:
+        selected_idx = self.view.selected_index()
+        if selected_idx is None:
             messagebox.showwarning("Selection Error", "Please select a finance to delete!")
+            return
+        rows = self.visible_rows()
+        transaction = rows.pop(selected_idx)
+        self.view.transaction_removed(selected_idx)
+        # Drop it from the other list too; both are in id order, so it is found by bisection, not a scan
+        month = month_of(transaction.date)
+        bucket = self.month_rows[month]
+        other = bucket if rows is self.transactions else self.transactions
+        del other[position_of(other, transaction.id)]
+        if not bucket:
+            # Months without finances keep no bucket, so they leave the menu and the per-month totals
+            del self.month_rows[month]
+            self.update_month_menu()
+        self.ledger.remove(transaction)
+        self.classifier.unlearn(transaction.desc, transaction.category)
+        self.classifier.fingerprint = self.history_fingerprint()
+        self.journal.delete(transaction.id)
+        self.compact_if_needed()
+        if self.event_bus:
+            self.event_bus.publish(EXPENSE_DELETED, {"transaction": transaction})
+        self.update_ui()
+        messagebox.showinfo("Success", "Finance deleted successfully!")
+    
+    def import_statement(self):
+        """Pick a bank statement and import its expenses; CSV files first get a column profile."""
+        path = filedialog.askopenfilename(title="Import Statement", filetypes=statement_formats())
+        if not path:
+            return
+        if is_ofx(path):
+            self.run_import(path, None)
+            return
+        try:
+            header = read_header(path)
+        except (OSError, UnicodeDecodeError) as e:
+            messagebox.showerror("Error", f"Failed to read {path}: {e}")
+            return
+        profile = StatementProfile.from_setting(self.storage.get_setting("finance", "statement_profile"))
+        try:
+            profile.validate(header)
+        except (AttributeError, ValueError):
+            # No saved profile, or one for another bank's layout
+            profile = StatementProfile.guess(header)
+        self.edit_statement_profile(path, header, profile)
+    
+    def edit_statement_profile(self, path, header, profile):
+        """Let the user confirm which columns hold the date, description and amount."""
+        window = tk.Toplevel(self.frame)
+        window.title("Statement Columns")
+        window.geometry("420x330")
+        window.configure(bg="#f0f0f0")
+        
+        choices = [""] + header
+        fields = {}
+        for row, (label, name) in enumerate((("Date:", "date"), ("Description:", "description"), 
+                                             ("Amount (signed):", "amount"), ("Or debit column:", "debit"))):
+            tk.Label(window, text=label, font=("Helvetica", 12), bg="#f0f0f0").grid(row=row, column=0, sticky="w", padx=10, pady=5)
+            var = tk.StringVar(value=getattr(profile, name))
+            ttk.Combobox(window, textvariable=var, values=choices, state="readonly", width=22).grid(row=row, column=1, padx=10, pady=5)
+            fields[name] = var
+        tk.Label(window, text="Date format (optional):", font=("Helvetica", 12), bg="#f0f0f0").grid(row=4, column=0, sticky="w", padx=10, pady=5)
+        date_format_entry = tk.Entry(window, font=("Helvetica", 12), width=12, bd=2, relief="groove")
+        date_format_entry.insert(0, profile.date_format)
+        date_format_entry.grid(row=4, column=1, sticky="w", padx=10, pady=5)
+        negative_var = tk.BooleanVar(value=profile.expenses_negative)
+        tk.Checkbutton(window, text="Spending is negative in the amount column", variable=negative_var, 
+                       font=("Helvetica", 11), bg="#f0f0f0").grid(row=5, column=0, columnspan=2, sticky="w", padx=10, pady=5)
+        
+        def start():
+            chosen = StatementProfile(date_format=date_format_entry.get().strip(), 
+                                      expenses_negative=negative_var.get(), 
+                                      **{name: var.get() for name, var in fields.items()})
+            try:
+                chosen.validate(header)
+            except ValueError as e:
+                messagebox.showwarning("Input Error", str(e), parent=window)
+                return
+            self.storage.set_setting("finance", "statement_profile", chosen.to_setting())
+            window.destroy()
+            self.run_import(path, chosen)
+        
+        tk.Button(window, text="Import", font=("Helvetica", 12, "bold"), bg="#2196F3", fg="white", 
+                 bd=0, relief="flat", width=15, height=2, activebackground="#1e88e5", 
+                 command=start).grid(row=6, column=0, columnspan=2, pady=15)
+    
+    def run_import(self, path, profile):
+        """Import on a worker thread behind a progress window; the result is committed in one batch."""
+        window, progress_bar, status, cancel = self.progress_window("Importing Statement")
+        # Keep the finance list unchanged underneath until the import is committed
+        window.grab_set()
+        existing = list(self.transactions)
+        
+        def show_progress(rows, skipped, fraction):
+            if window.winfo_exists():
+                progress_bar["value"] = fraction * 100
+                status.config(text=f"{rows} new finances, {skipped} skipped ({fraction * 100:.0f}%)")
+        
+        def work():
+            try:
+                # Statements are in the base currency, so only base currency finances can be duplicates
+                result = import_statement(path, profile, 
+                                          ((t.desc, t.paise, t.date) for t in existing if t.currency == BASE_CURRENCY), 
+                                          self.categorize_many, 
+                                          lambda *args: self.after_worker(show_progress, *args), cancel.is_set)
+            except (OSError, ValueError, UnicodeDecodeError, csv.Error) as e:
+                self.after_worker(self.finish_import, window, None, f"Import failed: {e}")
+                return
+            self.after_worker(self.finish_import, window, result, result.summary())
+        
+        threading.Thread(target=work, name="FinanceImport", daemon=True).start()
+    
+    def progress_window(self, title):
+        """(window, progress bar, status label, cancel event) for a job running on a worker thread."""
+        window = tk.Toplevel(self.frame)
+        window.title(title)
+        window.geometry("380x150")
+        window.configure(bg="#f0f0f0")
+        progress_bar = ttk.Progressbar(window, length=320, mode="determinate", maximum=100)
+        progress_bar.pack(pady=15)
+        status = tk.Label(window, text="Starting...", font=("Helvetica", 11), bg="#f0f0f0")
+        status.pack()
+        cancel = threading.Event()
+        tk.Button(window, text="Cancel", font=("Helvetica", 11, "bold"), bg="#f44336", fg="white", 
+                 bd=0, relief="flat", width=12, activebackground="#e53935", command=cancel.set).pack(pady=10)
+        window.protocol("WM_DELETE_WINDOW", cancel.set)
+        return window, progress_bar, status, cancel
+    
+    def after_worker(self, callback, *args):
+        try:
+            self.parent.after(0, callback, *args)
+        except (tk.TclError, RuntimeError):
+            # The window was closed while the job ran
+            pass
+    
+    def finish_import(self, window, result, message):
+        window.destroy()
+        if result is None:
+            messagebox.showerror("Error", message)
+            return
+        if result.rows:
+            self.add_imported(result.rows)
+        messagebox.showinfo("Cancelled" if result.cancelled else "Import Complete", message)
+        if result.rows:
+            self.check_salary(self.salary_month())
+    
+    def add_imported(self, rows):
+        """Store imported (desc, paise, category, date) rows: one journal batch, one ledger pass, one redraw."""
+        first_id = self.next_id
+        self.next_id += len(rows)
+        transactions = [Transaction.from_paise(first_id + i, *row) for i, row in enumerate(rows)]
+        self.transactions.extend(transactions)
+        for transaction in transactions:
+            self.month_rows.setdefault(month_of(transaction.date), []).append(transaction)
+            self.ledger.add(transaction)
+        self.journal.add_many([t.to_row() for t in transactions])
+        self.classifier.learn_many([t.desc for t in transactions], [t.category for t in transactions])
+        self.classifier.fingerprint = self.history_fingerprint()
+        self.compact_if_needed()
+        if self.event_bus:
+            self.event_bus.publish(EXPENSES_IMPORTED, {"transactions": transactions})
+        self.update_month_menu()
+        self.update_transaction_list()
+        self.update_ui()
     
     def view_summary(self):
-        """Display finances grouped by category and financial summary."""
-        total_spent = sum(t.amount for t in self.transactions)
-        remaining = self.salary - total_spent
-        
-        # Group finances by category
-        cat_dict = {"Movies": [], "Shopping": [], "Groceries": [], "Uncategorized": []}
-        for t in self.transactions:
-            cat_dict[t.category].append((t.amount, t.desc, t.date))
-        
-        summary = "Finances by Category:\n"
-        for category in cat_dict:
-            items = cat_dict[category]
-            if items:
-                summary += f"\n{category}:\n"
-                for i, (amount, desc, date) in enumerate(items, 1):
-                    summary += f"  {i}. ₹{amount:.2f} - {desc} on {date}\n"
-        
-        summary += f"\nTotal Spent: ₹{total_spent:.2f}\nRemaining: ₹{remaining:.2f}"
-        messagebox.showinfo("Summary", summary or "No finances yet.")
-    
-    def check_salary(self):
-        """Warn if total finances exceed salary."""
-        total_spent = sum(t.amount for t in self.transactions)
-        if total_spent > self.salary:
-            messagebox.showwarning("Salary Alert", f"Finances (₹{total_spent:.2f}) have exceeded your salary (₹{self.salary:.2f})!")
+        """Dashboard for the selected (or current) month: category totals and charts, all from ledger buckets."""
+        month = self.salary_month()
+        window = tk.Toplevel(self.frame)
+        window.title(f"Dashboard - {month_label(month)}")
+        window.geometry("1340x520")
+        window.configure(bg="#f0f0f0")
+        income = self.plan.income(month)
+        spent = self.ledger.month_total(month)
+        tk.Label(window, text=f"{month_label(month)} | Salary: ₹{format_paise(income)} | Spent: ₹{format_paise(spent)} | "
+                              f"Remaining: ₹{format_paise(income - spent)}", 
+                 font=("Helvetica", 14, "bold"), bg="#f0f0f0").pack(pady=10)
+        
+        chart_frame = tk.Frame(window, bg="#f0f0f0")
+        chart_frame.pack()
+        labels = {}
+        for kind in CHART_KINDS:
+            labels[kind] = tk.Label(chart_frame, text="Drawing chart...", font=("Helvetica", 11), bg="white", 
+                                    width=60, height=22, wraplength=380)
+            labels[kind].pack(side="left", padx=5)
+        
+        # Categories come from this month's buckets, so any category name shows up
+        totals = sorted(self.ledger.month_categories(month).items(), key=lambda item: -item[1])
+        breakdown = "   ".join(f"{category}: ₹{format_paise(paise)}" for category, paise in totals)
+        tk.Label(window, text=breakdown or "No finances this month.", font=("Helvetica", 11), bg="#f0f0f0", 
+                 wraplength=1300).pack(pady=10)
+        self.show_charts(month, labels)
+    
+    def show_charts(self, month, labels):
+        """Show cached charts at once; draw the rest with matplotlib on a worker thread."""
+        income = self.plan.income(month)
+        version = self.ledger.month_version(month)
+        titles = {PIE: "Spending by Category", DAILY: "Daily Spending", BURNDOWN: "Salary Burn-down"}
+        pending = []
+        for kind, label in labels.items():
+            # Only the burn-down depends on the salary; charts by day of the current month grow each day
+            key = (kind, month, version, income if kind == BURNDOWN else None, None if kind == PIE else last_day(month))
+            png = self.charts.get(key)
+            if png is not None:
+                self.show_chart(label, png)
+            else:
+                # Read the buckets here; the worker only draws
+                pending.append((key, label, chart_data(kind, self.ledger, month, income)))
+        if not pending:
+            return
+        
+        def work():
+            for key, label, data in pending:
+                try:
+                    png = render_chart(key[0], data, titles[key[0]])
+                except ImportError:
+                    self.after_worker(self.chart_failed, labels, "Please install matplotlib to see charts (pip install matplotlib).")
+                    return
+                except Exception as e:
+                    self.after_worker(self.chart_failed, {key[0]: label}, f"Failed to draw chart: {e}")
+                    continue
+                self.after_worker(self.chart_rendered, key, label, png)
+        
+        threading.Thread(target=work, name="FinanceCharts", daemon=True).start()
+    
+    def chart_rendered(self, key, label, png):
+        self.charts.put(key, png)
+        if label.winfo_exists():
+            self.show_chart(label, png)
+    
+    def show_chart(self, label, png):
+        image = tk.PhotoImage(data=base64.b64encode(png).decode("ascii"))
+        label.config(image=image, text="", width=image.width(), height=image.height())
+        # Tk does not hold a reference to the image
+        label.image = image
+    
+    def chart_failed(self, labels, message):
+        for label in labels.values():
+            if label.winfo_exists():
+                label.config(text=message)
+    
+    def check_salary(self, month):
+        """Warn if a month's finances exceed that month's salary."""
+        spent = self.ledger.month_total(month)
+        income = self.plan.income(month)
+        if spent > income:
+            messagebox.showwarning("Salary Alert", f"Finances (₹{format_paise(spent)}) have exceeded your salary (₹{format_paise(income)}) for {month_label(month)}!")
     
     def reset_salary(self):
-        """Return to salary input screen to set a new salary."""
+        """Return to salary input screen to set a new salary from the selected month on."""
         self.frame.destroy()
         self.setup_salary_screen()
     
+    def visible_rows(self):
+        """The list the history shows: one month's transactions, or all of them.
+
+        Reading never creates a month's bucket; a month without finances shows an empty tuple.
+        """
+        if self.selected_month is None:
+            return self.transactions
+        return self.month_rows.get(self.selected_month, ())
+    
+    def update_month_menu(self):
+        """Offer every month with finances, plus the current and selected ones, newest first."""
+        months = set(self.month_rows) | {current_month()}
+        if self.selected_month:
+            months.add(self.selected_month)
+        self.month_choices = [None] + sorted(months, reverse=True)
+        self.month_menu.config(values=[ALL_MONTHS] + [month_label(month) for month in self.month_choices[1:]])
+        self.month_var.set(month_label(self.selected_month) if self.selected_month else ALL_MONTHS)
+    
+    def show_month(self, month):
+        """Switch the summary and history to month (None for all months); both come from prebuilt lists and buckets."""
+        self.selected_month = month
+        self.update_month_menu()
+        self.update_transaction_list()
+        self.update_ui()
+    
+    def step_month(self, months):
+        self.show_month(shift_month(self.selected_month or current_month(), months))
+    
     def update_transaction_list(self):
-        """Update the transaction listbox."""
-        self.trans_listbox.delete(0, tk.END)
-        for t in self.transactions:
-            self.trans_listbox.insert(tk.END, t.to_string())
+        """Redraw the transaction listbox after the whole list was replaced."""
+        self.view.reload(self.visible_rows())
     
     def update_ui(self):
         """Update financial summary display."""
-        total_spent = sum(t.amount for t in self.transactions)
-        remaining = self.salary - total_spent
-        for widget in self.frame.winfo_children():
-            if isinstance(widget, tk.Label) and "Salary" in widget.cget("text"):
-                widget.config(text=f"Salary: ₹{self.salary:.2f} | Spent: ₹{total_spent:.2f} | Remaining: ₹{remaining:.2f}")
-        self.update_transaction_list()
+        self.view.show_summary(self.summary_text())
+    
+    def summary_text(self):
+        """Salary, spent and remaining for the selected month, from the ledger's running totals."""
+        ledger = self.ledger
+        month = self.selected_month
+        if month is None:
+            return f"All months | Spent: ₹{format_paise(ledger.total)} over {len(ledger.by_month)} months"
+        return (f"Salary: ₹{format_paise(self.plan.income(month))} | Spent: ₹{format_paise(ledger.month_total(month))} | "
+                f"Remaining: ₹{format_paise(self.plan.remaining(ledger, month))} | Year to date: ₹{format_paise(ledger.year_to_date(month))}")
+    
+    def manage_budgets(self):
+        """Per-category budgets for the selected month, compared with the month before."""
+        month = self.salary_month()
+        previous = shift_month(month, -1)
+        window = tk.Toplevel(self.frame)
+        window.title(f"Budgets - {month_label(month)}")
+        window.geometry("720x440")
+        window.configure(bg="#f0f0f0")
+        
+        columns = ("category", "budget", "available", "spent", "left", "last", "change")
+        headings = ("Category", "Budget", "Available", "Spent", "Left", month_label(previous), "Change")
+        table = ttk.Treeview(window, columns=columns, show="headings", height=10)
+        for column, heading in zip(columns, headings):
+            table.heading(column, text=heading)
+            table.column(column, width=140 if column == "category" else 85, anchor="w" if column == "category" else "e")
+        table.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        def show_budgets():
+            table.delete(*table.get_children())
+            spent = self.ledger.month_categories(month)
+            last = self.ledger.month_categories(previous)
+            # Only categories with a budget or spending in either month: O(buckets), not O(finances)
+            for category in dict.fromkeys(self.plan.categories() + list(spent) + list(last)):
+                budget = self.plan.budget(category, month)
+                available = self.plan.available(self.ledger, category, month)
+                now, before = spent.get(category, 0), last.get(category, 0)
+                rollover = " ↻" if category in self.plan.rollover else ""
+                table.insert("", "end", values=(category + rollover, format_paise(budget), format_paise(available), 
+                                                format_paise(now), format_paise(available - now), 
+                                                format_paise(before), format_paise(now - before)))
+        
+        form = tk.Frame(window, bg="#f0f0f0")
+        form.pack(fill="x", padx=10, pady=5)
+        tk.Label(form, text="Category:", font=("Helvetica", 11), bg="#f0f0f0").pack(side="left")
+        category_var = tk.StringVar()
+        ttk.Combobox(form, textvariable=category_var, width=15, 
+                     values=list(dict.fromkeys(self.categorizer.categories() + self.plan.categories()))).pack(side="left", padx=5)
+        tk.Label(form, text="Monthly budget (₹):", font=("Helvetica", 11), bg="#f0f0f0").pack(side="left")
+        amount_entry = tk.Entry(form, font=("Helvetica", 11), width=10, bd=2, relief="groove")
+        amount_entry.pack(side="left", padx=5)
+        rollover_var = tk.BooleanVar()
+        tk.Checkbutton(form, text="Roll over", variable=rollover_var, bg="#f0f0f0").pack(side="left", padx=5)
+        
+        def set_budget():
+            category = category_var.get().strip()
+            try:
+                paise = to_paise(amount_entry.get())
+                if not category or paise < 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showwarning("Input Error", "Choose a category and enter a budget of zero or more!", parent=window)
+                return
+            # Applies from this month until changed; earlier months keep their budgets
+            self.plan.set_budget(category, month, paise)
+            self.plan.set_rollover(category, rollover_var.get())
+            self.save_plan()
+            show_budgets()
+        
+        tk.Button(form, text="Set Budget", font=("Helvetica", 11, "bold"), bg="#009688", fg="white", 
+                 bd=0, relief="flat", width=12, activebackground="#00897B", command=set_budget).pack(side="left", padx=5)
+        show_budgets()
     
     def save_data(self):
-        """Disabled: Do not save data to JSON file."""
-        pass
+        """Write any queued journal records and the category model to disk now."""
+        self.journal.flush()
+        self.classifier.save()
     
     def load_data(self):
-        """Initialize with empty data, do not load from JSON file."""
-        self.salary = 0.0
-        self.transactions = []
+        """Load salary and transactions from the snapshot plus journal."""
+        salary, rows, self.next_id = self.journal.load()
+        # Ids only grow and finances are only appended, so the list and every month bucket stay in id order
+        self.transactions = [Transaction.from_paise(transaction_id, *row) for transaction_id, row in sorted(rows.items())]
+        self.convert_foreign(self.transactions)
+        self.ledger = Ledger(salary)
+        self.month_rows = {}
+        for transaction in self.transactions:
+            self.month_rows.setdefault(month_of(transaction.date), []).append(transaction)
+            self.ledger.add(transaction)
+    
+    def compact_if_needed(self):
+        """Fold the journal into a fresh snapshot once it outgrows the live data."""
+        if self.journal.should_compact(len(self.transactions)):
+            rows = [t.to_row() for t in self.transactions]
+            self.journal.compact(self.ledger.salary, rows, self.next_id)
+            self.classifier.save()
+    
+    def convert_foreign(self, transactions):
+        """Set base_paise of transactions in other currencies from the exchange rates, in one vectorized pass."""
+        known = set(self.rates.currencies())
+        foreign = [t for t in transactions if t.currency != BASE_CURRENCY]
+        missing = sorted({t.currency for t in foreign} - known)
+        if missing:
+            messagebox.showwarning("Exchange Rates", f"No exchange rates for {', '.join(missing)}; those finances are counted at face value.")
+        foreign = [t for t in foreign if t.currency in known]
+        if not foreign:
+            return
+        base = self.rates.convert_many([t.paise for t in foreign], self.rates.currency_ids([t.currency for t in foreign]), 
+                                       day_numbers([t.date for t in foreign]))
+        for transaction, base_paise in zip(foreign, base.tolist()):
+            transaction.base_paise = base_paise
+    
+    def load_rates(self):
+        """Replace the exchange rates with a CSV of date, currency and rate, and re-total every finance at them."""
+        path = filedialog.askopenfilename(title="Load Exchange Rates", filetypes=[("CSV files", "*.csv")])
+        if not path:
+            return
+        try:
+            self.rates = install_rate_file(path)
+        except (OSError, ValueError, UnicodeDecodeError, csv.Error) as e:
+            messagebox.showerror("Error", f"Failed to load exchange rates: {e}")
+            return
+        self.currency_menu.config(values=self.rates.currencies())
+        if self.currency_var.get() not in self.rates.currencies():
+            self.currency_var.set(BASE_CURRENCY)
+        self.convert_foreign(self.transactions)
+        self.ledger.clear()
+        for transaction in self.transactions:
+            self.ledger.add(transaction)
+        self.update_transaction_list()
+        self.update_ui()
+        messagebox.showinfo("Exchange Rates", f"Loaded rates for {len(self.rates.currencies()) - 1} currencies.")
     
-    def generate_pdf(self):
-        """Generate a PDF file with transaction details as a table."""
-        filename = "finance_feedback.pdf"
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=30, bottomMargin=30, leftMargin=30, rightMargin=30)
-        story = []
-        
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = styles['Title']
-        normal_style = ParagraphStyle(
-            name='Normal',
-            fontSize=10,
-            leading=12,
-            spaceAfter=6,
-        )
-        
-        # Title
-        story.append(Paragraph("Finance Tracker Report", title_style))
-        story.append(Spacer(1, 12))
-        
-        # Export Date
-        story.append(Paragraph(f"Exported on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", normal_style))
-        story.append(Spacer(1, 12))
+    def report_lines(self):
+        """Export date and summary printed above the report's table."""
+        ledger = self.ledger
+        month = self.selected_month
+        lines = [f"Exported on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | Amounts in {BASE_CURRENCY}"]
+        if month is None:
+            lines.append(f"Period: {ALL_MONTHS} | Total Spent: {format_paise(ledger.total)}")
+        else:
+            lines.append(f"Period: {month_label(month)} | Salary: {format_paise(self.plan.income(month))} | "
+                         f"Total Spent: {format_paise(ledger.month_total(month))} | Remaining: {format_paise(self.plan.remaining(ledger, month))}")
+        return lines
+    
+    def generate_pdf(self, path):
+        """Write the shown finances to a PDF at path on a worker thread, behind a progress window."""
+        window, progress_bar, status, cancel = self.progress_window("Exporting PDF")
+        # Transactions are never changed in place, so a copy of the list is a consistent snapshot
+        transactions = list(self.visible_rows())
+        lines = self.report_lines()
+        
+        def show_progress(done, total):
+            if window.winfo_exists():
+                progress_bar["value"] = done * 100 / max(total, 1)
+                status.config(text=f"{done} of {total} finances written")
+        
+        def work():
+            try:
+                pages = write_finance_report(path, "Finance Tracker Report", lines, 
+                                             ((t.desc, t.base_paise, t.category, t.date) for t in transactions), 
+                                             len(transactions), 
+                                             lambda *args: self.after_worker(show_progress, *args), cancel.is_set)
+            except OSError as e:
+                self.after_worker(self.finish_pdf, window, path, None, f"Failed to export transactions to PDF: {e}")
+                return
+            except Exception as e:
+                # Anything else is a bug, but the progress window must still close
+                logging.exception(f"PDF export to {path} failed")
+                self.after_worker(self.finish_pdf, window, path, None, f"Failed to export transactions to PDF: {e}")
+                return
+            self.after_worker(self.finish_pdf, window, path, pages, None)
         
-        # Financial Summary
-        total_spent = sum(t.amount for t in self.transactions)
-        remaining = self.salary - total_spent
-        story.append(Paragraph(f"Salary: {self.salary:.2f} | Total Spent: {total_spent:.2f} | Remaining:{remaining:.2f}", normal_style))
-        story.append(Spacer(1, 12))
-        
-        # Table Header
-        data = [["Description", "Amount", "Category", "Date"]]
-        
-        # Table Data
-        for t in self.transactions:
-            desc = t.desc[:20] + ("..." if len(t.desc) > 20 else "")
-            data.append([desc, f"{t.amount:.2f}", t.category, t.date])
-        
-        # Create Table with border
-        table = Table(data, colWidths=[150, 100, 100, 100])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BOX', (0, 0), (-1, -1), 2, colors.black),  # Added outer border
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-        ]))
-        story.append(table)
-        story.append(Spacer(1, 12))
-        
-        # Footer
-        story.append(Paragraph("Generated by Finance Tracker", normal_style))
-        
-        # Build PDF
-        doc.build(story)
-        pdf_data = buffer.getvalue()
-        buffer.close()
-
-        # Save PDF to a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            temp_file.write(pdf_data)
-            temp_file_path = temp_file.name
-
-        return filename, temp_file_path
+        threading.Thread(target=work, name="FinanceReport", daemon=True).start()
+    
+    def finish_pdf(self, window, path, pages, error):
+        window.destroy()
+        if error:
+            messagebox.showerror("Error", error)
+        elif pages is None:
+            messagebox.showinfo("Cancelled", "PDF export cancelled.")
+        else:
+            self.open_pdf(path)
+            messagebox.showinfo("Success", f"Transactions exported to {path} ({pages} pages) and opened!")
 
     def open_pdf(self, file_path):
         """Open the PDF file using the default system viewer."""
@@ -382,19 +975,17 @@ class FinanceTracker:
                 # Fallback to webbrowser
                 webbrowser.open(f"file://{file_path}")
             except Exception as e2:
-                messagebox.showwarning("Open PDF Error", "Unable to open PDF automatically. Please open it manually from your temporary files.")
+                messagebox.showwarning("Open PDF Error", "Unable to open PDF automatically. Please open it manually from where you saved it.")
 
     def export_to_pdf(self):
-        """Export transactions to a PDF file."""
-        try:
-            if not self.transactions:
-                messagebox.showwarning("No Data", "No transactions to export!")
-                return
-            filename, temp_file_path = self.generate_pdf()
-            self.open_pdf(temp_file_path)
-            messagebox.showinfo("Success", f"Transactions exported to {filename} and opened!")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to export transactions to PDF: {e}")
+        """Export the shown transactions to a PDF file."""
+        if not self.visible_rows():
+            messagebox.showwarning("No Data", "No transactions to export!")
+            return
+        path = filedialog.asksaveasfilename(title="Export to PDF", defaultextension=".pdf", 
+                                            initialfile="finance_feedback.pdf", filetypes=[("PDF files", "*.pdf")])
+        if path:
+            self.generate_pdf(path)
 
 if __name__ == "__main__":
     root = tk.Tk()
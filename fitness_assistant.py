@@ -2,22 +2,34 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 from datetime import datetime
 import matplotlib.pyplot as plt
-import json
 import os
 import pandas as pd
 import platform
+import sqlite3
 import subprocess
+try:
+    from .event_bus import WORKOUT_LOGGED, WORKOUT_DELETED
+    from .persistence import get_write_queue
+    from .storage import get_storage, UPSERT_WORKOUT, DELETE_WORKOUT
+except ImportError:
+    from event_bus import WORKOUT_LOGGED, WORKOUT_DELETED
+    from persistence import get_write_queue
+    from storage import get_storage, UPSERT_WORKOUT, DELETE_WORKOUT
 
 class FitnessAssistant:
-    def __init__(self, parent):
+    def __init__(self, parent, event_bus=None):
         self.parent = parent
+        self.event_bus = event_bus
         self.root = self.parent.winfo_toplevel()
         self.root.state('zoomed')
         self.parent.configure(bg='#e6ecf0')
         self.frame = tk.Frame(parent, bg='#e6ecf0')
         self.frame.pack(fill="both", expand=True)
         
+        self.storage = get_storage()
+        self.write_queue = get_write_queue()
         self.workouts = []
+        self.workout_ids = []
         self.health_goals = {'steps': 10000, 'calories': 2000, 'workouts': 5}
         self.hydration_goal = 2000
 
@@ -135,20 +147,28 @@ class FitnessAssistant:
 
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
         workout = f"{timestamp} | {workout_type} | {duration} mins | {intensity}"
+        workout_id = self.storage.next_id("workouts")
+        self.write_queue.insert(("workouts", workout_id), UPSERT_WORKOUT,
+                                (workout_id, timestamp, workout_type, duration, intensity))
         self.workouts.append((timestamp, workout_type, duration, intensity))
+        self.workout_ids.append(workout_id)
         self.workout_listbox.insert(tk.END, workout)
+        if self.event_bus:
+            self.event_bus.publish(WORKOUT_LOGGED, {"workout": self.workouts[-1]})
         self.workout_combobox.set("")
         self.duration_combobox.set("")
         self.intensity_combobox.set("")
-        self.save_data()
         self.update_status("Workout logged!")
 
     def delete_workout(self):
         try:
             idx = self.workout_listbox.curselection()[0]
+            workout_id = self.workout_ids.pop(idx)
+            self.write_queue.delete(("workouts", workout_id), DELETE_WORKOUT, (workout_id,))
             self.workout_listbox.delete(idx)
-            self.workouts.pop(idx)
-            self.save_data()
+            workout = self.workouts.pop(idx)
+            if self.event_bus:
+                self.event_bus.publish(WORKOUT_DELETED, {"workout": workout})
             self.update_status("Workout deleted!")
         except IndexError:
             messagebox.showwarning("Selection Error", "Please select a workout!")
@@ -359,51 +379,23 @@ class FitnessAssistant:
                   activebackground='#2980b9', width=15, height=2).pack(pady=20)
 
     def save_data(self):
-        try:
-            with open("fitness_data.json", "w") as f:
-                json.dump({
-                    'workouts': self.workouts,
-                    'health_goals': self.health_goals, 
-                    'hydration_goal': self.hydration_goal
-                }, f, indent=2)
-        except PermissionError:
-            messagebox.showwarning("File Error", "Permission denied while saving data. Check file permissions.")
-        except Exception as e:
-            messagebox.showwarning("File Error", f"Failed to save data: {e}")
+        # Workouts are queued row by row as they change; only the goals are queued here
+        self.write_queue.set_setting("fitness", "health_goals", self.health_goals)
+        self.write_queue.set_setting("fitness", "hydration_goal", self.hydration_goal)
 
     def load_data(self):
         try:
-            if os.path.exists("fitness_data.json"):
-                with open("fitness_data.json", "r") as f:
-                    data = json.load(f)
-                    loaded_workouts = data.get('workouts', [])
-                    self.workouts = []
-                    for workout in loaded_workouts:
-                        if not isinstance(workout, (list, tuple)) or len(workout) != 4:
-                            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-                            workout_type = "Unknown"
-                            duration = 0
-                            intensity = "Unknown"
-                        else:
-                            timestamp, workout_type, duration, intensity = workout
-                            try:
-                                duration = float(duration)
-                            except (ValueError, TypeError):
-                                duration = 0
-                            if not isinstance(workout_type, str):
-                                workout_type = "Unknown"
-                            if not isinstance(intensity, str):
-                                intensity = "Unknown"
-                        self.workouts.append((timestamp, workout_type, duration, intensity))
-                        self.workout_listbox.insert(tk.END, f"{timestamp} | {workout_type} | {duration} mins | {intensity}")
-                    self.health_goals = data.get('health_goals', self.health_goals)
-                    self.hydration_goal = data.get('hydration_goal', self.hydration_goal)
-        except json.JSONDecodeError:
-            messagebox.showwarning("File Error", "Corrupted data file. Starting with empty data.")
+            # Rows still waiting in the queue from a previous visit must land first
+            self.write_queue.flush()
             self.workouts = []
-        except PermissionError:
-            messagebox.showwarning("File Error", "Permission denied while loading data. Check file permissions.")
-        except Exception as e:
+            self.workout_ids = []
+            for workout_id, timestamp, workout_type, duration, intensity in self.storage.load_workouts():
+                self.workouts.append((timestamp, workout_type, duration, intensity))
+                self.workout_ids.append(workout_id)
+                self.workout_listbox.insert(tk.END, f"{timestamp} | {workout_type} | {duration} mins | {intensity}")
+            self.health_goals = self.storage.get_setting("fitness", "health_goals", self.health_goals)
+            self.hydration_goal = self.storage.get_setting("fitness", "hydration_goal", self.hydration_goal)
+        except sqlite3.Error as e:
             messagebox.showwarning("File Error", f"Unable to load workout data: {e}")
 
     def export_workouts(self):
@@ -13,6 +13,10 @@ import threading
 from concurrent.futures import ThreadPoolExecutor
 from pygame import mixer
 from PIL import Image, ImageTk
+from modules.event_bus import EventBus, MODULE_SHOWN, MODULE_HIDDEN, TASK_ADDED, TASK_COMPLETED, TASK_DELETED, TASKS_IMPORTED
+from modules.persistence import get_write_queue
+from modules.reminders import ReminderScheduler, task_due_timestamp, parse_reminder_time
+from modules.storage import get_storage
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -817,6 +821,7 @@ class SPLMApp:
         self.root.geometry("900x700")
         self.root.configure(bg="#FFFFFF")
         self.root.resizable(True, True)
+        self.root.protocol("WM_DELETE_WINDOW", self.close_app)
 
         self.task_manager = None
         self.finance_tracker = None
@@ -825,6 +830,19 @@ class SPLMApp:
         self.productivity_tools = None
         self.entertainment = None
 
+        # Modules publish their changes here instead of reaching into each other
+        self.event_bus = EventBus()
+        self.current_module = None
+
+        # One timer drives every pending reminder, whichever module is open
+        self.reminders = ReminderScheduler(self.root, self.show_reminders)
+        self.reminder_count = 0
+        self.event_bus.subscribe(TASK_ADDED, self.on_task_added)
+        self.event_bus.subscribe(TASK_COMPLETED, self.on_task_finished)
+        self.event_bus.subscribe(TASK_DELETED, self.on_task_finished)
+        self.event_bus.subscribe(TASKS_IMPORTED, self.on_tasks_imported)
+        self.schedule_task_reminders()
+
         self.style = ttk.Style()
         self.style.configure("TFrame", background="#FFFFFF")
         self.style.configure("TLabel", background="#FFFFFF", font=("Arial", 12))
@@ -844,10 +862,19 @@ class SPLMApp:
         self.root.geometry("900x700")
 
     def logout(self):
+        get_write_queue().flush()
         self.main_frame.pack_forget()
         self.show_login()
 
     def close_app(self):
+        # Modules stop what they are doing (e.g. Entertainment stops music and quits the pygame mixer) before the queues are flushed
+        self.hide_current_module()
+        write_queue = get_write_queue()
+        write_queue.flush()
+        logging.info(f"Write-behind stats: {write_queue.stats()}")
+        self.reminders.clear()
+        self.event_bus.shutdown()
+        logging.info(f"Event bus metrics: {self.event_bus.metrics()}")
         self.root.destroy()
 
     def go_back_to_home(self):
@@ -923,14 +950,14 @@ class SPLMApp:
         )
         self.welcome_label.pack(expand=True)
 
+    def hide_current_module(self):
+        # Let the active module release its resources (e.g. stop music) before its widgets go
+        if self.current_module:
+            self.event_bus.publish(MODULE_HIDDEN, {"module": self.current_module})
+            self.current_module = None
+
     def clear_content(self):
-        # Stop music if entertainment module is active
-        if self.entertainment:
-            try:
-                self.entertainment.stop_music()
-                logging.info("Music stopped before switching modules.")
-            except Exception as e:
-                logging.error(f"Error stopping music: {e}")
+        self.hide_current_module()
         # Clear all widgets in the content frame
         for widget in self.content_frame.winfo_children():
             widget.destroy()
@@ -1031,9 +1058,61 @@ class SPLMApp:
         return ["Finish report", "Call client"]
 
     def productivity_tools_set_reminder(self, task, time_str):
-        if self.productivity_tools:
-            pass
+        due = parse_reminder_time(time_str)
+        if due is None:
+            logging.warning(f"Productivity Tools: Could not parse reminder time '{time_str}'")
+            return False
+        self.reminder_count += 1
+        self.reminders.schedule(("reminder", self.reminder_count), due, task)
         logging.info(f"Productivity Tools: Setting reminder for {task} at {time_str}")
+        return True
+
+    def schedule_task_reminders(self):
+        now = time.time()
+        try:
+            tasks = get_storage().load_tasks()
+        except Exception as e:
+            logging.error(f"Could not load tasks for reminders: {e}")
+            return
+        for task in tasks:
+            due = task_due_timestamp(task, after=now)
+            # Deadlines missed while the app was closed are not replayed
+            if not task["done"] and due is not None and due > now:
+                self.reminders.schedule(("task", task["id"]), due, task)
+        logging.info(f"Reminders: {len(self.reminders)} pending")
+
+    def on_task_added(self, event):
+        task = event.payload["task"]
+        due = task_due_timestamp(task, after=time.time())
+        if due is not None:
+            self.reminders.schedule(("task", task["id"]), due, task)
+
+    def on_tasks_imported(self, event):
+        now = time.time()
+        for task in event.payload["tasks"]:
+            due = task_due_timestamp(task, after=now)
+            if not task["done"] and due is not None and due > now:
+                self.reminders.schedule(("task", task["id"]), due, task)
+
+    def on_task_finished(self, event):
+        self.reminders.cancel(("task", event.payload["task"]["id"]))
+
+    def show_reminders(self, reminders):
+        now = time.time()
+        lines = []
+        for key, payload in reminders:
+            if key[0] == "task":
+                lines.append(f"⏰ {payload['task']}")
+                # A recurring task re-arms for its next occurrence
+                due = task_due_timestamp(payload, after=now)
+                if due is not None and due > now:
+                    self.reminders.schedule(key, due, payload)
+            else:
+                lines.append(f"⏰ {payload}")
+        # Reminders due together share one dialog
+        text = "\n".join(lines)
+        logging.info(f"Reminders due: {len(reminders)}")
+        messagebox.showinfo("Reminder", text)
 
     def entertainment_play_music(self):
         if self.entertainment:
@@ -1055,10 +1134,15 @@ class SPLMApp:
             pass
         logging.info("Entertainment: Pausing media")
 
+    def module_shown(self, name):
+        self.current_module = name
+        self.event_bus.publish(MODULE_SHOWN, {"module": name})
+
     def open_task_manager(self):
         self.clear_content()
         if TaskManager:
-            self.task_manager = TaskManager(self.content_frame)
+            self.task_manager = TaskManager(self.content_frame, event_bus=self.event_bus)
+            self.module_shown("task_manager")
         else:
             tk.Label(
                 self.content_frame,
@@ -1071,7 +1155,8 @@ class SPLMApp:
     def open_finance_tracker(self):
         self.clear_content()
         if FinanceTracker:
-            self.finance_tracker = FinanceTracker(self.content_frame)
+            self.finance_tracker = FinanceTracker(self.content_frame, event_bus=self.event_bus)
+            self.module_shown("finance_tracker")
         else:
             tk.Label(
                 self.content_frame,
@@ -1084,7 +1169,8 @@ class SPLMApp:
     def open_fitness_assistant(self):
         self.clear_content()
         if FitnessAssistant:
-            self.fitness_assistant = FitnessAssistant(self.content_frame)
+            self.fitness_assistant = FitnessAssistant(self.content_frame, event_bus=self.event_bus)
+            self.module_shown("fitness_assistant")
         else:
             tk.Label(
                 self.content_frame,
@@ -1098,6 +1184,7 @@ class SPLMApp:
         self.clear_content()
         if TravelAssistantApp:
             self.travel_assistant = TravelAssistantApp(self.content_frame)
+            self.module_shown("travel_assistant")
         else:
             tk.Label(
                 self.content_frame,
@@ -1111,6 +1198,7 @@ class SPLMApp:
         self.clear_content()
         if ProductivityApp:
             self.productivity_tools = ProductivityApp(self.content_frame)
+            self.module_shown("productivity_tools")
         else:
             tk.Label(
                 self.content_frame,
@@ -1123,7 +1211,8 @@ class SPLMApp:
     def open_entertainment(self):
         self.clear_content()
         if Entertainment:
-            self.entertainment = Entertainment(self.content_frame)
+            self.entertainment = Entertainment(self.content_frame, event_bus=self.event_bus)
+            self.module_shown("entertainment")
         else:
             tk.Label(
                 self.content_frame,
@@ -0,0 +1,152 @@
+import atexit
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+try:
+    from .storage import get_storage, UPSERT_SETTING
+except ImportError:
+    from storage import get_storage, UPSERT_SETTING
+
+# Pending operation kinds
+_WRITE = "write"
+_INSERT = "insert"
+_DELETE = "delete"
+
+
+class WriteBehindQueue:
+    """Coalesces storage writes and flushes them on a background thread.
+
+    Each mutation is keyed by the row it touches, so a burst of edits to the
+    same row collapses into one statement, and a row that is inserted and then
+    deleted before a flush is never written at all. Every flush applies the
+    pending statements in a single SQLite transaction, so a crash leaves either
+    the old or the new state on disk, never a partial write.
+    """
+
+    def __init__(self, storage, delay=0.25, max_delay=2.0):
+        self.storage = storage
+        self.delay = delay
+        self.max_delay = max_delay
+        self._pending = {}
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._first_put = None
+        self._last_put = None
+        self._thread = None
+        self._mutations = 0
+        self._statements = 0
+        self._flushes = 0
+
+    def write(self, key, sql, params):
+        """Queue an update/upsert; a later write to the same key replaces it."""
+        with self._lock:
+            previous = self._pending.pop(key, None)
+            # An insert that was never flushed stays an insert, so a delete can still cancel it
+            kind = _INSERT if previous and previous[0] == _INSERT else _WRITE
+            self._queue(key, (kind, sql, params))
+
+    def insert(self, key, sql, params):
+        """Queue a new row."""
+        with self._lock:
+            self._pending.pop(key, None)
+            self._queue(key, (_INSERT, sql, params))
+
+    def delete(self, key, sql, params):
+        """Queue a delete; cancels a pending insert of the same key outright."""
+        with self._lock:
+            previous = self._pending.pop(key, None)
+            if previous and previous[0] == _INSERT:
+                self._mutations += 1
+                return
+            self._queue(key, (_DELETE, sql, params))
+
+    def set_setting(self, module, key, value):
+        self.write(("settings", module, key), UPSERT_SETTING, (module, key, json.dumps(value)))
+
+    def _queue(self, key, op):
+        # Re-inserting moves the key to the end, keeping statements in the order of their last mutation
+        self._pending[key] = op
+        self._mutations += 1
+        now = time.monotonic()
+        if self._first_put is None:
+            self._first_put = now
+        self._last_put = now
+        self._ensure_thread()
+        self._wakeup.notify()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="WriteBehindQueue", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wakeup.wait()
+                # Debounce: wait for a quiet period, but never longer than max_delay overall
+                while True:
+                    now = time.monotonic()
+                    due = min(self._last_put + self.delay, self._first_put + self.max_delay)
+                    if now >= due:
+                        break
+                    self._wakeup.wait(due - now)
+            self.flush()
+
+    def flush(self):
+        """Write everything pending now; safe to call from any thread."""
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending
+                self._pending = {}
+                self._first_put = None
+                self._last_put = None
+            if not pending:
+                return 0
+            try:
+                with self.storage.batch():
+                    for _, sql, params in pending.values():
+                        self.storage.conn.execute(sql, params)
+            except sqlite3.Error as e:
+                logging.error(f"Write-behind flush failed, keeping {len(pending)} writes queued: {e}")
+                with self._lock:
+                    # Anything mutated again meanwhile is newer than what failed
+                    for key, op in pending.items():
+                        self._pending.setdefault(key, op)
+                    if self._first_put is None:
+                        self._first_put = self._last_put = time.monotonic()
+                return 0
+            with self._lock:
+                self._statements += len(pending)
+                self._flushes += 1
+            return len(pending)
+
+    def stats(self):
+        """Report write amplification: statements executed per logical mutation."""
+        with self._lock:
+            return {
+                "mutations": self._mutations,
+                "statements": self._statements,
+                "flushes": self._flushes,
+                "pending": len(self._pending),
+                "write_amplification": self._statements / self._mutations if self._mutations else 0.0,
+            }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_write_queue():
+    """Return the process-wide write-behind queue over the shared storage."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = WriteBehindQueue(get_storage())
+            # Last line of defence if the window is closed without close_app()
+            atexit.register(_queue.flush)
+        return _queue
@@ -1,12 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import time
-import json
 import os
 from datetime import datetime
 import matplotlib.pyplot as plt
 import platform
 import subprocess
+try:
+    from .storage import get_storage
+    from .treeview_binder import TreeviewBinder
+except ImportError:
+    from storage import get_storage
+    from treeview_binder import TreeviewBinder
 
 class ProductivityTools:
     def __init__(self, parent):
@@ -152,29 +157,12 @@ class ProductivityTools:
         self.backspace_count = 0
 
     def save_score(self, wpm):
-        scores_file = "typing_scores.json"
-        data = []
-        try:
-            if os.path.exists(scores_file):
-                with open(scores_file, "r") as file:
-                    data = json.load(file)
-        except (json.JSONDecodeError, IOError):
-            data = []
-        data.append({"timestamp": datetime.now().isoformat(), "wpm": wpm})
-        with open(scores_file, "w") as file:
-            json.dump(data, file, indent=4)
+        get_storage().add_typing_score(datetime.now().isoformat(), wpm)
 
     def plot_previous_scores(self):
-        scores_file = "typing_scores.json"
-        if not os.path.exists(scores_file):
-            return
-        try:
-            with open(scores_file, "r") as file:
-                data = json.load(file)
-        except (json.JSONDecodeError, IOError):
-            return
-        timestamps = [datetime.fromisoformat(d["timestamp"]) for d in data]
-        wpms = [d["wpm"] for d in data]
+        data = get_storage().load_typing_scores()
+        timestamps = [datetime.fromisoformat(timestamp) for timestamp, _ in data]
+        wpms = [wpm for _, wpm in data]
         if not timestamps or not wpms:
             return
         plt.figure(figsize=(6, 4))
@@ -472,7 +460,8 @@ class AttendanceTracker:
         self.parent = parent
         self.frame = tk.Frame(parent, bg='#E6ECF0')
         self.frame.pack(fill="both", expand=True)
-        self.students = {}
+        self.storage = get_storage()
+        self.students = dict(self.storage.load_attendance())
         self.TOTAL_CLASSES = 60
         self.current_student_index = 0
         self.init_ui()
@@ -500,6 +489,8 @@ class AttendanceTracker:
         attendance_frame.pack(fill='x', padx=15, pady=10)
         self.current_student_label = tk.Label(attendance_frame, text="No students added yet.", font=("Arial", 14), bg='#E6ECF0', fg='#263238')
         self.current_student_label.pack(side='left', padx=5)
+        if self.students:
+            self.current_student_label.config(text=f"Marking for: {next(iter(self.students))}")
         self.attendance_var = tk.StringVar(value="P")
         tk.Radiobutton(attendance_frame, text="✅ Present", variable=self.attendance_var, value="P", font=("Arial", 12)).pack(side="left", padx=10)
         tk.Radiobutton(attendance_frame, text="❌ Absent", variable=self.attendance_var, value="A", font=("Arial", 12)).pack(side="left", padx=10)
@@ -522,6 +513,9 @@ class AttendanceTracker:
         self.tree.configure(yscrollcommand=self.scrollbar.set)
         self.scrollbar.pack(side="right", fill="y")
         self.tree.bind("<Double-1>", self.on_double_click)
+        self.tree.tag_configure('even', background='#F0F4F8')
+        self.tree.tag_configure('odd', background='#FFFFFF')
+        self.tree_binder = TreeviewBinder(self.tree)
         self.show_report()
 
     def is_valid_name(self, name):
@@ -539,6 +533,7 @@ class AttendanceTracker:
             messagebox.showwarning("Duplicate Entry", "⚠️ Student already added.")
             return
         self.students[name] = 0
+        self.storage.add_student(name)
         self.student_entry.delete(0, tk.END)
         messagebox.showinfo("Success", f"Student {name} added successfully! ✅")
         if len(self.students) == 1:
@@ -555,6 +550,7 @@ class AttendanceTracker:
         status = self.attendance_var.get()
         if status == 'P':
             self.students[current_student] += 1
+            self.storage.set_attendance(current_student, self.students[current_student])
         self.current_student_index += 1
         if self.current_student_index >= len(student_names):
             messagebox.showinfo("Done", "Attendance marking completed for all students! ✅")
@@ -565,16 +561,16 @@ class AttendanceTracker:
             self.current_student_label.config(text=f"Marking for: {next_student}")
         self.show_report()
 
-    def show_report(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+    def report_rows(self):
         for i, (name, present) in enumerate(self.students.items()):
             percentage = (present / self.TOTAL_CLASSES) * 100
             status = "⚠️ Low Attendance" if percentage < 75 else "✅ OK"
             tag = 'even' if i % 2 == 0 else 'odd'
-            self.tree.insert("", "end", values=(name, f"{present}/{self.TOTAL_CLASSES}", f"{percentage:.2f}%", status), tags=(tag,))
-        self.tree.tag_configure('even', background='#F0F4F8')
-        self.tree.tag_configure('odd', background='#FFFFFF')
+            yield name, (name, f"{present}/{self.TOTAL_CLASSES}", f"{percentage:.2f}%", status), (tag,)
+
+    def show_report(self):
+        # Marking one student only updates that student's row
+        self.tree_binder.render(self.report_rows())
 
     def on_double_click(self, event):
         selected_item = self.tree.selection()
@@ -0,0 +1,112 @@
+from calendar import monthrange
+from datetime import date, timedelta
+
+try:
+    from .datetime_parse import parse_date
+except ImportError:
+    from datetime_parse import parse_date
+
+# Values of a task's "recurrence" field; a one-off task (the "None" choice) stores None
+DAILY = "Daily"
+WEEKLY = "Weekly"
+MONTHLY = "Monthly"
+CUSTOM = "Custom"
+RECURRENCES = ["None", DAILY, WEEKLY, MONTHLY, CUSTOM]
+# The values that make a task repeat
+RULE_KINDS = (DAILY, WEEKLY, MONTHLY, CUSTOM)
+
+
+def parse_due(due):
+    """The date of a dd/mm/yyyy due string, or None."""
+    return parse_date(due) if due else None
+
+
+def add_months(start, months):
+    """start moved by a number of months, clamped to the end of shorter months."""
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    month += 1
+    return date(year, month, min(start.day, monthrange(year, month)[1]))
+
+
+class RecurrenceRule:
+    """How a recurring task repeats: every `interval` days, weeks or months from `start`.
+
+    Custom means every `interval` days. Occurrences are computed arithmetically
+    for the window asked for, so a rule costs the same however long it runs.
+    """
+    __slots__ = ("frequency", "interval", "start")
+
+    def __init__(self, frequency, start, interval=1):
+        self.frequency = frequency
+        self.start = start
+        self.interval = max(1, int(interval or 1))
+
+    @classmethod
+    def from_task(cls, task):
+        """The task's rule, or None for a one-off task (any recurrence outside RULE_KINDS, e.g. None or "")."""
+        frequency = task.get("recurrence")
+        start = parse_due(task.get("due"))
+        if frequency not in RULE_KINDS or start is None:
+            return None
+        return cls(frequency, start, task.get("recur_interval"))
+
+    def step_days(self):
+        return self.interval * 7 if self.frequency == WEEKLY else self.interval
+
+    def occurrences(self, window_start, window_end):
+        """Yield the occurrence dates falling within [window_start, window_end]."""
+        if window_end < self.start:
+            return
+        first = max(window_start, self.start)
+        if self.frequency == MONTHLY:
+            # Jump straight to the first candidate month; clamping can only pull a date earlier
+            months = (first.year - self.start.year) * 12 + first.month - self.start.month
+            n = max(0, months // self.interval)
+            occurrence = add_months(self.start, n * self.interval)
+            while occurrence <= window_end:
+                if occurrence >= first:
+                    yield occurrence
+                n += 1
+                occurrence = add_months(self.start, n * self.interval)
+            return
+        step = self.step_days()
+        n = -(-(first - self.start).days // step)
+        occurrence = self.start + timedelta(days=n * step)
+        step = timedelta(days=step)
+        while occurrence <= window_end:
+            yield occurrence
+            occurrence += step
+
+    def describe(self):
+        if self.frequency == CUSTOM:
+            return f"Every {self.interval} days"
+        if self.interval == 1:
+            return self.frequency
+        unit = {DAILY: "days", WEEKLY: "weeks", MONTHLY: "months"}[self.frequency]
+        return f"Every {self.interval} {unit}"
+
+
+def expand_occurrences(tasks, window_start, window_end, completed):
+    """(date, task, done) for every task occurrence in the window, ordered by date and time.
+
+    One-off tasks contribute their due date; recurring tasks are expanded from
+    their rule. completed maps task id to the set of ISO dates marked done, so
+    only finished occurrences ever take memory.
+    """
+    rows = []
+    for task in tasks:
+        rule = RecurrenceRule.from_task(task)
+        if rule is None:
+            due = parse_due(task.get("due"))
+            if due is not None and window_start <= due <= window_end:
+                rows.append((due, task, task["done"]))
+            continue
+        if task["done"]:
+            # Marking the whole series done ends it
+            continue
+        done_dates = completed.get(task["id"], ())
+        for occurrence in rule.occurrences(window_start, window_end):
+            rows.append((occurrence, task, occurrence.isoformat() in done_dates))
+    rows.sort(key=lambda row: (row[0], row[1].get("time") or "", row[1]["id"]))
+    return rows
@@ -0,0 +1,173 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+import tkinter as tk
+from datetime import datetime, timedelta
+
+try:
+    from .recurrence import RecurrenceRule
+    from .datetime_parse import parse_date, parse_time
+except ImportError:
+    from recurrence import RecurrenceRule
+    from datetime_parse import parse_date, parse_time
+
+# Re-check the heap at least this often, so wall-clock jumps (sleep, clock changes) are noticed
+_MAX_TIMER_MS = 60_000
+# Rebuild the heap once cancelled entries outnumber live ones by this factor
+_COMPACT_RATIO = 2
+
+# Entry layout inside the heap: [due timestamp, sequence, key, payload, live]
+_DUE, _SEQ, _KEY, _PAYLOAD, _LIVE = range(5)
+
+
+def task_due_timestamp(task, after=None):
+    """Epoch seconds for a task's dd/mm/yyyy due date and HH:MM time, or None if it has no due date.
+
+    For a recurring task with `after` given, this is its first occurrence later than `after`.
+    """
+    due = parse_date(task["due"]) if task.get("due") else None
+    clock = parse_time(task.get("time") or "00:00")
+    if due is None or clock is None:
+        return None
+    moment = datetime.combine(due, clock)
+    rule = RecurrenceRule.from_task(task)
+    if rule is None or after is None or moment.timestamp() > after:
+        return moment.timestamp()
+    start = datetime.fromtimestamp(after).date()
+    # Wide enough to hold at least two occurrences of any rule
+    for day in rule.occurrences(start, start + timedelta(days=62 * rule.interval)):
+        timestamp = datetime.combine(day, moment.time()).timestamp()
+        if timestamp > after:
+            return timestamp
+    return None
+
+
+def parse_reminder_time(time_str, now=None):
+    """Epoch seconds for the next occurrence of a 12h or 24h clock time, or None if unparseable."""
+    now = now or datetime.now()
+    clock = parse_time(time_str)
+    if clock is None:
+        return None
+    moment = datetime.combine(now.date(), clock)
+    if moment <= now:
+        moment += timedelta(days=1)
+    return moment.timestamp()
+
+
+class ReminderScheduler:
+    """Fires reminders at their due time from one Tk timer over a min-heap of deadlines.
+
+    schedule() and cancel() are O(log n) (cancel marks the entry dead and the heap
+    is compacted once dead entries pile up), and only the earliest deadline ever
+    has an after() callback armed. Due reminders are collected in one pass and
+    handed to notify(reminders) on the Tk thread as a list of (key, payload).
+    """
+
+    def __init__(self, widget, notify):
+        self.widget = widget
+        self.notify = notify
+        self._heap = []
+        self._entries = {}
+        self._dead = 0
+        self._counter = itertools.count()
+        self._lock = threading.RLock()
+        self._after_id = None
+        self._armed_for = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def schedule(self, key, due, payload=None):
+        """Add or move the reminder for key; due is epoch seconds or a datetime."""
+        if isinstance(due, datetime):
+            due = due.timestamp()
+        with self._lock:
+            self._discard(key)
+            entry = [due, next(self._counter), key, payload, True]
+            self._entries[key] = entry
+            heapq.heappush(self._heap, entry)
+            if self._armed_for is None or due < self._armed_for:
+                self._arm()
+
+    def cancel(self, key):
+        """Drop the reminder for key; unknown keys are ignored."""
+        with self._lock:
+            if self._discard(key) and self._dead > _COMPACT_RATIO * max(len(self._entries), 1):
+                self._heap = [entry for entry in self._heap if entry[_LIVE]]
+                heapq.heapify(self._heap)
+                self._dead = 0
+
+    def clear(self):
+        with self._lock:
+            self._heap = []
+            self._entries = {}
+            self._dead = 0
+            self._disarm()
+
+    def next_due(self):
+        with self._lock:
+            self._drop_dead_top()
+            return self._heap[0][_DUE] if self._heap else None
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        entry[_LIVE] = False
+        self._dead += 1
+        return True
+
+    def _drop_dead_top(self):
+        heap = self._heap
+        while heap and not heap[0][_LIVE]:
+            heapq.heappop(heap)
+            self._dead -= 1
+
+    def _disarm(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+        self._after_id = None
+        self._armed_for = None
+
+    def _arm(self):
+        self._disarm()
+        self._drop_dead_top()
+        if not self._heap:
+            return
+        due = self._heap[0][_DUE]
+        delay_ms = int(max(0.0, due - time.time()) * 1000)
+        try:
+            self._after_id = self.widget.after(min(delay_ms, _MAX_TIMER_MS), self._fire)
+        except (tk.TclError, RuntimeError):
+            # The window is gone; nothing is left to notify
+            return
+        self._armed_for = due
+
+    def _fire(self):
+        with self._lock:
+            self._after_id = None
+            self._armed_for = None
+            now = time.time()
+            fired = []
+            heap = self._heap
+            while heap and heap[0][_DUE] <= now:
+                entry = heapq.heappop(heap)
+                if not entry[_LIVE]:
+                    self._dead -= 1
+                    continue
+                del self._entries[entry[_KEY]]
+                fired.append((entry[_KEY], entry[_PAYLOAD]))
+            self._arm()
+        if fired:
+            try:
+                self.notify(fired)
+            except Exception as e:
+                logging.error(f"Reminder notification failed: {e}")
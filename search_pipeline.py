@@ -0,0 +1,77 @@
+import logging
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+
+class SearchPipeline:
+    """Debounced, cancellable search that keeps typing responsive.
+
+    submit() restarts a short debounce timer, so a burst of keystrokes becomes
+    one query. The query runs on a worker thread as search(*query, cancelled),
+    where cancelled() turns true as soon as a newer query is submitted; the
+    search should check it between expensive steps and return early. Only the
+    result of the newest query is handed to apply() on the Tk thread.
+    """
+
+    def __init__(self, widget, search, apply, delay_ms=150):
+        self.widget = widget
+        self.search = search
+        self.apply = apply
+        self.delay_ms = delay_ms
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._after_id = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="SearchPipeline")
+
+    def submit(self, *query):
+        generation = self._next_generation()
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        self._after_id = self.widget.after(self.delay_ms, self._start, generation, query)
+
+    def cancel(self):
+        """Drop any pending or running query."""
+        self._next_generation()
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _next_generation(self):
+        with self._lock:
+            self._generation += 1
+            return self._generation
+
+    def _is_current(self, generation):
+        return generation == self._generation
+
+    def _start(self, generation, query):
+        self._after_id = None
+        if self._is_current(generation):
+            self._executor.submit(self._run, generation, query)
+
+    def _run(self, generation, query):
+        cancelled = lambda: not self._is_current(generation)
+        if cancelled():
+            return
+        try:
+            result = self.search(*query, cancelled)
+        except Exception as e:
+            # The executor would keep the exception in a discarded future
+            logging.error(f"Search for {query!r} failed: {e}")
+            return
+        if cancelled():
+            return
+        try:
+            self.widget.after(0, self._apply, generation, result)
+        except (tk.TclError, RuntimeError):
+            # The view was destroyed while the query ran
+            pass
+
+    def _apply(self, generation, result):
+        if self._is_current(generation):
+            self.apply(result)
@@ -0,0 +1,291 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    from .task_record import Task
+except ImportError:
+    from task_record import Task
+
+DEFAULT_DB_PATH = "splm.db"
+
+# Per-module schemas; every statement is idempotent so it can run on each start
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY,
+        task TEXT NOT NULL,
+        done INTEGER NOT NULL DEFAULT 0,
+        due TEXT,
+        time TEXT,
+        time_display TEXT,
+        priority TEXT,
+        category TEXT,
+        notes TEXT,
+        recurrence TEXT,
+        recur_interval INTEGER,
+        created_at TEXT,
+        completed_at TEXT
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks (due)",
+    "CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks (category)",
+    # Sparse: a row exists only for a recurring task occurrence that was marked done
+    """CREATE TABLE IF NOT EXISTS task_occurrences (
+        task_id INTEGER NOT NULL,
+        occurrence TEXT NOT NULL,
+        PRIMARY KEY (task_id, occurrence)
+    ) WITHOUT ROWID""",
+    """CREATE TABLE IF NOT EXISTS workouts (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        workout_type TEXT NOT NULL,
+        duration REAL NOT NULL,
+        intensity TEXT NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_workouts_timestamp ON workouts (timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_workouts_type ON workouts (workout_type)",
+    """CREATE TABLE IF NOT EXISTS typing_scores (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        wpm REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_typing_scores_timestamp ON typing_scores (timestamp)",
+    """CREATE TABLE IF NOT EXISTS attendance (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        present INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS settings (
+        module TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (module, key)
+    )""",
+]
+
+# Columns added after a table was first released, as (table, column, type)
+ADDED_COLUMNS = [
+    ("tasks", "recurrence", "TEXT"),
+    ("tasks", "recur_interval", "INTEGER"),
+    ("tasks", "created_at", "TEXT"),
+    ("tasks", "completed_at", "TEXT"),
+]
+
+# Statements are kept as constants so sqlite3's statement cache reuses the
+# prepared form instead of re-parsing the SQL on every call.
+TASK_COLUMNS = ("task", "done", "due", "time", "time_display", "priority", "category", "notes", "recurrence", "recur_interval", "created_at", "completed_at")
+SELECT_TASKS = f"SELECT id, {', '.join(TASK_COLUMNS)} FROM tasks ORDER BY id"
+INSERT_TASK = f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}) VALUES ({', '.join('?' * len(TASK_COLUMNS))})"
+INSERT_TASK_WITH_ID = f"INSERT INTO tasks (id, {', '.join(TASK_COLUMNS)}) VALUES ({', '.join('?' * (len(TASK_COLUMNS) + 1))})"
+UPDATE_TASK_DONE = "UPDATE tasks SET done = ?, completed_at = ? WHERE id = ?"
+DELETE_TASK = "DELETE FROM tasks WHERE id = ?"
+
+SELECT_OCCURRENCES = "SELECT task_id, occurrence FROM task_occurrences"
+INSERT_OCCURRENCE = "INSERT OR IGNORE INTO task_occurrences (task_id, occurrence) VALUES (?, ?)"
+DELETE_OCCURRENCE = "DELETE FROM task_occurrences WHERE task_id = ? AND occurrence = ?"
+DELETE_TASK_OCCURRENCES = "DELETE FROM task_occurrences WHERE task_id = ?"
+
+SELECT_WORKOUTS = "SELECT id, timestamp, workout_type, duration, intensity FROM workouts ORDER BY id"
+INSERT_WORKOUT = "INSERT INTO workouts (timestamp, workout_type, duration, intensity) VALUES (?, ?, ?, ?)"
+UPSERT_WORKOUT = "INSERT OR REPLACE INTO workouts (id, timestamp, workout_type, duration, intensity) VALUES (?, ?, ?, ?, ?)"
+DELETE_WORKOUT = "DELETE FROM workouts WHERE id = ?"
+
+SELECT_TYPING_SCORES = "SELECT timestamp, wpm FROM typing_scores ORDER BY timestamp"
+INSERT_TYPING_SCORE = "INSERT INTO typing_scores (timestamp, wpm) VALUES (?, ?)"
+
+SELECT_ATTENDANCE = "SELECT name, present FROM attendance ORDER BY id"
+INSERT_STUDENT = "INSERT OR IGNORE INTO attendance (name, present) VALUES (?, ?)"
+UPDATE_ATTENDANCE = "UPDATE attendance SET present = ? WHERE name = ?"
+
+SELECT_SETTING = "SELECT value FROM settings WHERE module = ? AND key = ?"
+UPSERT_SETTING = "INSERT OR REPLACE INTO settings (module, key, value) VALUES (?, ?, ?)"
+
+
+class Storage:
+    """SQLite storage engine shared by all SPLM modules."""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._next_ids = {}
+        # isolation_level=None: transactions are opened explicitly by batch()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, cached_statements=256)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.batch():
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+            for table, column, column_type in ADDED_COLUMNS:
+                existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+                if column not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    @contextmanager
+    def batch(self):
+        """Group writes into one transaction; nested batches join the outer one."""
+        with self._lock:
+            outer = self._batch_depth == 0
+            if outer:
+                self.conn.execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if outer:
+                    self.conn.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if outer:
+                self.conn.execute("COMMIT")
+
+    def execute(self, sql, params=()):
+        with self.batch():
+            return self.conn.execute(sql, params)
+
+    def executemany(self, sql, rows):
+        with self.batch():
+            return self.conn.executemany(sql, rows)
+
+    def query(self, sql, params=()):
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def next_id(self, table, count=1):
+        """Allocate row ids up front so writes can be queued before they reach disk.
+
+        Reserves `count` consecutive ids and returns the first.
+        """
+        with self._lock:
+            if table not in self._next_ids:
+                self._next_ids[table] = self.query(f"SELECT MAX(id) FROM {table}")[0][0] or 0
+            first = self._next_ids[table] + 1
+            self._next_ids[table] += count
+            return first
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # Task Manager
+    def load_tasks(self):
+        # Columns are selected in Task's positional order
+        return [Task(*row) for row in self.query(SELECT_TASKS)]
+
+    def add_task(self, task):
+        # Ids come from next_id() like imported ones, so the two never hand out the same id
+        task_id = self.next_id("tasks")
+        params = [task_id] + [task.get(column) for column in TASK_COLUMNS]
+        params[2] = int(task["done"])
+        self.execute(INSERT_TASK_WITH_ID, params)
+        return task_id
+
+    def insert_tasks(self, rows):
+        """Insert (id, *TASK_COLUMNS) rows, with ids from next_id("tasks", n), in one transaction."""
+        self.executemany(INSERT_TASK_WITH_ID, rows)
+
+    def set_task_done(self, task_id, done=True, completed_at=None):
+        self.execute(UPDATE_TASK_DONE, (int(done), completed_at if done else None, task_id))
+
+    def delete_task(self, task_id):
+        with self.batch():
+            self.execute(DELETE_TASK_OCCURRENCES, (task_id,))
+            self.execute(DELETE_TASK, (task_id,))
+
+    def load_completed_occurrences(self):
+        """Map task id to the set of ISO dates of its occurrences marked done."""
+        completed = {}
+        for task_id, occurrence in self.query(SELECT_OCCURRENCES):
+            completed.setdefault(task_id, set()).add(occurrence)
+        return completed
+
+    def set_occurrence_done(self, task_id, occurrence, done=True):
+        self.execute(INSERT_OCCURRENCE if done else DELETE_OCCURRENCE, (task_id, occurrence))
+
+    # Fitness Assistant
+    def load_workouts(self):
+        return self.query(SELECT_WORKOUTS)
+
+    # Productivity Tools
+    def load_typing_scores(self):
+        return self.query(SELECT_TYPING_SCORES)
+
+    def add_typing_score(self, timestamp, wpm):
+        self.execute(INSERT_TYPING_SCORE, (timestamp, wpm))
+
+    def load_attendance(self):
+        return self.query(SELECT_ATTENDANCE)
+
+    def add_student(self, name, present=0):
+        self.execute(INSERT_STUDENT, (name, present))
+
+    def set_attendance(self, name, present):
+        self.execute(UPDATE_ATTENDANCE, (present, name))
+
+    # Small per-module values stored as JSON
+    def get_setting(self, module, key, default=None):
+        rows = self.query(SELECT_SETTING, (module, key))
+        return json.loads(rows[0][0]) if rows else default
+
+    def set_setting(self, module, key, value):
+        self.execute(UPSERT_SETTING, (module, key, json.dumps(value)))
+
+    def migrate_json(self, fitness_path="fitness_data.json", scores_path="typing_scores.json"):
+        """Import the legacy JSON files once, then rename them to *.migrated."""
+        if os.path.exists(fitness_path):
+            try:
+                with open(fitness_path, "r") as f:
+                    data = json.load(f)
+                rows = []
+                for workout in data.get("workouts", []):
+                    # Same repair rules the JSON loader in FitnessAssistant used
+                    if not isinstance(workout, (list, tuple)) or len(workout) != 4:
+                        workout = (datetime.now().strftime("%Y-%m-%d %H:%M"), "Unknown", 0, "Unknown")
+                    timestamp, workout_type, duration, intensity = workout
+                    try:
+                        duration = float(duration)
+                    except (ValueError, TypeError):
+                        duration = 0
+                    if not isinstance(workout_type, str):
+                        workout_type = "Unknown"
+                    if not isinstance(intensity, str):
+                        intensity = "Unknown"
+                    rows.append((str(timestamp), workout_type, duration, intensity))
+                with self.batch():
+                    self.executemany(INSERT_WORKOUT, rows)
+                    if "health_goals" in data:
+                        self.set_setting("fitness", "health_goals", data["health_goals"])
+                    if "hydration_goal" in data:
+                        self.set_setting("fitness", "hydration_goal", data["hydration_goal"])
+                os.replace(fitness_path, fitness_path + ".migrated")
+                logging.info(f"Migrated {len(rows)} workouts from {fitness_path}")
+            except (OSError, ValueError, AttributeError, sqlite3.Error) as e:
+                logging.error(f"Failed to migrate {fitness_path}: {e}")
+        if os.path.exists(scores_path):
+            try:
+                with open(scores_path, "r") as f:
+                    data = json.load(f)
+                rows = [(d["timestamp"], float(d["wpm"])) for d in data if "timestamp" in d and "wpm" in d]
+                self.executemany(INSERT_TYPING_SCORE, rows)
+                os.replace(scores_path, scores_path + ".migrated")
+                logging.info(f"Migrated {len(rows)} typing scores from {scores_path}")
+            except (OSError, ValueError, TypeError, sqlite3.Error) as e:
+                logging.error(f"Failed to migrate {scores_path}: {e}")
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage(path=DEFAULT_DB_PATH):
+    """Return the process-wide Storage, creating and migrating it on first use."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            _storage = Storage(path)
+            _storage.migrate_json()
+        return _storage
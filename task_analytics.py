@@ -0,0 +1,216 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+# Columns copied out of the task dicts when they are parsed into arrays
+_COLUMNS = ("id", "done", "due", "time", "priority", "category", "created_at", "completed_at")
+_PRIORITIES = ["High", "Medium", "Low"]
+_NAT = np.iinfo(np.int64).min
+
+
+def _parse(tasks):
+    """(ids, done, due_at, priority codes, category codes, category names, created_at, completed_at) for a batch of tasks.
+
+    Times are int64 nanoseconds with NaT as the int64 minimum; category codes
+    index the batch's own category names, and they and priority codes are -1
+    when missing or unknown. One vectorized pass, whatever the batch size.
+    """
+    frame = pd.DataFrame.from_records([tuple(task.get(column) for column in _COLUMNS) for task in tasks],
+                                      columns=_COLUMNS)
+    due = pd.to_datetime(frame["due"], format="%d/%m/%Y", errors="coerce")
+    clock = (pd.to_datetime(frame["time"], format="%H:%M", errors="coerce") - pd.Timestamp(1900, 1, 1)).fillna(pd.Timedelta(0))
+    created = pd.to_datetime(frame["created_at"], format="%Y-%m-%d %H:%M", errors="coerce")
+    completed = pd.to_datetime(frame["completed_at"], format="%Y-%m-%d %H:%M", errors="coerce")
+    category_codes, category_names = pd.factorize(frame["category"])
+    return (
+        frame["id"].to_numpy(dtype=np.int64),
+        frame["done"].fillna(False).to_numpy(dtype=bool),
+        (due + clock).to_numpy(dtype="datetime64[ns]").view(np.int64),
+        pd.Categorical(frame["priority"], categories=_PRIORITIES).codes.astype(np.int8),
+        category_codes,
+        list(category_names),
+        created.to_numpy(dtype="datetime64[ns]").view(np.int64),
+        completed.to_numpy(dtype="datetime64[ns]").view(np.int64),
+    )
+
+
+class TaskAnalytics:
+    """Task statistics computed with pandas over columnar arrays kept in step with a TaskStore.
+
+    The tasks are parsed into the arrays once, when a view first asks for
+    them. After that the store reports every add, removal and completion,
+    and each one updates only the affected task's slots, so a change never
+    costs a pass over all tasks. A removed task's slot is filled with the
+    last one. The DataFrame over the arrays, and each result derived from
+    it, are cached against the store's version.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._slots = {}
+        self._size = 0
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._done = np.zeros(0, dtype=bool)
+        self._due_at = np.zeros(0, dtype=np.int64)
+        self._priority = np.zeros(0, dtype=np.int8)
+        self._category = np.zeros(0, dtype=np.int32)
+        self._created_at = np.zeros(0, dtype=np.int64)
+        self._completed_at = np.zeros(0, dtype=np.int64)
+        # Low-cardinality text is kept as integer codes, so grouping is integer work
+        self._categories = []
+        self._category_codes = {}
+        # Tasks per category code, so unused categories drop out of the frame without a scan
+        self._category_counts = np.zeros(0, dtype=np.int64)
+        self._version = None
+        self._frame = None
+        self._results = {}
+        # The store's tasks are parsed when a view first needs them, not at startup
+        self._loaded = False
+        store.listeners.append(self)
+
+    def _arrays(self):
+        return ("_ids", "_done", "_due_at", "_priority", "_category", "_created_at", "_completed_at")
+
+    def _code(self, category):
+        code = self._category_codes.get(category)
+        if code is None:
+            code = self._category_codes[category] = len(self._categories)
+            self._categories.append(category)
+        return code
+
+    def tasks_added(self, tasks):
+        if not tasks or not self._loaded:
+            return
+        ids, done, due_at, priority, category, categories, created_at, completed_at = _parse(tasks)
+        # Batch codes to this object's codes; the extra -1 at the end maps a missing category (-1) to -1
+        to_code = np.array([self._code(name) for name in categories] + [-1], dtype=np.int32)
+        category = to_code[category]
+        counts = np.bincount(category[category >= 0], minlength=len(self._categories))
+        counts[:len(self._category_counts)] += self._category_counts
+        self._category_counts = counts
+        start, end = self._size, self._size + len(tasks)
+        if end > len(self._done):
+            # Grow by half again so a run of single adds stays amortized O(1)
+            capacity = max(end, len(self._done) * 3 // 2, 16)
+            for name in self._arrays():
+                old = getattr(self, name)
+                grown = np.zeros(capacity, dtype=old.dtype)
+                grown[:start] = old[:start]
+                setattr(self, name, grown)
+        self._ids[start:end] = ids
+        self._done[start:end] = done
+        self._due_at[start:end] = due_at
+        self._priority[start:end] = priority
+        self._category[start:end] = category
+        self._created_at[start:end] = created_at
+        self._completed_at[start:end] = completed_at
+        for slot, task_id in enumerate(ids.tolist(), start):
+            self._slots[task_id] = slot
+        self._size = end
+
+    def task_removed(self, task):
+        if not self._loaded:
+            return
+        slot = self._slots.pop(task["id"])
+        last = self._size - 1
+        if self._category[slot] >= 0:
+            self._category_counts[self._category[slot]] -= 1
+        if slot != last:
+            for name in self._arrays():
+                array = getattr(self, name)
+                array[slot] = array[last]
+            self._slots[int(self._ids[slot])] = slot
+        self._size = last
+
+    def task_changed(self, task):
+        """Refresh the completion columns of one task after it was marked done or not."""
+        if not self._loaded:
+            return
+        slot = self._slots[task["id"]]
+        completed = pd.to_datetime(task.get("completed_at"), format="%Y-%m-%d %H:%M", errors="coerce")
+        self._done[slot] = bool(task["done"])
+        self._completed_at[slot] = _NAT if pd.isna(completed) else completed.value
+
+    def frame(self):
+        """A DataFrame over the arrays, rebuilt (without parsing anything) only when the store has changed."""
+        if not self._loaded:
+            self._loaded = True
+            self.tasks_added(list(self.store))
+        if self._version != self.store.version:
+            size = self._size
+            times = lambda values: pd.Series(values[:size].view("datetime64[ns]"))
+            # Codes follow first appearance; present the categories sorted, without ones no task uses any more
+            used = sorted(np.flatnonzero(self._category_counts).tolist(), key=self._categories.__getitem__)
+            renumber = np.full(len(self._categories) + 1, -1, dtype=np.int32)
+            renumber[used] = np.arange(len(used))
+            category = pd.Categorical.from_codes(renumber[self._category[:size]],
+                                                 categories=[self._categories[code] for code in used])
+            self._frame = pd.DataFrame({
+                "done": self._done[:size],
+                "priority": pd.Categorical.from_codes(self._priority[:size], categories=_PRIORITIES),
+                "category": category,
+                "due_at": times(self._due_at),
+                "created_at": times(self._created_at),
+                "completed_at": times(self._completed_at),
+            })
+            self._results = {}
+            self._version = self.store.version
+        return self._frame
+
+    def _cached(self, name, key, compute):
+        """compute(frame), cached per result name; only the latest key is kept for each name."""
+        frame = self.frame()
+        cached = self._results.get(name)
+        if cached is None or cached[0] != key:
+            cached = self._results[name] = (key, compute(frame))
+        return cached[1]
+
+    def completion_by_category(self):
+        """Per category: total tasks, completed tasks and completion rate (%)."""
+        def compute(frame):
+            grouped = frame.groupby("category", observed=True)["done"]
+            result = pd.DataFrame({"total": grouped.size(), "done": grouped.sum()})
+            result["rate"] = (result["done"] / result["total"] * 100).round(1)
+            return result
+        return self._cached("completion_by_category", None, compute)
+
+    def overdue(self, now=None):
+        """Open tasks past their due moment, counted by category."""
+        now = pd.Timestamp(now) if now is not None else pd.Timestamp.now().floor("min")
+        # Depends on the clock as well as the data; a new minute replaces the cached result
+        return self._cached("overdue", now, lambda frame: (
+            frame.loc[~frame["done"].to_numpy() & (frame["due_at"] < now).to_numpy(), "category"]
+            .value_counts()
+        ))
+
+    def throughput_by_priority(self, days=7, today=None):
+        """Tasks completed per priority over the last `days` days, with the daily average."""
+        today = today or date.today()
+        start = pd.Timestamp(today - timedelta(days=days - 1))
+
+        def compute(frame):
+            recent = frame.loc[(frame["completed_at"] >= start).to_numpy(), "priority"]
+            counts = recent.value_counts().reindex(_PRIORITIES, fill_value=0)
+            return pd.DataFrame({"completed": counts, "per_day": (counts / days).round(2)})
+        return self._cached("throughput", (days, today), compute)
+
+    def burndown(self, days=14, today=None):
+        """Open task count at the end of each of the last `days` days.
+
+        Tasks without a creation time count as open from the start of the
+        window; done tasks without a completion time are left out entirely.
+        """
+        today = today or date.today()
+        index = pd.date_range(end=pd.Timestamp(today), periods=days, freq="D")
+
+        def compute(frame):
+            done = frame["done"].to_numpy()
+            known = ~(done & frame["completed_at"].isna().to_numpy())
+            created = frame["created_at"][known].dt.normalize().fillna(index[0]).clip(lower=index[0])
+            completed = frame["completed_at"][known & done].dt.normalize().clip(lower=index[0])
+            # Cumulative arrivals minus cumulative completions, one vectorized pass per series
+            opened = created.value_counts().reindex(index, fill_value=0).cumsum()
+            closed = completed.value_counts().reindex(index, fill_value=0).cumsum()
+            return (opened - closed).astype(np.int64).rename("open")
+        return self._cached("burndown", (days, today), compute)
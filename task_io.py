@@ -0,0 +1,234 @@
+import csv
+import json
+import os
+
+import pandas as pd
+
+try:
+    from .storage import TASK_COLUMNS
+    from .task_record import Task
+    from .recurrence import RULE_KINDS
+except ImportError:
+    from storage import TASK_COLUMNS
+    from task_record import Task
+    from recurrence import RULE_KINDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Rows read, validated and inserted per step
+CHUNK_ROWS = 50_000
+EXPORT_COLUMNS = ("id",) + TASK_COLUMNS
+PRIORITIES = ("High", "Medium", "Low")
+_TRUE_VALUES = ("1", "true", "yes", "y", "done", "✓")
+# Recurrence spellings accepted on import; "none" is a one-off task like an empty field
+_RECURRENCES = {kind.lower(): kind for kind in RULE_KINDS}
+
+
+def file_formats():
+    """(description, pattern) pairs for the formats usable in this environment."""
+    formats = [("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl")]
+    if pq is not None:
+        formats.append(("Parquet files", "*.parquet"))
+    return formats
+
+
+def format_for(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".json", ".ndjson"):
+        return "jsonl"
+    if extension == ".parquet":
+        if pq is None:
+            raise ValueError("Parquet support needs pyarrow, which is not installed.")
+        return "parquet"
+    raise ValueError(f"Unsupported file type: {extension or path}")
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yield (DataFrame, fraction of the file read) without loading the whole file."""
+    fmt = format_for(path)
+    if fmt == "parquet":
+        parquet = pq.ParquetFile(path)
+        total = max(parquet.metadata.num_rows, 1)
+        read = 0
+        for batch in parquet.iter_batches(batch_size=chunk_rows):
+            read += batch.num_rows
+            yield batch.to_pandas(), read / total
+        return
+    size = max(os.path.getsize(path), 1)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        f = _CountingFile(f)
+        if fmt == "csv":
+            reader = pd.read_csv(f, chunksize=chunk_rows, dtype=str, keep_default_na=False, na_values=[""])
+        else:
+            reader = pd.read_json(f, lines=True, chunksize=chunk_rows, dtype=False)
+        with reader:
+            for frame in reader:
+                # The reader buffers ahead and counts characters, not bytes, so this is an estimate
+                yield frame, min(f.consumed / size, 1.0)
+
+
+class _CountingFile:
+    """Text file wrapper that counts what the parser has pulled, for progress reporting."""
+
+    def __init__(self, f):
+        self.f = f
+        self.consumed = 0
+
+    def read(self, size=-1):
+        data = self.f.read(size)
+        self.consumed += len(data)
+        return data
+
+    def readline(self, size=-1):
+        line = self.f.readline(size)
+        self.consumed += len(line)
+        return line
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.readline()
+        if not line:
+            raise StopIteration
+        return line
+
+
+def _text(frame, column):
+    if column not in frame:
+        return pd.Series(pd.NA, index=frame.index, dtype="object")
+    values = frame[column]
+    return values.where(values.notna(), None).astype("string").str.strip().replace("", pd.NA)
+
+
+def validate_chunk(frame):
+    """Normalise one chunk column by column; returns (valid rows in TASK_COLUMNS order, rejected count)."""
+    out = pd.DataFrame(index=frame.index)
+    out["task"] = _text(frame, "task")
+    done = _text(frame, "done").str.lower()
+    out["done"] = done.isin(_TRUE_VALUES).fillna(False).astype(int)
+
+    # Due dates may be dd/mm/yyyy (the app's own format) or ISO; both are stored as dd/mm/yyyy
+    due_text = _text(frame, "due")
+    due = pd.to_datetime(due_text, format="%d/%m/%Y", errors="coerce")
+    due = due.fillna(pd.to_datetime(due_text, format="%Y-%m-%d", errors="coerce"))
+    out["due"] = due.dt.strftime("%d/%m/%Y").astype("object").where(due.notna(), None)
+
+    time_text = _text(frame, "time")
+    clock = pd.to_datetime(time_text, format="%H:%M", errors="coerce")
+    out["time"] = clock.dt.strftime("%H:%M").astype("object").where(clock.notna(), None)
+    display = _text(frame, "time_display")
+    out["time_display"] = display.fillna(clock.dt.strftime("%I:%M %p")).astype("object").where(clock.notna(), None)
+
+    out["priority"] = _text(frame, "priority").str.capitalize().fillna("Medium")
+    out["category"] = _text(frame, "category").fillna("Other")
+    out["notes"] = _text(frame, "notes").fillna("No notes")
+    # One-off tasks store None, as tasks added in the app do
+    recurrence_text = _text(frame, "recurrence").str.lower().replace("none", pd.NA)
+    out["recurrence"] = recurrence_text.map(_RECURRENCES, na_action="ignore").astype("object")
+    interval = pd.to_numeric(_text(frame, "recur_interval"), errors="coerce")
+    out["recur_interval"] = interval.where(out["recurrence"].notna()).round().astype("Int64")
+    out["created_at"] = _text(frame, "created_at")
+    out["completed_at"] = _text(frame, "completed_at")
+
+    valid = (
+        out["task"].notna()
+        & out["priority"].isin(PRIORITIES)
+        # A value that was given but did not parse is an error, not a missing field
+        & (due_text.isna() | due.notna())
+        & (time_text.isna() | clock.notna())
+        & (interval.isna() | (interval >= 1))
+        & (recurrence_text.isna() | out["recurrence"].notna())
+    ).fillna(False).to_numpy(dtype=bool)
+    result = out.loc[valid, list(TASK_COLUMNS)].astype("object")
+    result = result.where(result.notna(), None)
+    # sqlite3 cannot bind NumPy scalars, so the two non-text columns become plain Python values
+    result["done"] = [bool(value) for value in result["done"]]
+    # An object column, or pandas would turn a mix of ints and None back into floats and NaN
+    result["recur_interval"] = pd.Series([None if value is None else int(value) for value in result["recur_interval"]],
+                                         index=result.index, dtype="object")
+    return result, int((~valid).sum())
+
+
+def import_tasks(path, storage, on_batch, progress=None, cancelled=lambda: False, chunk_rows=CHUNK_ROWS):
+    """Stream tasks from path into storage one chunk at a time.
+
+    Each valid chunk is written in a single transaction, then handed to
+    on_batch(tasks) as Task records so the caller can add them to its TaskStore.
+    Returns (imported, rejected); stops between chunks once cancelled() is true.
+    """
+    imported = rejected = 0
+    for frame, fraction in read_chunks(path, chunk_rows):
+        if cancelled():
+            break
+        valid, bad = validate_chunk(frame)
+        rejected += bad
+        if len(valid):
+            first_id = storage.next_id("tasks", len(valid))
+            ids = range(first_id, first_id + len(valid))
+            rows = list(valid.itertuples(index=False, name=None))
+            rows = [(task_id,) + row for task_id, row in zip(ids, rows)]
+            storage.insert_tasks(rows)
+            tasks = [Task(*row) for row in rows]
+            imported += len(tasks)
+            on_batch(tasks)
+        if progress:
+            progress(imported, rejected, fraction)
+    return imported, rejected
+
+
+def export_tasks(tasks, path, progress=None, cancelled=lambda: False, chunk_rows=CHUNK_ROWS):
+    """Write tasks (a list, in the order given) to path in chunks; returns the number written."""
+    fmt = format_for(path)
+    if fmt == "parquet":
+        return _export_parquet(tasks, path, progress, cancelled, chunk_rows)
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        if fmt == "csv":
+            writer.writerow(EXPORT_COLUMNS)
+        for chunk in _export_chunks(tasks, chunk_rows):
+            if cancelled():
+                break
+            if fmt == "csv":
+                writer.writerows(chunk)
+            else:
+                f.writelines(json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False) + "\n" for row in chunk)
+            written += len(chunk)
+            if progress:
+                progress(written, 0, written / max(len(tasks), 1))
+    return written
+
+
+def _export_chunks(tasks, chunk_rows):
+    for start in range(0, len(tasks), chunk_rows):
+        yield [tuple(task.get(column) for column in EXPORT_COLUMNS) for task in tasks[start:start + chunk_rows]]
+
+
+def _export_parquet(tasks, path, progress, cancelled, chunk_rows):
+    text = pa.string()
+    schema = pa.schema([
+        ("id", pa.int64()), ("task", text), ("done", pa.bool_()), ("due", text), ("time", text),
+        ("time_display", text), ("priority", text), ("category", text), ("notes", text),
+        ("recurrence", text), ("recur_interval", pa.int64()), ("created_at", text), ("completed_at", text),
+    ])
+    written = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in _export_chunks(tasks, chunk_rows):
+            if cancelled():
+                break
+            # Column-wise: one Arrow array per column instead of a dict per row
+            columns = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema))
+            written += len(chunk)
+            if progress:
+                progress(written, 0, written / max(len(tasks), 1))
+    return written
@@ -1,13 +1,45 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from tkcalendar import DateEntry
-import pandas as pd
-from datetime import date, datetime, time
+from datetime import date, datetime, time, timedelta
+import sqlite3
+import threading
+try:
+    from .event_bus import TASK_ADDED, TASK_COMPLETED, TASK_DELETED, TASKS_IMPORTED
+    from .storage import get_storage
+    from .task_store import TaskStore
+    from .search_pipeline import SearchPipeline
+    from .treeview_binder import TreeviewBinder, VirtualTreeview
+    from .recurrence import RECURRENCES, RecurrenceRule, expand_occurrences
+    from .task_analytics import TaskAnalytics
+    from .task_io import import_tasks, export_tasks, file_formats
+    from .datetime_parse import parse_time, format_time_24h, format_date
+    from .task_record import Task
+except ImportError:
+    from event_bus import TASK_ADDED, TASK_COMPLETED, TASK_DELETED, TASKS_IMPORTED
+    from storage import get_storage
+    from task_store import TaskStore
+    from search_pipeline import SearchPipeline
+    from treeview_binder import TreeviewBinder, VirtualTreeview
+    from recurrence import RECURRENCES, RecurrenceRule, expand_occurrences
+    from task_analytics import TaskAnalytics
+    from task_io import import_tasks, export_tasks, file_formats
+    from datetime_parse import parse_time, format_time_24h, format_date
+    from task_record import Task
+
+# Days shown at once in the upcoming view
+UPCOMING_DAYS = 14
 
 class TaskManager:
-    def __init__(self, root):
+    def __init__(self, root, event_bus=None):
         self.root = root
-        self.tasks = []
+        self.event_bus = event_bus
+        self.storage = get_storage()
+        self.store = TaskStore(self.storage.load_tasks())
+        # Recurring tasks keep only the occurrences marked done, never the expanded series
+        self.completed_occurrences = self.storage.load_completed_occurrences()
+        self.upcoming_start = date.today()
+        self.analytics = TaskAnalytics(self.store)
         self.user_triggered_view = False
 
         # Colors and styles
@@ -67,6 +99,10 @@ class TaskManager:
         buttons = [
             ("➕ Add Tasks", self.show_add_task),
             ("📋 View Tasks", self.show_task_list),
+            ("📅 Upcoming", self.show_upcoming),
+            ("📊 Analytics", self.show_analytics),
+            ("📥 Import", self.show_import),
+            ("📤 Export", self.show_export),
             ("✅ Mark Done", self.show_mark_done),
             ("🗑️ Delete Task", self.show_delete_task),
             ("🏠 Main Menu", self.return_to_main_menu),
@@ -79,12 +115,19 @@ class TaskManager:
         self.action_frame = ttk.Frame(self.main_frame, style="Shadow.TFrame")
         self.action_frame.pack(fill="both", expand=True, pady=5)
 
+        # Typing in the search box filters on a worker thread; only the latest query is rendered
+        self.search_pipeline = SearchPipeline(self.main_frame, self.filter_tasks, self.apply_task_list)
+
         self.show_task_list(initial_load=True)
 
-    def show_add_task(self):
+    def clear_action_frame(self):
+        self.search_pipeline.cancel()
         for widget in self.action_frame.winfo_children():
             widget.destroy()
 
+    def show_add_task(self):
+        self.clear_action_frame()
+
         add_frame = ttk.LabelFrame(self.action_frame, text="Add New Task", padding="10", style="Shadow.TFrame")
         add_frame.pack(fill="x", pady=5)
 
@@ -131,6 +174,15 @@ class TaskManager:
         self.notes_var = tk.StringVar()
         ttk.Entry(task_row3, textvariable=self.notes_var, width=20).pack(side="left", padx=5)
 
+        ttk.Label(task_row3, text="Repeat:", background=self.frame_color).pack(side="left", padx=5)
+        self.recurrence_var = tk.StringVar(value="None")
+        recurrence_combobox = ttk.Combobox(task_row3, textvariable=self.recurrence_var, state="readonly", values=RECURRENCES, width=10)
+        recurrence_combobox.pack(side="left", padx=5)
+
+        ttk.Label(task_row3, text="Every:", background=self.frame_color).pack(side="left", padx=5)
+        self.recur_interval_var = tk.IntVar(value=1)
+        ttk.Entry(task_row3, textvariable=self.recur_interval_var, width=4).pack(side="left", padx=5)
+
         button_row = ttk.Frame(add_frame)
         button_row.pack(fill="x", pady=5)
         ttk.Button(button_row, text="➕ Add Task", command=self.add_task, style="Custom.TButton").pack(side="left", padx=5)
@@ -144,42 +196,56 @@ class TaskManager:
 
         if not task:
             messagebox.showwarning("Input Error", "Please enter a task!")
-            if not self.tasks:
+            if not len(self.store):
                 messagebox.showinfo("Info", "No tasks found.")
             return
 
-        if due_date < date.today():
+        now = datetime.now()
+        if due_date < now.date():
             messagebox.showwarning("Invalid Date", "The selected date has already passed!")
             return
 
         selected_time = custom_time if custom_time else time_12hr
 
-        try:
-            time_obj = datetime.strptime(selected_time, "%I:%M %p")
-            time_24hr = time_obj.strftime("%H:%M")
-            time_display = selected_time
-        except ValueError:
+        time_obj = parse_time(selected_time)
+        if time_obj is None:
             messagebox.showwarning("Input Error", "Invalid time format! Use HH:MM AM/PM (e.g., 02:30 PM)")
             return
+        time_24hr = format_time_24h(time_obj)
 
-        if due_date == date.today():
-            current_time = datetime.now().time()
-            selected_time_obj = time_obj.time()
-            if selected_time_obj < current_time:
+        recurrence = self.recurrence_var.get()
+        try:
+            recur_interval = self.recur_interval_var.get()
+        except tk.TclError:
+            recur_interval = 0
+        if recurrence != "None" and recur_interval < 1:
+            messagebox.showwarning("Input Error", "Repeat interval must be a whole number of at least 1!")
+            return
+
+        if due_date == now.date():
+            if time_obj < now.time():
                 messagebox.showwarning("Invalid Time", "The selected time has already passed for today!")
                 return
 
-        task_obj = {
-            "task": task,
-            "done": False,
-            "due": self.due_date_var.get(),
-            "time": time_24hr,
-            "time_display": time_display,
-            "priority": self.priority_var.get(),
-            "category": self.add_category_var.get(),
-            "notes": self.notes_var.get().strip() or "No notes"
-        }
-        self.tasks.append(task_obj)
+        task_obj = Task(
+            task=task,
+            due=format_date(due_date),
+            time=time_24hr,
+            priority=self.priority_var.get(),
+            category=self.add_category_var.get(),
+            notes=self.notes_var.get().strip(),
+            recurrence=None if recurrence == "None" else recurrence,
+            recur_interval=recur_interval if recurrence != "None" else None,
+            created_at=now.strftime("%Y-%m-%d %H:%M"),
+        )
+        try:
+            task_obj["id"] = self.storage.add_task(task_obj)
+        except sqlite3.Error as e:
+            messagebox.showwarning("Storage Error", f"Failed to save task: {e}")
+            return
+        self.store.add(task_obj)
+        if self.event_bus:
+            self.event_bus.publish(TASK_ADDED, {"task": task_obj})
         messagebox.showinfo("Success", "Task added successfully!")
         
         self.task_var.set("")
@@ -189,11 +255,12 @@ class TaskManager:
         self.priority_var.set("Medium")
         self.add_category_var.set("Work")
         self.notes_var.set("")
+        self.recurrence_var.set("None")
+        self.recur_interval_var.set(1)
         self.show_task_list(initial_load=False)
 
     def show_task_list(self, initial_load=False):
-        for widget in self.action_frame.winfo_children():
-            widget.destroy()
+        self.clear_action_frame()
 
         task_list_frame = ttk.LabelFrame(self.action_frame, text="Task List", padding="10", style="Shadow.TFrame")
         task_list_frame.pack(fill="both", expand=True, pady=5)
@@ -203,13 +270,13 @@ class TaskManager:
         ttk.Label(search_frame, text="Search tasks:", background=self.frame_color).pack(side="left", padx=5)
         self.search_var = tk.StringVar()
         ttk.Entry(search_frame, textvariable=self.search_var, width=30).pack(side="left", padx=5)
-        self.search_var.trace("w", self.update_task_list)
+        self.search_var.trace("w", self.schedule_task_search)
 
         ttk.Label(search_frame, text="Filter by Category:", background=self.frame_color).pack(side="left", padx=5)
         self.category_var = tk.StringVar(value="All")
         self.category_dropdown = ttk.Combobox(search_frame, textvariable=self.category_var, state="readonly", values=["All"])
         self.category_dropdown.pack(side="left", padx=5)
-        self.category_dropdown.bind("<<ComboboxSelected>>", self.update_task_list)
+        self.category_dropdown.bind("<<ComboboxSelected>>", self.schedule_task_search)
 
         progress_frame = ttk.Frame(task_list_frame)
         progress_frame.pack(fill="x", pady=5)
@@ -218,7 +285,9 @@ class TaskManager:
         self.progress_label = ttk.Label(progress_frame, text="Completed: 0/0 (0%)", background=self.frame_color)
         self.progress_label.pack(pady=5)
 
-        self.tree = ttk.Treeview(task_list_frame, columns=("ID", "Status", "Task", "Priority", "Due Date", "Time", "Category", "Notes"), show="headings")
+        tree_frame = ttk.Frame(task_list_frame)
+        tree_frame.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(tree_frame, columns=("ID", "Status", "Task", "Priority", "Due Date", "Time", "Category", "Notes"), show="headings")
         self.tree.heading("ID", text="ID")
         self.tree.heading("Status", text="Status")
         self.tree.heading("Task", text="Task")
@@ -235,7 +304,9 @@ class TaskManager:
         self.tree.column("Time", width=100)
         self.tree.column("Category", width=100)
         self.tree.column("Notes", width=150)
-        self.tree.pack(fill="both", expand=True)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
 
         # Add alternate row colors
         self.tree.tag_configure("oddrow", background="#E3F2FD")
@@ -245,72 +316,92 @@ class TaskManager:
         self.tree.bind("<Enter>", lambda e: self.tree.config(cursor="hand2"))
         self.tree.bind("<Leave>", lambda e: self.tree.config(cursor=""))
 
+        # Only the rows in view (plus overscan) become Treeview items
+        row_height = int(self.style.lookup("Treeview", "rowheight") or 20)
+        self.task_view = VirtualTreeview(self.tree, scrollbar, self.task_row, row_height=row_height)
+
         if not initial_load:
             self.user_triggered_view = True
         self.update_task_list()
 
+    def row_tags(self, idx, priority):
+        row_tags = ("oddrow" if idx % 2 else "evenrow",)
+        if priority == "High":
+            row_tags += ("HighPriority",)
+        elif priority == "Medium":
+            row_tags += ("MediumPriority",)
+        elif priority == "Low":
+            row_tags += ("LowPriority",)
+        return row_tags
+
+    def due_text(self, t):
+        if not t["due"]:
+            return "No Due Date"
+        rule = RecurrenceRule.from_task(t)
+        return f"{t['due']} ↻ {rule.describe()}" if rule else t["due"]
+
+    def task_row(self, index, t):
+        idx = index + 1
+        return t["id"], (
+            t["id"],
+            "✓" if t["done"] else "✗",
+            t["task"],
+            t["priority"],
+            self.due_text(t),
+            t["time_display"] if t["time_display"] else "No Time",
+            t["category"],
+            t["notes"]
+        ), self.row_tags(idx, t["priority"])
+
+    def filter_tasks(self, search_term, selected_category, cancelled=lambda: False):
+        # The store hands results back already in display order, or None once cancelled
+        return self.store.search(search_term, selected_category, cancelled)
+
+    def schedule_task_search(self, *args):
+        self.search_pipeline.submit(self.search_var.get(), self.category_var.get())
+
     def update_task_list(self, *args):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.apply_task_list(self.filter_tasks(self.search_var.get(), self.category_var.get()))
 
-        search_term = self.search_var.get().lower()
+    def apply_task_list(self, filtered_tasks):
         selected_category = self.category_var.get()
-        filtered_tasks = [
-            t for t in self.tasks
-            if (not search_term or search_term in t["task"].lower()) and
-            (selected_category == "All" or t["category"] == selected_category)
-        ]
-
-        priority_order = {"High": 1, "Medium": 2, "Low": 3}
-        category_order = {"Urgent": 1, "Work": 2, "Personal": 3, "Other": 4}
-        filtered_tasks.sort(key=lambda x: (priority_order.get(x["priority"], 3), category_order.get(x["category"], 4)))
-
-        categories = ["All"] + sorted(set(task["category"] for task in self.tasks if task["category"]))
+        categories = ["All"] + self.store.categories()
         self.category_dropdown["values"] = categories
         if selected_category not in categories:
             self.category_var.set("All")
 
-        total_tasks = len(self.tasks)
-        completed_tasks = sum(1 for task in self.tasks if task["done"])
+        total_tasks = len(self.store)
+        completed_tasks = self.store.done_count
         progress = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
         self.progress["value"] = progress
         self.progress_label.config(text=f"Completed: {completed_tasks}/{total_tasks} ({progress:.1f}%)")
 
-        for idx, t in enumerate(filtered_tasks, 1):
-            status = "✓" if t["done"] else "✗"
-            due_str = t["due"] if t["due"] else "No Due Date"
-            time_str = t["time_display"] if t["time_display"] else "No Time"
-            priority = t["priority"]
-            row_tags = ("oddrow" if idx % 2 else "evenrow",)
-            if priority == "High":
-                row_tags += ("HighPriority",)
-            elif priority == "Medium":
-                row_tags += ("MediumPriority",)
-            elif priority == "Low":
-                row_tags += ("LowPriority",)
-            self.tree.insert("", "end", values=(
-                idx,
-                status,
-                t["task"],
-                priority,
-                due_str,
-                time_str,
-                t["category"],
-                t["notes"]
-            ), tags=row_tags)
+        self.task_view.set_rows(filtered_tasks)
 
         if self.user_triggered_view and not filtered_tasks:
             messagebox.showinfo("Info", "No tasks found.")
         self.user_triggered_view = False
 
     def show_mark_done(self):
-        for widget in self.action_frame.winfo_children():
-            widget.destroy()
+        self.clear_action_frame()
 
         mark_frame = ttk.LabelFrame(self.action_frame, text="Mark Task as Done", padding="10", style="Shadow.TFrame")
         mark_frame.pack(fill="both", expand=True, pady=5)
 
-        self.tree = ttk.Treeview(mark_frame, columns=("ID", "Status", "Task", "Priority"), show="headings")
+        self.show_task_picker(mark_frame)
+
+        mark_row = ttk.Frame(mark_frame)
+        mark_row.pack(fill="x", pady=5)
+        ttk.Label(mark_row, text="Enter task ID to mark as done:", background=self.frame_color).pack(side="left", padx=5)
+        self.mark_id_var = tk.IntVar(value=1)
+        ttk.Entry(mark_row, textvariable=self.mark_id_var, width=5).pack(side="left", padx=5)
+        ttk.Button(mark_row, text="✅ Mark as Done", command=self.mark_done, style="Custom.TButton").pack(side="left", padx=5)
+
+    def show_task_picker(self, parent):
+        """The ID/Status/Task/Priority list shown above Mark Done and Delete, virtualized like the task list."""
+        tree_frame = ttk.Frame(parent)
+        tree_frame.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(tree_frame, columns=("ID", "Status", "Task", "Priority"), show="headings")
         self.tree.heading("ID", text="ID")
         self.tree.heading("Status", text="Status")
         self.tree.heading("Task", text="Task")
@@ -319,93 +410,275 @@ class TaskManager:
         self.tree.column("Status", width=80)
         self.tree.column("Task", width=300)
         self.tree.column("Priority", width=80)
-        self.tree.pack(fill="both", expand=True)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical")
+        scrollbar.pack(side="right", fill="y")
 
         self.tree.tag_configure("oddrow", background="#E3F2FD")
         self.tree.tag_configure("evenrow", background="#FFFFFF")
 
-        mark_row = ttk.Frame(mark_frame)
-        mark_row.pack(fill="x", pady=5)
-        ttk.Label(mark_row, text="Enter task number to mark as done:", background=self.frame_color).pack(side="left", padx=5)
-        self.mark_id_var = tk.IntVar(value=1)
-        ttk.Entry(mark_row, textvariable=self.mark_id_var, width=5).pack(side="left", padx=5)
-        ttk.Button(mark_row, text="✅ Mark as Done", command=self.mark_done, style="Custom.TButton").pack(side="left", padx=5)
+        # Only the rows in view (plus overscan) become Treeview items, however many tasks there are
+        row_height = int(self.style.lookup("Treeview", "rowheight") or 20)
+        self.picker_view = VirtualTreeview(self.tree, scrollbar, self.picker_row, row_height=row_height)
+        self.picker_view.set_rows(self.store.ordered())
 
-        priority_order = {"High": 1, "Medium": 2, "Low": 3}
-        category_order = {"Urgent": 1, "Work": 2, "Personal": 3, "Other": 4}
-        sorted_tasks = sorted(self.tasks, key=lambda x: (priority_order.get(x["priority"], 3), category_order.get(x["category"], 4)))
-        for idx, t in enumerate(sorted_tasks, 1):
-            status = "✓" if t["done"] else "✗"
-            priority = t["priority"]
-            row_tags = ("oddrow" if idx % 2 else "evenrow",)
-            if priority == "High":
-                row_tags += ("HighPriority",)
-            elif priority == "Medium":
-                row_tags += ("MediumPriority",)
-            elif priority == "Low":
-                row_tags += ("LowPriority",)
-            self.tree.insert("", "end", values=(idx, status, t["task"], priority), tags=row_tags)
+    def picker_row(self, index, t):
+        return t["id"], (t["id"], "✓" if t["done"] else "✗", t["task"], t["priority"]), self.row_tags(index + 1, t["priority"])
+
+    def read_task_id(self, var):
+        try:
+            return var.get()
+        except tk.TclError:
+            return None
 
     def mark_done(self):
-        num = self.mark_id_var.get() - 1
-        if 0 <= num < len(self.tasks):
-            self.tasks[num]["done"] = True
+        task = self.store.get(self.read_task_id(self.mark_id_var))
+        if task:
+            task["completed_at"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+            self.store.set_done(task["id"])
+            self.storage.set_task_done(task["id"], completed_at=task["completed_at"])
+            if self.event_bus:
+                self.event_bus.publish(TASK_COMPLETED, {"task": task})
             messagebox.showinfo("Success", "Task marked as done.")
             self.show_task_list(initial_load=False)
         else:
-            messagebox.showwarning("Invalid ID", "Invalid task number.")
+            messagebox.showwarning("Invalid ID", "Invalid task ID.")
 
     def show_delete_task(self):
-        for widget in self.action_frame.winfo_children():
-            widget.destroy()
+        self.clear_action_frame()
 
         delete_frame = ttk.LabelFrame(self.action_frame, text="Delete Task", padding="10", style="Shadow.TFrame")
         delete_frame.pack(fill="both", expand=True, pady=5)
 
-        self.tree = ttk.Treeview(delete_frame, columns=("ID", "Status", "Task", "Priority"), show="headings")
-        self.tree.heading("ID", text="ID")
-        self.tree.heading("Status", text="Status")
-        self.tree.heading("Task", text="Task")
-        self.tree.heading("Priority", text="Priority")
-        self.tree.column("ID", width=50)
-        self.tree.column("Status", width=80)
-        self.tree.column("Task", width=300)
-        self.tree.column("Priority", width=80)
-        self.tree.pack(fill="both", expand=True)
-
-        self.tree.tag_configure("oddrow", background="#E3F2FD")
-        self.tree.tag_configure("evenrow", background="#FFFFFF")
+        self.show_task_picker(delete_frame)
 
         delete_row = ttk.Frame(delete_frame)
         delete_row.pack(fill="x", pady=5)
-        ttk.Label(delete_row, text="Enter task number to delete:", background=self.frame_color).pack(side="left", padx=5)
+        ttk.Label(delete_row, text="Enter task ID to delete:", background=self.frame_color).pack(side="left", padx=5)
         self.delete_id_var = tk.IntVar(value=1)
         ttk.Entry(delete_row, textvariable=self.delete_id_var, width=5).pack(side="left", padx=5)
         ttk.Button(delete_row, text="🗑️ Delete Task", command=self.delete_task, style="Custom.TButton").pack(side="left", padx=5)
 
-        priority_order = {"High": 1, "Medium": 2, "Low": 3}
-        category_order = {"Urgent": 1, "Work": 2, "Personal": 3, "Other": 4}
-        sorted_tasks = sorted(self.tasks, key=lambda x: (priority_order.get(x["priority"], 3), category_order.get(x["category"], 4)))
-        for idx, t in enumerate(sorted_tasks, 1):
-            status = "✓" if t["done"] else "✗"
-            priority = t["priority"]
-            row_tags = ("oddrow" if idx % 2 else "evenrow",)
-            if priority == "High":
-                row_tags += ("HighPriority",)
-            elif priority == "Medium":
-                row_tags += ("MediumPriority",)
-            elif priority == "Low":
-                row_tags += ("LowPriority",)
-            self.tree.insert("", "end", values=(idx, status, t["task"], priority), tags=row_tags)
-
     def delete_task(self):
-        num = self.delete_id_var.get() - 1
-        if 0 <= num < len(self.tasks):
-            self.tasks.pop(num)
+        task_id = self.read_task_id(self.delete_id_var)
+        if task_id in self.store.by_id:
+            # The database first, so a failed delete leaves the task everywhere rather than only on disk
+            try:
+                self.storage.delete_task(task_id)
+            except sqlite3.Error as e:
+                messagebox.showwarning("Storage Error", f"Failed to delete task: {e}")
+                return
+            task = self.store.remove(task_id)
+            self.completed_occurrences.pop(task["id"], None)
+            if self.event_bus:
+                self.event_bus.publish(TASK_DELETED, {"task": task})
             messagebox.showinfo("Success", "Task deleted.")
             self.show_task_list(initial_load=False)
         else:
-            messagebox.showwarning("Invalid ID", "Invalid task number.")
+            messagebox.showwarning("Invalid ID", "Invalid task ID.")
+
+    def show_upcoming(self):
+        self.clear_action_frame()
+
+        upcoming_frame = ttk.LabelFrame(self.action_frame, text="Upcoming", padding="10", style="Shadow.TFrame")
+        upcoming_frame.pack(fill="both", expand=True, pady=5)
+
+        nav_row = ttk.Frame(upcoming_frame)
+        nav_row.pack(fill="x", pady=5)
+        ttk.Button(nav_row, text="◀ Previous", command=lambda: self.move_upcoming(-UPCOMING_DAYS), style="Custom.TButton").pack(side="left", padx=5)
+        self.upcoming_label = ttk.Label(nav_row, background=self.frame_color)
+        self.upcoming_label.pack(side="left", padx=5)
+        ttk.Button(nav_row, text="Next ▶", command=lambda: self.move_upcoming(UPCOMING_DAYS), style="Custom.TButton").pack(side="left", padx=5)
+
+        self.tree = ttk.Treeview(upcoming_frame, columns=("Date", "Time", "Task", "Repeat", "Status"), show="headings")
+        self.tree.heading("Date", text="Date")
+        self.tree.heading("Time", text="Time")
+        self.tree.heading("Task", text="Task")
+        self.tree.heading("Repeat", text="Repeat")
+        self.tree.heading("Status", text="Status")
+        self.tree.column("Date", width=100)
+        self.tree.column("Time", width=80)
+        self.tree.column("Task", width=300)
+        self.tree.column("Repeat", width=120)
+        self.tree.column("Status", width=80)
+        self.tree.pack(fill="both", expand=True)
+
+        self.tree.tag_configure("oddrow", background="#E3F2FD")
+        self.tree.tag_configure("evenrow", background="#FFFFFF")
+
+        ttk.Button(upcoming_frame, text="✅ Toggle Occurrence Done", command=self.toggle_occurrence, style="Custom.TButton").pack(pady=5)
+
+        self.tree_binder = TreeviewBinder(self.tree)
+        self.update_upcoming()
+
+    def move_upcoming(self, days):
+        self.upcoming_start += timedelta(days=days)
+        self.update_upcoming()
+
+    def update_upcoming(self):
+        start = self.upcoming_start
+        end = start + timedelta(days=UPCOMING_DAYS - 1)
+        self.upcoming_label.config(text=f"{start.strftime('%d/%m/%Y')} – {end.strftime('%d/%m/%Y')}")
+        # Recurring tasks are expanded for this window only
+        self.occurrence_rows = {}
+        rows = []
+        for idx, (day, t, done) in enumerate(expand_occurrences(self.store, start, end, self.completed_occurrences), 1):
+            key = f"{t['id']}@{day.isoformat()}"
+            self.occurrence_rows[key] = (t, day)
+            rule = RecurrenceRule.from_task(t)
+            rows.append((key, (
+                day.strftime("%d/%m/%Y"),
+                t["time_display"] if t["time_display"] else "No Time",
+                t["task"],
+                rule.describe() if rule else "Once",
+                "✓" if done else "✗",
+            ), self.row_tags(idx, t["priority"])))
+        self.tree_binder.render(rows)
+
+    def toggle_occurrence(self):
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showwarning("No Selection", "Select an occurrence first.")
+            return
+        t, day = self.occurrence_rows[selection[0]]
+        if not RecurrenceRule.from_task(t):
+            messagebox.showinfo("Info", "One-off tasks are marked done from Mark Done.")
+            return
+        occurrence = day.isoformat()
+        completed = self.completed_occurrences.setdefault(t["id"], set())
+        done = occurrence not in completed
+        try:
+            self.storage.set_occurrence_done(t["id"], occurrence, done)
+        except sqlite3.Error as e:
+            messagebox.showwarning("Storage Error", f"Failed to save occurrence: {e}")
+            return
+        if done:
+            completed.add(occurrence)
+        else:
+            completed.discard(occurrence)
+            if not completed:
+                del self.completed_occurrences[t["id"]]
+        self.update_upcoming()
+
+    def show_analytics(self):
+        self.clear_action_frame()
+
+        analytics_frame = ttk.LabelFrame(self.action_frame, text="Task Analytics", padding="10", style="Shadow.TFrame")
+        analytics_frame.pack(fill="both", expand=True, pady=5)
+        if not len(self.store):
+            ttk.Label(analytics_frame, text="No tasks yet.", background=self.frame_color).pack(pady=10)
+            return
+
+        # Cached per store version, so reopening this view without changes costs nothing
+        completion = self.analytics.completion_by_category()
+        overdue = self.analytics.overdue()
+        throughput = self.analytics.throughput_by_priority()
+        burndown = self.analytics.burndown()
+
+        top_row = ttk.Frame(analytics_frame)
+        top_row.pack(fill="both", expand=True)
+        self.analytics_table(top_row, "Completion by Category", ("Category", "Total", "Done", "Rate", "Overdue"), [
+            (category, int(row.total), int(row.done), f"{row.rate:.1f}%", int(overdue.get(category, 0)))
+            for category, row in completion.iterrows()
+        ])
+        self.analytics_table(top_row, "Throughput (last 7 days)", ("Priority", "Completed", "Per Day"), [
+            (priority, int(row.completed), f"{row.per_day:.2f}")
+            for priority, row in throughput.iterrows()
+        ])
+        self.analytics_table(analytics_frame, "Burndown (open tasks)", ("Date", "Open"), [
+            (day.strftime("%d/%m/%Y"), int(count))
+            for day, count in burndown.items()
+        ], side="top")
+
+    def analytics_table(self, parent, title, columns, rows, side="left"):
+        frame = ttk.LabelFrame(parent, text=title, padding="5", style="Shadow.TFrame")
+        frame.pack(side=side, fill="both", expand=True, padx=5, pady=5)
+        tree = ttk.Treeview(frame, columns=columns, show="headings", height=min(max(len(rows), 1), 8))
+        for column in columns:
+            tree.heading(column, text=column)
+            tree.column(column, width=90)
+        tree.tag_configure("oddrow", background="#E3F2FD")
+        tree.tag_configure("evenrow", background="#FFFFFF")
+        for idx, values in enumerate(rows, 1):
+            tree.insert("", "end", values=values, tags=("oddrow" if idx % 2 else "evenrow",))
+        tree.pack(fill="both", expand=True)
+        return tree
+
+    def show_import(self):
+        path = filedialog.askopenfilename(title="Import Tasks", filetypes=file_formats())
+        if not path:
+            return
+        self.run_bulk(
+            "Importing Tasks",
+            lambda progress, cancelled: import_tasks(path, self.storage, self.queue_import_batch, progress, cancelled),
+            lambda result: f"Imported {result[0]} tasks, skipped {result[1]} invalid rows.",
+        )
+
+    def queue_import_batch(self, tasks):
+        # Called on the import thread; the store is only touched from the Tk thread
+        self.root.after(0, self.apply_import_batch, tasks)
+
+    def apply_import_batch(self, tasks):
+        self.store.add_many(tasks)
+        if self.event_bus:
+            self.event_bus.publish(TASKS_IMPORTED, {"tasks": tasks})
+
+    def show_export(self):
+        path = filedialog.asksaveasfilename(title="Export Tasks", filetypes=file_formats(), defaultextension=".csv")
+        if not path:
+            return
+        # The worker writes from its own copy while the store stays free to change
+        tasks = list(self.store.ordered())
+        self.run_bulk(
+            "Exporting Tasks",
+            lambda progress, cancelled: export_tasks(tasks, path, progress, cancelled),
+            lambda written: f"Exported {written} tasks.",
+        )
+
+    def run_bulk(self, title, job, summary):
+        """Run an import/export job on a worker thread with a progress bar and a cancel button."""
+        self.clear_action_frame()
+
+        bulk_frame = ttk.LabelFrame(self.action_frame, text=title, padding="10", style="Shadow.TFrame")
+        bulk_frame.pack(fill="x", pady=5)
+        self.bulk_progress = ttk.Progressbar(bulk_frame, length=300, mode="determinate", maximum=100, style="Custom.Horizontal.TProgressbar")
+        self.bulk_progress.pack(fill="x", pady=5)
+        self.bulk_label = ttk.Label(bulk_frame, text="Starting...", background=self.frame_color)
+        self.bulk_label.pack(pady=5)
+        cancel = threading.Event()
+        ttk.Button(bulk_frame, text="✖ Cancel", command=cancel.set, style="Custom.TButton").pack(pady=5)
+
+        def progress(rows, rejected, fraction):
+            self.after_worker(self.update_bulk_progress, rows, rejected, fraction)
+
+        def work():
+            try:
+                result = job(progress, cancel.is_set)
+            except (OSError, ValueError, sqlite3.Error) as e:
+                self.after_worker(messagebox.showerror, "Error", f"{title} failed: {e}")
+                return
+            self.after_worker(self.finish_bulk, summary(result), cancel.is_set())
+
+        threading.Thread(target=work, name="TaskBulkIO", daemon=True).start()
+
+    def after_worker(self, callback, *args):
+        try:
+            self.root.after(0, callback, *args)
+        except (tk.TclError, RuntimeError):
+            # The Task Manager was closed while the job ran
+            pass
+
+    def update_bulk_progress(self, rows, rejected, fraction):
+        try:
+            self.bulk_progress["value"] = fraction * 100
+            self.bulk_label.config(text=f"{rows} rows processed, {rejected} skipped ({fraction * 100:.0f}%)")
+        except tk.TclError:
+            # The user moved to another view; the job keeps running
+            pass
+
+    def finish_bulk(self, message, cancelled):
+        messagebox.showinfo("Cancelled" if cancelled else "Success", message)
+        self.show_task_list(initial_load=False)
 
     def return_to_main_menu(self):
         self.show_task_list(initial_load=False)
@@ -0,0 +1,78 @@
+import sys
+
+try:
+    from .datetime_parse import parse_time, format_time_12h
+except ImportError:
+    from datetime_parse import parse_time, format_time_12h
+
+DEFAULT_NOTES = "No notes"
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Task:
+    """One task, stored in fixed slots instead of a per-task dict.
+
+    Still reads like the dicts it replaces (task["due"], task.get("time")).
+    priority and category are interned so every task shares the same few
+    strings, time_display is derived from the 24-hour time rather than
+    stored, and the "No notes" default is stored as None.
+    """
+    __slots__ = ("id", "task", "done", "due", "time", "priority", "category", "_notes",
+                 "recurrence", "recur_interval", "created_at", "completed_at")
+
+    def __init__(self, id=None, task="", done=False, due=None, time=None, time_display=None, priority="Medium",
+                 category="Other", notes=None, recurrence=None, recur_interval=None, created_at=None, completed_at=None):
+        self.id = id
+        self.task = task
+        self.done = bool(done)
+        self.due = due
+        self.time = time
+        self.priority = _intern(priority)
+        self.category = _intern(category)
+        self.notes = notes
+        self.recurrence = _intern(recurrence) or None
+        self.recur_interval = recur_interval
+        self.created_at = created_at
+        self.completed_at = completed_at
+
+    @property
+    def time_display(self):
+        clock = parse_time(self.time) if self.time else None
+        return format_time_12h(clock) if clock else None
+
+    @property
+    def notes(self):
+        return self._notes or DEFAULT_NOTES
+
+    @notes.setter
+    def notes(self, value):
+        self._notes = None if value == DEFAULT_NOTES else (value or None)
+
+    # Mapping-style access, so code written against task dicts keeps working
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key == "time_display":
+            # Derived from time; accepted for compatibility and ignored
+            return
+        if key not in Task.__slots__ and key != "notes":
+            raise KeyError(key)
+        if key in ("priority", "category", "recurrence"):
+            value = _intern(value)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __contains__(self, key):
+        return hasattr(self, key)
+
+    def __repr__(self):
+        return f"Task(id={self.id!r}, task={self.task!r}, done={self.done!r}, due={self.due!r}, priority={self.priority!r})"
@@ -0,0 +1,284 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from bisect import bisect_left
+
+
+def _stable_positions(positions):
+    """Indexes into positions forming a longest increasing subsequence (rows that need not move)."""
+    tails = []
+    tail_index = []
+    previous = [-1] * len(positions)
+    for i, position in enumerate(positions):
+        j = bisect_left(tails, position)
+        if j == len(tails):
+            tails.append(position)
+            tail_index.append(i)
+        else:
+            tails[j] = position
+            tail_index[j] = i
+        previous[i] = tail_index[j - 1] if j > 0 else -1
+    stable = set()
+    i = tail_index[-1] if tail_index else -1
+    while i != -1:
+        stable.add(i)
+        i = previous[i]
+    return stable
+
+
+class TreeviewBinder:
+    """Keeps a flat ttk.Treeview in sync with keyed rows, touching only rows that changed.
+
+    render() takes (key, values, tags) tuples in display order and issues the
+    minimal set of deletes, inserts, moves and item updates against the
+    previous render instead of clearing and refilling the whole tree.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._rows = {}
+        self._order = []
+        self.last_ops = {"insert": 0, "update": 0, "move": 0, "delete": 0}
+
+    def clear(self):
+        if self._order:
+            self.tree.delete(*[str(key) for key in self._order])
+        self._rows = {}
+        self._order = []
+
+    def render(self, rows):
+        tree = self.tree
+        new_rows = {}
+        new_order = []
+        for key, values, tags in rows:
+            new_rows[key] = (tuple(values), tuple(tags))
+            new_order.append(key)
+        ops = {"insert": 0, "update": 0, "move": 0, "delete": 0}
+
+        removed = [str(key) for key in self._order if key not in new_rows]
+        if removed:
+            tree.delete(*removed)
+            ops["delete"] = len(removed)
+
+        # Surviving rows already in the right relative order stay put; the rest are detached and re-placed
+        old_position = {key: i for i, key in enumerate(self._order)}
+        kept = [key for key in new_order if key in old_position]
+        stable_idx = _stable_positions([old_position[key] for key in kept])
+        moving = {key for i, key in enumerate(kept) if i not in stable_idx}
+        if moving:
+            tree.detach(*[str(key) for key in moving])
+
+        # Every row before index i is final, so i is the correct slot for the current row
+        for i, key in enumerate(new_order):
+            values, tags = new_rows[key]
+            previous = self._rows.get(key)
+            if previous is None:
+                tree.insert("", i, iid=str(key), values=values, tags=tags)
+                ops["insert"] += 1
+                continue
+            if key in moving:
+                tree.move(str(key), "", i)
+                ops["move"] += 1
+            if previous != (values, tags):
+                tree.item(str(key), values=values, tags=tags)
+                ops["update"] += 1
+
+        self._rows = new_rows
+        self._order = new_order
+        self.last_ops = ops
+        return ops
+
+
+class VirtualTreeview:
+    """Scrolls a ttk.Treeview over a long row sequence while holding only a window of items.
+
+    Only the visible rows plus `overscan` rows on either side exist as Tk items;
+    scrolling slides that window through TreeviewBinder, so the widget cost stays
+    constant no matter how many rows the sequence has. row_builder(index, row)
+    returns the (key, values, tags) tuple for one row.
+    """
+
+    def __init__(self, tree, scrollbar, row_builder, overscan=10, row_height=20):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_builder = row_builder
+        self.overscan = overscan
+        self.row_height = row_height
+        self.binder = TreeviewBinder(tree)
+        self.rows = []
+        self.top = 0
+        self.visible = int(tree.cget("height"))
+        scrollbar.configure(command=self.on_scrollbar)
+        tree.bind("<Configure>", self.on_configure)
+        tree.bind("<MouseWheel>", self.on_mousewheel)
+        tree.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        tree.bind("<Button-5>", lambda e: self.scroll_by(3))
+
+    def set_rows(self, rows):
+        self.rows = rows
+        self.top = min(self.top, max(0, len(rows) - self.visible))
+        self.refresh()
+
+    def refresh(self):
+        total = len(self.rows)
+        start = max(0, self.top - self.overscan)
+        end = min(total, self.top + self.visible + self.overscan)
+        self.binder.render(self.row_builder(i, self.rows[i]) for i in range(start, end))
+        # Line the window up so the first visible row is self.top
+        self.tree.yview_moveto(0)
+        if self.top > start:
+            self.tree.yview_scroll(self.top - start, "units")
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, top):
+        top = max(0, min(int(top), len(self.rows) - self.visible))
+        if top != self.top:
+            self.top = top
+            self.refresh()
+        return "break"
+
+    def scroll_by(self, rows):
+        return self.scroll_to(self.top + rows)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            return self.scroll_to(float(amount) * len(self.rows))
+        step = self.visible if unit == "pages" else 1
+        return self.scroll_by(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_configure(self, event):
+        # The heading row takes one row's worth of height
+        visible = max(1, event.height // self.row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.top = min(self.top, max(0, len(self.rows) - self.visible))
+            self.refresh()
+
+
+
+class VirtualListbox:
+    """Shows a window of a long row list in a tk.Listbox and patches it per row.
+
+    The listbox holds only the rows around the visible ones (start..end); a
+    custom scrollbar maps to the full list. row_inserted()/row_deleted() tell
+    the view about a single change so it inserts or deletes just that line
+    when it falls inside the window, instead of refilling the listbox.
+    row_text(row) returns the line shown for a row.
+    """
+
+    def __init__(self, listbox, scrollbar, row_text, overscan=10):
+        self.listbox = listbox
+        self.scrollbar = scrollbar
+        self.row_text = row_text
+        self.overscan = overscan
+        self.rows = []
+        self.top = 0
+        self.start = 0
+        self.end = 0
+        self.visible = int(listbox.cget("height"))
+        self.line_height = tkfont.Font(font=listbox.cget("font")).metrics("linespace") + 1
+        scrollbar.configure(command=self.on_scrollbar)
+        listbox.configure(yscrollcommand="")
+        listbox.bind("<Configure>", self.on_configure)
+        listbox.bind("<MouseWheel>", self.on_mousewheel)
+        listbox.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        listbox.bind("<Button-5>", lambda e: self.scroll_by(3))
+
+    def capacity(self):
+        return self.visible + 2 * self.overscan
+
+    def set_rows(self, rows):
+        """Show a new row list (kept by reference, so later row_* calls describe changes to it)."""
+        self.rows = rows
+        self.top = min(self.top, self.max_top())
+        self.refresh()
+
+    def max_top(self):
+        return max(0, len(self.rows) - self.visible)
+
+    def refresh(self):
+        """Rebuild the window around self.top; costs at most capacity() lines."""
+        self.start = max(0, self.top - self.overscan)
+        self.end = min(len(self.rows), self.start + self.capacity())
+        self.listbox.delete(0, tk.END)
+        self.listbox.insert(tk.END, *[self.row_text(self.rows[i]) for i in range(self.start, self.end)])
+        self.sync_view()
+
+    def sync_view(self):
+        self.listbox.yview(self.top - self.start)
+        total = len(self.rows)
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def row_inserted(self, index):
+        """rows[index] was just inserted."""
+        if index < self.start:
+            self.start += 1
+            self.end += 1
+            self.top += 1
+        elif index <= self.end:
+            self.listbox.insert(index - self.start, self.row_text(self.rows[index]))
+            self.end += 1
+            if self.end - self.start > self.capacity():
+                self.listbox.delete(tk.END)
+                self.end -= 1
+        self.sync_view()
+
+    def row_deleted(self, index):
+        """The row at index was just removed from rows."""
+        if index < self.start:
+            self.start -= 1
+            self.end -= 1
+            self.top = max(0, self.top - 1)
+        elif index < self.end:
+            self.listbox.delete(index - self.start)
+            self.end -= 1
+            if self.end < len(self.rows):
+                # Pull the next row in so the window stays full
+                self.listbox.insert(tk.END, self.row_text(self.rows[self.end]))
+                self.end += 1
+        if self.top > self.max_top():
+            self.scroll_to(self.max_top())
+        else:
+            self.sync_view()
+
+    def selected_index(self):
+        """Index into rows of the selected line, or None."""
+        selection = self.listbox.curselection()
+        return self.start + selection[0] if selection else None
+
+    def scroll_to(self, top):
+        top = max(0, min(int(top), self.max_top()))
+        self.top = top
+        if self.start <= top and top + self.visible <= self.end:
+            # Still inside the materialized window
+            self.sync_view()
+        else:
+            self.refresh()
+        return "break"
+
+    def scroll_by(self, rows):
+        return self.scroll_to(self.top + rows)
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            return self.scroll_to(float(amount) * len(self.rows))
+        step = self.visible if unit == "pages" else 1
+        return self.scroll_by(int(amount) * step)
+
+    def on_mousewheel(self, event):
+        return self.scroll_by(-3 if event.delta > 0 else 3)
+
+    def on_configure(self, event):
+        visible = max(1, event.height // self.line_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.top = min(self.top, self.max_top())
+            self.refresh()